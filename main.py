@@ -7,18 +7,19 @@ YouTube 쇼츠 자동화 메인 파이프라인
 import os
 import sys
 import json
+import time
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 
-# 모듈 임포트
+# 모듈 임포트 (moviepy/numpy/PIL/Gemini/YouTube API를 쓰는 생성기는 처음 사용할 때 임포트)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
-from script_generator import ScriptGenerator  # type: ignore
-from longform_script_generator import LongformScriptGenerator  # type: ignore
-from tts_generator import TTSGenerator  # type: ignore
-from video_generator import VideoGenerator  # type: ignore
-from longform_video_generator import LongformVideoGenerator  # type: ignore
-from youtube_uploader import YouTubeUploader  # type: ignore
-from thumbnail_generator import ThumbnailGenerator  # type: ignore
+from pipeline import Pipeline  # type: ignore
+from rate_limit import configure_limits, get_limiter  # type: ignore
+from workspace import JobWorkspace, prune_workspaces  # type: ignore
+from job_manifest import JobManifest  # type: ignore
+from tracing import configure_tracing, get_tracer, span  # type: ignore
 
 
 class YouTubeAutomation:
@@ -27,15 +28,19 @@ class YouTubeAutomation:
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
         
-        # 모듈 초기화
-        self.script_gen = ScriptGenerator(config_path)
-        self.longform_script_gen = LongformScriptGenerator(config_path)
-        self.tts_gen = TTSGenerator(config_path)
-        self.video_gen = VideoGenerator(config_path)
-        self.longform_video_gen = LongformVideoGenerator(config_path)
-        self.thumbnail_gen = ThumbnailGenerator(config_path)
-        self.uploader = YouTubeUploader(config_path)
-        
+        # API별 동시성/속도 제한 (동시 작업 시 고정 대기 대신 사용)
+        configure_limits(self.config.get('rate_limits'))
+        # 단계/하위 작업 시간·CPU·메모리 추적 (작업마다 logs/trace_{timestamp}.json)
+        configure_tracing(self.config.get('tracing'))
+        self._timestamp_lock = threading.Lock()
+        self._used_timestamps = set()
+
+        # 모듈은 처음 사용하는 단계에서 생성 (아래 프로퍼티 참고)
+        self._components = {}
+        self._component_lock = threading.RLock()
+        self._channel_synced = False
+        self._channel_sync_lock = threading.Lock()
+
         # 출력 디렉토리 생성
         os.makedirs("output/videos", exist_ok=True)
         os.makedirs("output/longform_videos", exist_ok=True)
@@ -45,10 +50,102 @@ class YouTubeAutomation:
         os.makedirs("output/longform_images", exist_ok=True)
         os.makedirs("logs", exist_ok=True)
 
-        # YouTube 채널 기존 영상과 주제 중복 방지
-        self._sync_youtube_topics()
-        # 인기 영상 분석 → 주제 선정에 반영
-        self._sync_popular_categories()
+        # --resume용으로 남긴 미완료 작업 공간 중 resume_days가 지난 것 정리
+        settings = self.config.get('workspace', {})
+        pruned = prune_workspaces(settings.get('root', 'work'), settings.get('resume_days', 3))
+        if pruned:
+            print(f"🧹 오래된 미완료 작업 공간 {len(pruned)}개 삭제 (resume_days={settings.get('resume_days', 3)})")
+
+    def _component(self, name, factory):
+        """모듈을 처음 요청될 때 한 번만 생성 (동시 작업에서도 하나만 생성)"""
+        component = self._components.get(name)
+        if component is None:
+            with self._component_lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = factory()
+                    self._components[name] = component
+        return component
+
+    def _http_session(self):
+        """이미지 API 호출용 커넥션 풀 세션 (모든 생성기가 공유)"""
+        from http_client import get_http_session  # type: ignore
+        return get_http_session(self.config.get('http'))
+
+    @property
+    def script_gen(self):
+        """쇼츠 스크립트 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from script_generator import ScriptGenerator  # type: ignore
+            return ScriptGenerator(self.config_path)
+        return self._component('script_gen', factory)
+
+    @property
+    def longform_script_gen(self):
+        """롱폼 스크립트 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from longform_script_generator import LongformScriptGenerator  # type: ignore
+            return LongformScriptGenerator(self.config_path)
+        return self._component('longform_script_gen', factory)
+
+    @property
+    def tts_gen(self):
+        """TTS 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from tts_generator import TTSGenerator  # type: ignore
+            return TTSGenerator(self.config_path)
+        return self._component('tts_gen', factory)
+
+    @property
+    def video_gen(self):
+        """쇼츠 비디오 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from video_generator import VideoGenerator  # type: ignore
+            return VideoGenerator(self.config_path, http_session=self._http_session())
+        return self._component('video_gen', factory)
+
+    @property
+    def longform_video_gen(self):
+        """롱폼 비디오 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from longform_video_generator import LongformVideoGenerator  # type: ignore
+            return LongformVideoGenerator(self.config_path, http_session=self._http_session())
+        return self._component('longform_video_gen', factory)
+
+    @property
+    def thumbnail_gen(self):
+        """썸네일 생성기 (처음 사용할 때 생성)"""
+        def factory():
+            from thumbnail_generator import ThumbnailGenerator  # type: ignore
+            return ThumbnailGenerator(self.config_path, http_session=self._http_session())
+        return self._component('thumbnail_gen', factory)
+
+    @property
+    def uploader(self):
+        """YouTube 업로더 (OAuth 인증 포함) (처음 사용할 때 생성)"""
+        def factory():
+            from youtube_uploader import YouTubeUploader  # type: ignore
+            return YouTubeUploader(self.config_path)
+        return self._component('uploader', factory)
+
+    def _will_upload(self, kind, upload):
+        """이번 작업이 업로드까지 하는지 (kind: 'shorts' / 'longform', upload.{kind}.auto_upload 반영)"""
+        return upload and self.config.get('upload', {}).get(kind, {}).get('auto_upload', True)
+
+    def sync_channel(self):
+        """YouTube 채널 기존 영상/인기 영상을 주제 선정에 반영 (프로세스당 한 번)
+
+        업로드하는 작업만 주제 선정 직전에 호출합니다.
+        업로드하지 않는 실행(--test, --no-upload)은 API 할당량을 쓰지 않고 로컬 주제 이력만 사용합니다.
+        """
+        with self._channel_sync_lock:
+            if self._channel_synced:
+                return
+            self._channel_synced = True
+            # YouTube 채널 기존 영상과 주제 중복 방지
+            self._sync_youtube_topics()
+            # 인기 영상 분석 → 주제 선정에 반영
+            self._sync_popular_categories()
     
     def _sync_youtube_topics(self):
         """YouTube 채널의 전체 영상 제목을 주제 중복 체크에 반영"""
@@ -73,57 +170,234 @@ class YouTubeAutomation:
         except Exception as e:
             print(f"⚠️ 인기 영상 분석 건너뜀: {e}")
     
-    def create_video(self, topic=None, upload=True, publish_at='', longform_url=''):
-        """쇼츠 영상 생성 및 업로드 (구조화 메타데이터 + 5장 AI 이미지)"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _create_prefetcher(self, factory):
+        """TTS 스트리밍 선작업기 생성 (factory: 생성기의 create_prefetcher, 비활성화 시 None)"""
+        if not self.config.get('pipeline', {}).get('streaming_prefetch', True):
+            return None
+        try:
+            return factory()
+        except Exception as e:
+            print(f"⚠️ 스트리밍 선작업 비활성화: {e}")
+            return None
 
-        print("\n" + "="*60)
-        print("🎬 YouTube 쇼츠 자동 제작 시작")
-        print("="*60)
+    def _new_timestamp(self):
+        """작업 식별용 타임스탬프 (같은 초에 시작한 동시 작업은 _2, _3 접미사로 구분)"""
+        base = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with self._timestamp_lock:
+            timestamp = base
+            n = 1
+            while timestamp in self._used_timestamps:
+                n += 1
+                timestamp = f"{base}_{n}"
+            self._used_timestamps.add(timestamp)
+            return timestamp
+
+    def _new_workspace(self):
+        """작업 공간 생성 (작업 ID = 타임스탬프, 다른 프로세스와 겹치면 접미사)"""
+        root = self.config.get('workspace', {}).get('root', 'work')
+        return JobWorkspace(self._new_timestamp(), root=root)
 
-        # 1. 스크립트 + 메타데이터 + 이미지 프롬프트 생성
-        print("\n[1/6] 📝 스크립트 + 메타데이터 생성 중...")
-        script_data = self.script_gen.generate_script(topic, paired_with_longform=bool(longform_url))
-        if not script_data:
-            print("❌ 스크립트 생성 실패")
+    def _close_workspace(self, workspace, manifest):
+        """작업 공간 정리
+
+        끝나지 않은 작업(실패/업로드 실패)은 workspace.resumable이면 --resume용으로,
+        workspace.keep_failed면 디버깅용으로 남깁니다 (workspace.resume_days가 지나면 시작 시 삭제).
+        """
+        settings = self.config.get('workspace', {})
+        if not manifest.done:
+            if settings.get('resumable', True):
+                print(f"♻️ 미완료 작업 보존: {workspace.dir} (재개: python main.py --resume {workspace.job_id})")
+                return
+            if settings.get('keep_failed', False):
+                print(f"🗂️ 실패한 작업 파일 보존: {workspace.dir}")
+                return
+        workspace.cleanup()
+
+    def _run_job(self, workspace, manifest):
+        """매니페스트의 작업 파라미터로 쇼츠/롱폼 작업 실행 후 작업 공간 정리 + 추적 저장"""
+        job = manifest.job
+        job_type = job.get('type', 'shorts')
+        started_at = time.time()
+        try:
+            with span(f"job.{job_type}", cat='job', job_id=workspace.job_id):
+                if job_type == 'longform':
+                    return self._run_longform_job(workspace, manifest, job.get('topic'),
+                                                  job.get('upload', True), job.get('publish_at', ''))
+                return self._run_shorts_job(workspace, manifest, job.get('topic'), job.get('upload', True),
+                                            job.get('publish_at', ''), job.get('longform_url', ''))
+        finally:
+            self._close_workspace(workspace, manifest)
+            self._save_trace(workspace.job_id, started_at)
+
+    def _save_trace(self, timestamp, started_at):
+        """작업 시작 이후의 span을 Chrome trace 형식으로 저장 (chrome://tracing, Perfetto에서 열기)
+
+        일괄 생성으로 동시에 실행된 다른 작업의 span도 같은 시간대면 함께 포함됩니다 (스레드로 구분).
+        """
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        try:
+            trace_path = tracer.export(f"logs/trace_{timestamp}.json", since=started_at)
+            print(f"⏱️ 실행 추적 저장: {trace_path}")
+        except Exception as e:
+            print(f"⚠️ 실행 추적 저장 실패: {e}")
+
+    def resume_job(self, job_id):
+        """실패/중단된 작업 재개 (매니페스트에 기록된 완료 단계는 건너뜀)"""
+        root = self.config.get('workspace', {}).get('root', 'work')
+        try:
+            workspace = JobWorkspace.open(job_id, root=root)
+        except FileNotFoundError as e:
+            print(f"❌ 작업 재개 불가: {e}")
             return None
+        manifest = JobManifest(workspace.dir)
+        if not manifest.job:
+            print(f"❌ 작업 매니페스트 없음: {manifest.path}")
+            return None
+        if manifest.done:
+            print(f"✅ 이미 완료된 작업: {job_id}")
+            return None
+        print(f"♻️ 작업 재개: {job_id} ({manifest.job.get('type', 'shorts')})")
+        return self._run_job(workspace, manifest)
 
-        print(f"✅ 제목: {script_data['title']}")
-        print(f"✅ 주제: {script_data['topic']}")
-        print(f"✅ 이미지 프롬프트: {len(script_data.get('image_prompts', []))}개")
+    def _new_pipeline(self, name, manifest=None):
+        """단계 DAG 실행기 생성 (pipeline.max_workers: 동시에 실행할 단계 수)"""
+        return Pipeline(name, max_workers=self.config.get('pipeline', {}).get('max_workers', 4),
+                        manifest=manifest)
 
-        # 스크립트 저장
-        script_path = f"output/script_{timestamp}.json"
-        self.script_gen.save_script(script_data, script_path)
+    def _promote(self, workspace, manifest, temp_path, final_path):
+        """완성 파일을 output/으로 옮기고 매니페스트의 경로도 갱신"""
+        promoted = workspace.promote(temp_path, final_path)
+        if promoted:
+            manifest.relocate(temp_path, final_path)
+        return promoted
 
-        # 2. TTS 생성
-        print("\n[2/6] 🎤 음성 생성 중...")
-        audio_path = f"output/audio/audio_{timestamp}.mp3"
-        audio_result = self.tts_gen.text_to_speech(script_data['script'], audio_path)
+    def _upload_once(self, manifest, upload_fn):
+        """업로드 실행 (재개 시 이미 업로드된 작업은 기록된 결과를 사용해 중복 업로드 방지)"""
+        upload_result = manifest.lookup('upload')
+        if upload_result:
+            print(f"♻️ 이미 업로드된 작업: {upload_result.get('url')}")
+            return upload_result
+        upload_result = upload_fn()
+        if upload_result:
+            manifest.record('upload', upload_result)
+        return upload_result
+
+    def _tts_stage(self, script_data, audio_path, prefetcher, step, workspace):
+        """TTS 단계 (문장 타이밍이 도착하는 대로 prefetcher에 전달)"""
+        print(f"\n{step} 🎤 음성 생성 중...")
+        audio_result = self.tts_gen.text_to_speech(
+            script_data['script'], audio_path,
+            on_timing=prefetcher.on_timing if prefetcher else None,
+            on_restart=prefetcher.reset if prefetcher else None,
+            workspace=workspace
+        )
         if not audio_result:
             print("❌ 음성 생성 실패")
-            return None
+        return audio_result
+
+    def create_video(self, topic=None, upload=True, publish_at='', longform_url=''):
+        """쇼츠 영상 생성 및 업로드 (구조화 메타데이터 + 5장 AI 이미지)
+
+        단계 그래프: script → (audio ‖ images) → video
+        배경 이미지는 대본의 image_prompts만 필요하므로 TTS와 동시에 준비합니다.
+        중간 파일은 작업별 workspace에서 만들고 완성본만 output/으로 옮깁니다.
+        완료된 단계는 매니페스트에 기록되어 실패 시 --resume JOB_ID로 이어서 실행할 수 있습니다.
+        """
+        workspace = self._new_workspace()
+        manifest = JobManifest(workspace.dir)
+        manifest.set_job(type='shorts', topic=topic, upload=upload, publish_at=publish_at,
+                         longform_url=longform_url)
+        return self._run_job(workspace, manifest)
 
-        # 3. 비디오 생성 (5장 AI 이미지 + 음성 타이밍 자막)
-        print("\n[3/6] 🎬 비디오 생성 중...")
+    def _run_shorts_job(self, workspace, manifest, topic, upload, publish_at, longform_url):
+        """쇼츠 작업 본문 (create_video 참고)"""
+        timestamp = workspace.job_id
+
+        print("\n" + "="*60)
+        print("🎬 YouTube 쇼츠 자동 제작 시작")
+        print("="*60)
+
+        audio_path = f"output/audio/audio_{timestamp}.mp3"
         video_path = f"output/videos/video_{timestamp}.mp4"
-        sentence_timings = audio_result.get('sentence_timings', None)
+        work_audio = workspace.path("audio.mp3")
+        work_video = workspace.path("video.mp4")
         use_ai_bg = self.config.get('video', {}).get('shorts', {}).get('use_ai_background', True)
-        final_video = self.video_gen.create_video(
-            script_data,
-            audio_path,
-            video_path,
-            sentence_timings=sentence_timings,
-            use_ai_background=use_ai_bg
-        )
-        if not final_video:
-            print("❌ 비디오 생성 실패")
+        want_upload = self._will_upload('shorts', upload)
+
+        def script_stage():
+            # 1. 스크립트 + 메타데이터 + 이미지 프롬프트 생성
+            if want_upload:
+                self.sync_channel()
+            print("\n[1/6] 📝 스크립트 + 메타데이터 생성 중...")
+            script_data = self.script_gen.generate_script(topic, paired_with_longform=bool(longform_url))
+            if not script_data:
+                print("❌ 스크립트 생성 실패")
+                return None
+
+            print(f"✅ 제목: {script_data['title']}")
+            print(f"✅ 주제: {script_data['topic']}")
+            print(f"✅ 이미지 프롬프트: {len(script_data.get('image_prompts', []))}개")
+
+            # 스크립트 저장
+            script_path = f"output/script_{timestamp}.json"
+            self.script_gen.save_script(script_data, script_path)
+            return script_data
+
+        def images_stage(script_data):
+            # 2'. 배경 이미지 (TTS와 동시 실행, 실패 시 비디오 단계에서 다시 준비)
+            print("\n[2/6] 🎨 배경 이미지 준비 중 (TTS와 동시 실행)...")
+            return self.video_gen.prepare_background_images(script_data, use_ai_bg,
+                                                            save_dir=workspace.path("images"))
+
+        def video_stage(script_data, audio_result, background_images):
+            # 3. 비디오 생성 (5장 AI 이미지 + 음성 타이밍 자막)
+            print("\n[3/6] 🎬 비디오 생성 중...")
+            final_video = self.video_gen.create_video(
+                script_data,
+                audio_result['path'],
+                work_video,
+                sentence_timings=audio_result.get('sentence_timings', None),
+                use_ai_background=use_ai_bg,
+                background_images=background_images,
+                workspace=workspace
+            )
+            if not final_video:
+                print("❌ 비디오 생성 실패")
+                return None
+            # 썸네일 경로는 스레드별로 저장되므로 비디오를 만든 스레드에서 가져옴
+            return {'video_path': final_video, 'thumbnail_path': self.video_gen.get_thumbnail_path()}
+
+        # 2. TTS 생성 (문장 타이밍이 도착하는 대로 자막 이미지 예열)
+        prefetcher = self._create_prefetcher(self.video_gen.create_prefetcher)
+        pipeline = self._new_pipeline('shorts', manifest)
+        pipeline.add('script', script_stage, expect=dict)
+        pipeline.add('audio', lambda script_data: self._tts_stage(script_data, work_audio, prefetcher, "[2/6]", workspace),
+                     inputs=('script',), expect=dict, files=lambda r: [r['path']])
+        pipeline.add('images', images_stage, inputs=('script',), required=False, expect=list,
+                     files=lambda paths: paths)
+        pipeline.add('video', video_stage, inputs=('script', 'audio', 'images'), expect=dict,
+                     files=lambda r: [r['video_path'], r['thumbnail_path']])
+        try:
+            artifacts = pipeline.run()
+        finally:
+            if prefetcher:
+                prefetcher.close()
+        if pipeline.failed:
             return None
+        script_data = artifacts['script']
+
+        # 완성된 음성/비디오만 output/으로 이동 (원자적 rename)
+        self._promote(workspace, manifest, artifacts['audio']['path'], audio_path)
+        self._promote(workspace, manifest, artifacts['video']['video_path'], video_path)
 
         # 4. 썸네일 확인
         print("\n[4/6] 🖼️  썸네일 확인 중...")
-        thumbnail_path = self.video_gen.get_thumbnail_path()
+        thumbnail_path = artifacts['video']['thumbnail_path']
         if thumbnail_path and os.path.exists(thumbnail_path):
+            thumbnail_path = self._promote(workspace, manifest, thumbnail_path,
+                                           video_path.replace('.mp4', '_thumb.jpg'))
             print(f"✅ 후킹 썸네일: {thumbnail_path}")
         else:
             thumbnail_path = None
@@ -139,29 +413,35 @@ class YouTubeAutomation:
             'type': 'shorts'
         }
 
-        if upload and self.config.get('upload', {}).get('shorts', {}).get('auto_upload', True):
+        if want_upload:
             print("\n[5/6] 📤 YouTube 업로드 중...")
 
-            # 현재 인증된 채널 확인
-            current_channel = self.uploader.get_authenticated_channel()
-            if current_channel:
-                print(f"✓ 현재 로그인 채널: {current_channel['title']} ({current_channel['id']})")
+            def upload_fn():
+                # YouTube API 클라이언트는 스레드 안전하지 않으므로 동시 작업의 업로드는 순서대로
+                with get_limiter('youtube'):
+                    # 현재 인증된 채널 확인
+                    current_channel = self.uploader.get_authenticated_channel()
+                    if current_channel:
+                        print(f"✓ 현재 로그인 채널: {current_channel['title']} ({current_channel['id']})")
 
-            target_channel_id = self.config['youtube'].get('target_channel_id')
-            if target_channel_id and current_channel and current_channel['id'] != target_channel_id:
-                print(f"⚠️  주의: 대상 채널({target_channel_id})이 현재 로그인 채널과 다릅니다!")
+                    target_channel_id = self.config['youtube'].get('target_channel_id')
+                    if target_channel_id and current_channel and current_channel['id'] != target_channel_id:
+                        print(f"⚠️  주의: 대상 채널({target_channel_id})이 현재 로그인 채널과 다릅니다!")
 
-            # 구조화 메타데이터 전달 (제목, 설명, 해시태그, 고정댓글 포함)
-            upload_result = self.uploader.upload_video(
-                video_path,
-                script_data,
-                thumbnail_path=thumbnail_path,
-                channel_id=target_channel_id,
-                metadata=script_data,
-                add_pinned_comment=True,
-                publish_at=publish_at,
-                longform_url=longform_url
-            )
+                    # 구조화 메타데이터 전달 (제목, 설명, 해시태그, 고정댓글 포함)
+                    return self.uploader.upload_video(
+                        video_path,
+                        script_data,
+                        thumbnail_path=thumbnail_path,
+                        channel_id=target_channel_id,
+                        metadata=script_data,
+                        add_pinned_comment=True,
+                        publish_at=publish_at,
+                        longform_url=longform_url,
+                        session_path=workspace.path("upload_session.json")
+                    )
+
+            upload_result = self._upload_once(manifest, upload_fn)
             if upload_result:
                 result['upload'] = upload_result
                 print(f"\n🎉 모든 작업 완료!")
@@ -176,34 +456,48 @@ class YouTubeAutomation:
         print("\n[6/6] 📋 로그 저장 중...")
         self.save_log(result)
 
+        # 업로드까지 끝난 작업만 완료 처리 (업로드 실패 시 --resume으로 업로드만 재시도)
+        if not want_upload or result.get('upload'):
+            manifest.mark_done()
         return result
     
     def save_log(self, result):
         """작업 로그 저장"""
         log_path = f"logs/log_{result['timestamp']}.json"
+        # 외부 API 제공자 상태 (회로 차단기 성공률/지연/건강 점수)
+        from circuit_breaker import health_report  # type: ignore
+        result['provider_health'] = health_report()
         with open(log_path, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
         print(f"📋 로그 저장: {log_path}")
     
     def batch_create(self, count=3, upload=True, publish_at=''):
-        """여러 영상 일괄 생성"""
-        print(f"\n🚀 {count}개의 영상을 일괄 생성합니다...\n")
+        """여러 영상 일괄 생성 (batch.concurrent_jobs개 동시 실행)
+
+        API 호출 간격은 고정 대기 대신 rate_limits의 API별 동시성/분당 요청 수 제한이,
+        CPU 인코딩 동시 실행 수는 rate_limits.render가 조절합니다.
+        """
+        jobs = max(1, min(count, self.config.get('batch', {}).get('concurrent_jobs', 2)))
+        print(f"\n🚀 {count}개의 영상을 일괄 생성합니다 (동시 {jobs}개)...\n")
         
-        results = []
-        for i in range(count):
+        def run_job(i):
             print(f"\n{'='*60}")
-            print(f"영상 {i+1}/{count} 생성 중...")
+            print(f"영상 {i+1}/{count} 생성 시작")
             print(f"{'='*60}")
-            
-            result = self.create_video(upload=upload, publish_at=publish_at)
-            if result:
-                results.append(result)
-            
-            # 잠시 대기 (API 제한 방지)
-            if i < count - 1:
-                import time
-                print("\n⏱️  다음 영상 생성까지 10초 대기...")
-                time.sleep(10)
+            try:
+                return self.create_video(upload=upload, publish_at=publish_at)
+            except Exception as e:
+                print(f"❌ 영상 {i+1}/{count} 생성 오류: {e}")
+                return None
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='job') as pool:
+            futures = [pool.submit(run_job, i) for i in range(count)]
+            for future in as_completed(futures):
+                result = future.result()
+                if result:
+                    results.append(result)
+        results.sort(key=lambda r: r['timestamp'])
         
         print(f"\n{'='*60}")
         print(f"✅ 총 {len(results)}/{count}개 영상 생성 완료!")
@@ -212,73 +506,118 @@ class YouTubeAutomation:
         return results
     
     def create_longform_video(self, topic=None, upload=True, publish_at=''):
-        """롱폼 영상 생성 및 업로드 (10-15분)"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """롱폼 영상 생성 및 업로드 (10-15분)
+
+        단계 그래프: script → (metadata ‖ audio) → video
+        메타데이터(Gemini)는 대본만 필요하므로 TTS와 동시에 생성합니다.
+        중간 파일은 작업별 workspace에서 만들고 완성본만 output/으로 옮깁니다.
+        완료된 단계는 매니페스트에 기록되어 실패 시 --resume JOB_ID로 이어서 실행할 수 있습니다.
+        """
+        workspace = self._new_workspace()
+        manifest = JobManifest(workspace.dir)
+        manifest.set_job(type='longform', topic=topic, upload=upload, publish_at=publish_at)
+        return self._run_job(workspace, manifest)
+
+    def _run_longform_job(self, workspace, manifest, topic, upload, publish_at):
+        """롱폼 작업 본문 (create_longform_video 참고)"""
+        timestamp = workspace.job_id
         
         print("\n" + "="*60)
         print("🎬 YouTube 롱폼 비디오 자동 제작 시작")
         print("="*60)
         
-        # 1. 롱폼 스크립트 생성
-        print("\n[1/7] 📚 롱폼 스크립트 생성 중...")
-        script_data = self.longform_script_gen.generate_script(topic)
-        if not script_data:
-            print("❌ 스크립트 생성 실패")
-            return None
+        audio_path = f"output/longform_audio/audio_{timestamp}.mp3"
+        video_path = f"output/longform_videos/longform_{timestamp}.mp4"
+        work_audio = workspace.path("audio.mp3")
+        work_video = workspace.path("longform.mp4")
+        use_ai_bg = self.config.get('video', {}).get('longform', {}).get('use_ai_background', True)
+        want_upload = self._will_upload('longform', upload)
         
-        print(f"✅ 제목: {script_data['title']}")
-        print(f"✅ 주제: {script_data['topic']}")
-        print(f"✅ 길이: {script_data['estimated_duration']}")
+        def script_stage():
+            # 1. 롱폼 스크립트 생성
+            if want_upload:
+                self.sync_channel()
+            print("\n[1/7] 📚 롱폼 스크립트 생성 중...")
+            script_data = self.longform_script_gen.generate_script(topic)
+            if not script_data:
+                print("❌ 스크립트 생성 실패")
+                return None
+            
+            print(f"✅ 제목: {script_data['title']}")
+            print(f"✅ 주제: {script_data['topic']}")
+            print(f"✅ 길이: {script_data['estimated_duration']}")
+            
+            # 스크립트 저장
+            script_path = f"output/longform_script_{timestamp}.json"
+            self.longform_script_gen.save_script(script_data, script_path)
+            return script_data
         
-        # 스크립트 저장
-        script_path = f"output/longform_script_{timestamp}.json"
-        self.longform_script_gen.save_script(script_data, script_path)
+        def metadata_stage(script_data):
+            # 2. YouTube 메타데이터 생성 (제목/설명/해시태그/고정댓글, TTS와 동시 실행)
+            print("\n[2/7] 📋 YouTube 메타데이터 생성 중...")
+            metadata = self.longform_script_gen.generate_metadata(script_data)
+            
+            # 메타데이터 저장
+            meta_path = f"output/longform_metadata_{timestamp}.json"
+            try:
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+                print(f"✅ 메타데이터 저장: {meta_path}")
+            except Exception:
+                pass
+            return metadata
         
-        # 2. YouTube 메타데이터 생성 (제목/설명/해시태그/고정댓글)
-        print("\n[2/7] 📋 YouTube 메타데이터 생성 중...")
-        metadata = self.longform_script_gen.generate_metadata(script_data)
+        def video_stage(script_data, audio_result):
+            duration = audio_result.get('duration', 0)
+            print(f"✅ 음성 길이: {duration:.0f}초 ({duration/60:.1f}분)")
+            
+            # 4. 롱폼 비디오 생성
+            print("\n[4/7] 🎬 비디오 생성 중...")
+            final_video = self.longform_video_gen.create_video(
+                script_data,
+                audio_result['path'],
+                work_video,
+                sentence_timings=audio_result.get('sentence_timings', []),
+                use_ai_background=use_ai_bg,
+                prefetcher=prefetcher,
+                workspace=workspace
+            )
+            if not final_video:
+                print("❌ 비디오 생성 실패")
+                return None
+            # 썸네일 경로는 스레드별로 저장되므로 비디오를 만든 스레드에서 가져옴
+            return {'video_path': final_video, 'thumbnail_path': self.longform_video_gen.get_thumbnail_path()}
         
-        # 메타데이터 저장
-        meta_path = f"output/longform_metadata_{timestamp}.json"
+        # 3. TTS 생성 (롱폼용, 합성 중 도착한 타이밍으로 자막 예열 + 30초 장면 배경 선요청)
+        prefetcher = self._create_prefetcher(
+            lambda: self.longform_video_gen.create_prefetcher(workspace=workspace))
+        pipeline = self._new_pipeline('longform', manifest)
+        pipeline.add('script', script_stage, expect=dict)
+        pipeline.add('metadata', metadata_stage, inputs=('script',), required=False, expect=dict)
+        pipeline.add('audio', lambda script_data: self._tts_stage(script_data, work_audio, prefetcher, "[3/7]", workspace),
+                     inputs=('script',), expect=dict, files=lambda r: [r['path']])
+        pipeline.add('video', video_stage, inputs=('script', 'audio'), expect=dict,
+                     files=lambda r: [r['video_path'], r['thumbnail_path']])
         try:
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-            print(f"✅ 메타데이터 저장: {meta_path}")
-        except Exception:
-            pass
-        
-        # 3. TTS 생성 (롱폼용)
-        print("\n[3/7] 🎤 음성 생성 중...")
-        audio_path = f"output/longform_audio/audio_{timestamp}.mp3"
-        audio_result = self.tts_gen.text_to_speech(script_data['script'], audio_path)
-        if not audio_result:
-            print("❌ 음성 생성 실패")
+            artifacts = pipeline.run()
+        finally:
+            if prefetcher:
+                prefetcher.close()
+        if pipeline.failed:
             return None
+        script_data = artifacts['script']
+        metadata = artifacts['metadata']
         
-        duration = audio_result.get('duration', 0)
-        sentence_timings = audio_result.get('sentence_timings', [])
-        print(f"✅ 음성 길이: {duration:.0f}초 ({duration/60:.1f}분)")
-        
-        # 4. 롱폼 비디오 생성
-        print("\n[4/7] 🎬 비디오 생성 중...")
-        video_path = f"output/longform_videos/longform_{timestamp}.mp4"
-        use_ai_bg = self.config.get('video', {}).get('longform', {}).get('use_ai_background', True)
-        
-        final_video = self.longform_video_gen.create_video(
-            script_data,
-            audio_path,
-            video_path,
-            sentence_timings=sentence_timings,
-            use_ai_background=use_ai_bg
-        )
-        
-        if not final_video:
-            print("❌ 비디오 생성 실패")
-            return None
+        # 완성된 음성/비디오만 output/으로 이동 (원자적 rename)
+        self._promote(workspace, manifest, artifacts['audio']['path'], audio_path)
+        self._promote(workspace, manifest, artifacts['video']['video_path'], video_path)
         
         # 5. 썸네일 (비디오 생성 시 자동 생성된 후킹 화면 캡처 사용)
         print("\n[5/7] 🖼️  썸네일 확인 중...")
-        thumbnail_path = self.longform_video_gen.get_thumbnail_path()
+        thumbnail_path = artifacts['video']['thumbnail_path']
+        if thumbnail_path and os.path.exists(thumbnail_path):
+            thumbnail_path = self._promote(workspace, manifest, thumbnail_path,
+                                           f"output/thumbnails/longform_thumb_{timestamp}.jpg")
         thumb = thumbnail_path if thumbnail_path and os.path.exists(thumbnail_path) else None
         if thumb:
             print(f"✅ 후킹 썸네일 사용: {thumbnail_path}")
@@ -296,18 +635,23 @@ class YouTubeAutomation:
             'type': 'longform'
         }
         
-        if upload and self.config['upload']['longform'].get('auto_upload', True):
+        if want_upload:
             print("\n[6/7] 📤 YouTube 업로드 중...")
             
-            # 롱폼 비디오 업로드 (Gemini 생성 메타데이터 + 썸네일)
-            upload_result = self.uploader.upload_longform_video(
-                video_path,
-                script_data,
-                thumbnail_path=thumbnail_path if thumb else None,
-                add_pinned_comment=True,
-                metadata=metadata,
-                publish_at=publish_at
-            )
+            def upload_fn():
+                # 롱폼 비디오 업로드 (Gemini 생성 메타데이터 + 썸네일)
+                with get_limiter('youtube'):
+                    return self.uploader.upload_longform_video(
+                        video_path,
+                        script_data,
+                        thumbnail_path=thumbnail_path if thumb else None,
+                        add_pinned_comment=True,
+                        metadata=metadata,
+                        publish_at=publish_at,
+                        session_path=workspace.path("upload_session.json")
+                    )
+            
+            upload_result = self._upload_once(manifest, upload_fn)
             
             if upload_result:
                 result['upload'] = upload_result
@@ -322,6 +666,9 @@ class YouTubeAutomation:
         print("\n[7/7] 📋 로그 저장 중...")
         self.save_log(result)
         
+        # 업로드까지 끝난 작업만 완료 처리 (업로드 실패 시 --resume으로 업로드만 재시도)
+        if not want_upload or result.get('upload'):
+            manifest.mark_done()
         return result
 
 
@@ -335,12 +682,18 @@ def main():
     parser.add_argument('--test', action='store_true', help='테스트 모드 (업로드 없음)')
     parser.add_argument('--publish-at', type=str, default='',
                        help='YouTube 예약 공개 시간 (ISO 8601, 예: 2026-02-19T08:30:00+09:00)')
+    parser.add_argument('--resume', type=str, metavar='JOB_ID',
+                       help='실패/중단된 작업 재개 (work/JOB_ID의 완료 단계는 건너뜀)')
     
     args = parser.parse_args()
     
     # 자동화 시스템 초기화
     automation = YouTubeAutomation()
     
+    if args.resume:
+        automation.resume_job(args.resume)
+        return
+    
     # 업로드 여부
     upload = not args.no_upload and not args.test
     
@@ -360,6 +713,8 @@ def main():
         print("🎥 쇼츠 + 롱폼 동일 주제 연동 생성\n")
         
         # 1. 공유 주제 선택 (쇼츠/롱폼 동일 주제)
+        if upload and not args.topic:
+            automation.sync_channel()
         topic = args.topic or automation.script_gen.pick_topic()
         print(f"\n🎯 공유 주제: {topic}\n")
         
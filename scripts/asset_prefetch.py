@@ -0,0 +1,118 @@
+"""
+TTS 스트리밍 선작업 모듈
+Edge TTS가 SentenceBoundary 타이밍을 보내는 즉시 받아서, 합성이 끝나기 전에
+자막 래스터(캐시 예열)와 장면 배경 이미지 요청을 미리 시작합니다.
+- 자막: 문장 도착 시 바로 래스터화 → 비디오 단계에서는 캐시 적중
+- 장면: scene_seconds 구간의 마지막 문장이 지나가면(다음 구간 문장 도착) 프롬프트 생성 + 이미지 요청
+비디오 단계는 최종 타이밍으로 같은 프롬프트를 다시 만들어 take_scene()으로 결과를 가져가고,
+보정으로 구간 경계가 달라져 프롬프트가 다르면 평소처럼 새로 요청합니다.
+TTS가 실패 후 처음부터 다시 합성하면 reset()으로 누적 상태를 비워 같은 문장이 중복 집계되지 않게 합니다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AssetPrefetcher:
+    """타이밍 콜백(on_timing)을 받아 자막/장면 선작업을 스레드 풀에 넘기는 객체"""
+
+    def __init__(self, subtitle_fn=None, scene_prompt_fn=None, scene_fetch_fn=None,
+                 scene_seconds=30, workers=4):
+        """
+        subtitle_fn(timing, index): 자막 이미지 예열 (반환값 무시)
+        scene_prompt_fn(index, scene_text, used_prompts): 장면 프롬프트 생성 (순서대로 호출)
+        scene_fetch_fn(index, prompt): 장면 이미지 확보 (결과는 take_scene으로 전달)
+        workers: 장면 이미지 동시 요청 수
+        """
+        self.subtitle_fn = subtitle_fn
+        self.scene_prompt_fn = scene_prompt_fn
+        self.scene_fetch_fn = scene_fetch_fn
+        self.scene_seconds = scene_seconds
+        # 자막(CPU)과 장면 이미지(네트워크 대기)를 분리해 느린 이미지 요청이 자막 예열을 막지 않게 함
+        self._subtitle_pool = ThreadPoolExecutor(max_workers=1)
+        self._scene_pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._lock = threading.Lock()
+        self._count = 0
+        self._scene_texts = []  # 구간별 누적 문장
+        self._next_scene = 0  # 아직 요청하지 않은 첫 구간
+        self._used_prompts = set()  # 비디오 단계와 같은 순서로 중복 방지 상태 재현
+        self._scene_futures = {}  # (index, prompt) → Future
+        self._previous_futures = {}  # reset 전에 시작된 요청 (같은 장면/프롬프트가 다시 나오면 재사용)
+        self._closed = False
+
+    def on_timing(self, timing):
+        """TTS 타이밍 1건 수신 (TTS 이벤트 루프에서 호출되므로 무거운 작업은 풀로 넘김)"""
+        with self._lock:
+            if self._closed:
+                return
+            index = self._count
+            self._count += 1
+
+            if self.subtitle_fn:
+                self._subtitle_pool.submit(self._run, self.subtitle_fn, timing, index)
+
+            if self.scene_prompt_fn and self.scene_fetch_fn:
+                scene = int(timing.get('start', 0) // self.scene_seconds)
+                while len(self._scene_texts) <= scene:
+                    self._scene_texts.append([])
+                self._scene_texts[scene].append(timing.get('text', ''))
+                # 현재 문장보다 앞선 구간은 더 이상 문장이 추가되지 않음 → 요청 시작
+                while self._next_scene < scene:
+                    self._submit_scene(self._next_scene)
+                    self._next_scene += 1
+
+    def _submit_scene(self, i):
+        """구간 i의 프롬프트 생성 + 이미지 요청 (lock 보유 상태에서 호출)"""
+        scene_text = " ".join(self._scene_texts[i]).strip()
+        try:
+            prompt = self.scene_prompt_fn(i, scene_text, self._used_prompts)
+        except Exception as e:
+            print(f"   ⚠️ 장면 {i+1} 프롬프트 선작업 실패: {e}")
+            return
+        future = self._previous_futures.pop((i, prompt), None)
+        if future is None:
+            future = self._scene_pool.submit(self.scene_fetch_fn, i, prompt)
+        self._scene_futures[(i, prompt)] = future
+
+    def reset(self):
+        """TTS를 처음부터 다시 합성할 때 호출: 문장 수/구간 문장/프롬프트 상태 초기화
+
+        아직 시작하지 않은 장면 요청은 취소하고, 이미 실행 중이거나 끝난 요청은
+        재합성에서 같은 장면/프롬프트가 나오면 다시 쓰도록 보관합니다.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            previous = dict(self._previous_futures)
+            previous.update(self._scene_futures)
+            self._previous_futures = {key: future for key, future in previous.items() if not future.cancel()}
+            self._scene_futures = {}
+            self._count = 0
+            self._scene_texts = []
+            self._next_scene = 0
+            self._used_prompts = set()
+
+    def take_scene(self, index, prompt):
+        """선요청한 장면 이미지 Future 반환 (같은 장면/프롬프트가 없으면 None)"""
+        with self._lock:
+            return self._scene_futures.pop((index, prompt), None)
+
+    def close(self):
+        """남은 선작업 취소 (이미 실행 중인 요청은 끝까지 진행)"""
+        with self._lock:
+            self._closed = True
+            unused = list(self._scene_futures.values()) + list(self._previous_futures.values())
+            self._scene_futures.clear()
+            self._previous_futures.clear()
+        for future in unused:
+            future.cancel()
+        self._subtitle_pool.shutdown(wait=False, cancel_futures=True)
+        self._scene_pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run(fn, *args):
+        """선작업 실패는 무시 (비디오 단계에서 다시 시도)"""
+        try:
+            fn(*args)
+        except Exception:
+            pass
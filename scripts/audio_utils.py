@@ -0,0 +1,151 @@
+"""
+오디오 유틸리티 모듈
+MP3 전체를 PCM으로 디코딩하지 않고 프레임 헤더(또는 Xing/Info/VBRI 태그)만 읽어 길이를 계산합니다.
+- Edge TTS MP3(헤더 없는 CBR 프레임열)와 청크를 이어붙인 파일 모두 프레임 수로 정확히 계산
+- 15분 음성 기준 pydub 디코딩(ffmpeg 프로세스 + 수백 MB PCM) 대신 수십 ms
+"""
+
+import struct
+
+
+# 비트레이트 표 (kbps) : (MPEG 버전 그룹, 레이어) → 인덱스 1~14
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# 샘플레이트 표 : 버전 비트 → 인덱스 0~2 (MPEG 2.5 / MPEG 2 / MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+
+def _parse_frame_header(data, pos):
+    """pos 위치의 MPEG 오디오 프레임 헤더 해석
+
+    Returns: (프레임 바이트 수, 프레임당 샘플 수, 샘플레이트, MPEG1 여부, 모노 여부) 또는 None
+    """
+    if pos + 4 > len(data):
+        return None
+    b1, b2, b3, b4 = data[pos], data[pos + 1], data[pos + 2], data[pos + 3]
+    if b1 != 0xFF or (b2 & 0xE0) != 0xE0:
+        return None
+    version_bits = (b2 >> 3) & 0x03
+    layer_bits = (b2 >> 1) & 0x03
+    bitrate_index = (b3 >> 4) & 0x0F
+    sample_rate_index = (b3 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None  # 예약값 / free format은 지원하지 않음
+
+    layer = 4 - layer_bits
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(1 if mpeg1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b3 >> 1) & 0x01
+    mono = ((b4 >> 6) & 0x03) == 3
+
+    if layer == 1:
+        samples = 384
+        frame_size = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2:
+        samples = 1152
+        frame_size = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 1152 if mpeg1 else 576
+        frame_size = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    return frame_size, samples, sample_rate, mpeg1, mono
+
+
+def _skip_id3v2(data):
+    """ID3v2 태그 길이 (없으면 0)"""
+    if len(data) >= 10 and data[:3] == b'ID3':
+        size = ((data[6] & 0x7F) << 21) | ((data[7] & 0x7F) << 14) | ((data[8] & 0x7F) << 7) | (data[9] & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _vbr_frame_count(data, pos, header):
+    """첫 프레임의 Xing/Info/VBRI 태그에서 (프레임 수, 스트림 바이트 수) 읽기 (없으면 None)"""
+    frame_size, _, _, mpeg1, mono = header
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing + 4:xing + 8])[0]
+        if not flags & 0x01:
+            return None
+        frames = struct.unpack('>I', data[xing + 8:xing + 12])[0]
+        stream_bytes = struct.unpack('>I', data[xing + 12:xing + 16])[0] if flags & 0x02 else None
+        return frames, stream_bytes
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b'VBRI':
+        stream_bytes, frames = struct.unpack('>II', data[vbri + 10:vbri + 18])
+        return frames, stream_bytes
+    return None
+
+
+def probe_mp3_duration(path):
+    """MP3 길이(초)를 헤더만으로 계산 (MP3가 아니거나 프레임을 찾지 못하면 None)
+
+    1) ID3v2 태그 건너뛰기
+    2) 첫 프레임에 Xing/Info/VBRI 태그가 있고 기록된 바이트 수가 실제 파일과 맞으면 프레임 수 사용
+       (태그가 있는 파일 뒤에 다른 조각을 이어붙인 경우는 바이트 수가 달라 3)으로 진행)
+    3) 그 외에는 프레임 헤더를 따라가며 샘플 수를 합산
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    end = len(data)
+    if end >= 128 and data[-128:-125] == b'TAG':
+        end -= 128  # ID3v1 태그
+
+    pos = _skip_id3v2(data)
+    # 첫 유효 프레임 찾기 (다음 프레임 헤더까지 이어지는지 확인해 우연한 동기 패턴 배제)
+    first = None
+    while pos < end - 4:
+        header = _parse_frame_header(data, pos)
+        if header and (pos + header[0] >= end or _parse_frame_header(data, pos + header[0])):
+            first = header
+            break
+        pos += 1
+    if first is None:
+        return None
+
+    tag = _vbr_frame_count(data, pos, first)
+    if tag:
+        frames, stream_bytes = tag
+        if frames and (stream_bytes is None or abs(stream_bytes - (end - pos)) <= first[0]):
+            return frames * first[1] / first[2]
+        pos += first[0]  # 태그 프레임은 무음이므로 제외하고 직접 계산
+
+    total = 0.0
+    while pos < end - 4:
+        header = _parse_frame_header(data, pos)
+        if header is None:
+            pos += 1  # 손상/이어붙인 경계 → 다음 동기 바이트 탐색
+            continue
+        frame_size, samples, sample_rate = header[0], header[1], header[2]
+        if pos + frame_size > end:
+            break  # 잘린 마지막 프레임
+        total += samples / sample_rate
+        pos += frame_size
+    return total if total > 0 else None
+
+
+def get_audio_duration(path):
+    """오디오 길이(초) 반환: MP3 헤더 분석 우선, 실패 시 pydub 디코딩으로 폴백"""
+    duration = probe_mp3_duration(path)
+    if duration is not None:
+        return duration
+    print("   ⚠️ MP3 헤더 분석 실패 → pydub 디코딩으로 길이 계산")
+    from pydub import AudioSegment
+    return len(AudioSegment.from_file(path)) / 1000.0
@@ -0,0 +1,197 @@
+"""
+채널 영상 저장소 모듈
+채널 업로드 영상(ID, 제목, 게시 시각)을 로컬 파일에 저장해 두고, 실행할 때마다
+업로드 재생목록을 처음부터 끝까지 훑는 대신 저장된 최신 영상(커서)보다 새 영상만 가져옵니다.
+- 증분 동기화: 최신순 페이지를 읽다가 이미 아는 영상 ID를 만나면 중단 → O(새 영상 수)
+- 전체 재조정: full_sync_days마다 한 번 전체 목록으로 교체 (삭제/제목 변경 반영)
+- 다른 채널(업로드 재생목록 ID가 다름)로 인증되면 저장소를 비우고 새로 시작
+- 업로드 재생목록 ID도 인증 파일별로 저장 (채널 조회 API 호출 생략, 전체 재조정 때 다시 확인)
+- 영상별 조회수/좋아요 통계 테이블: 최근 영상은 매번, 오래된 영상일수록 드물게 갱신 (stats_due)
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+
+# 통계 갱신 주기 기본값: 게시 후 경과 일수 max_age_days 이하인 영상은 interval_hours마다 갱신
+# (0 = 매 실행, max_age_days가 None이면 그보다 오래된 모든 영상)
+DEFAULT_STATS_TIERS = [
+    {'max_age_days': 3, 'interval_hours': 0},
+    {'max_age_days': 30, 'interval_hours': 24},
+    {'max_age_days': 180, 'interval_hours': 168},
+    {'max_age_days': None, 'interval_hours': 720},
+]
+
+
+def _published_ts(published_at):
+    """ISO 8601 게시 시각 → epoch 초 (파싱 실패 시 None)"""
+    if not published_at:
+        return None
+    try:
+        return datetime.fromisoformat(published_at.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class ChannelStore:
+    """채널 업로드 영상 목록 로컬 저장소 (스레드 안전, 변경할 때마다 원자적 저장)"""
+
+    def __init__(self, path="logs/channel_store.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    @property
+    def playlist_id(self):
+        """저장된 영상이 속한 업로드 재생목록 ID"""
+        return self._data.get('playlist_id')
+
+    @property
+    def owner(self):
+        """재생목록 ID를 확인한 인증 정보 (인증 파일 경로)"""
+        return self._data.get('owner')
+
+    @property
+    def videos(self):
+        """저장된 영상 목록 (최신순)"""
+        with self._lock:
+            return [dict(v) for v in self._data['videos']]
+
+    @property
+    def cursor(self):
+        """증분 동기화 기준점 (가장 최근 영상의 ID/게시 시각, 없으면 None)"""
+        with self._lock:
+            if not self._data['videos']:
+                return None
+            newest = self._data['videos'][0]
+            return {'id': newest['id'], 'published_at': newest.get('published_at', '')}
+
+    def known_ids(self):
+        """저장된 영상 ID 집합"""
+        with self._lock:
+            return {v['id'] for v in self._data['videos']}
+
+    def bind(self, playlist_id, owner=None):
+        """업로드 재생목록 ID 지정 (다른 채널의 저장소면 비우고 새로 시작)"""
+        with self._lock:
+            if self._data.get('playlist_id') == playlist_id:
+                if self._data.get('owner') != owner:
+                    self._data['owner'] = owner
+                    self._save()
+                return
+            if self._data.get('playlist_id'):
+                print("⚠️ 다른 채널의 영상 저장소 → 초기화")
+            self._data = self._empty()
+            self._data['playlist_id'] = playlist_id
+            self._data['owner'] = owner
+            self._save()
+
+    def needs_full_sync(self, max_age_days=7):
+        """전체 재조정이 필요한지 (저장소가 비었거나 마지막 전체 조회가 max_age_days보다 오래됨)"""
+        with self._lock:
+            if not self._data['videos']:
+                return True
+            return time.time() - self._data.get('last_full_sync', 0) > max_age_days * 86400
+
+    def replace_all(self, videos):
+        """전체 조회 결과로 교체 (최신순 목록, 사라진 영상의 통계도 삭제)"""
+        with self._lock:
+            self._data['videos'] = [dict(v) for v in videos]
+            ids = {v['id'] for v in videos}
+            self._data['stats'] = {k: v for k, v in self._data['stats'].items() if k in ids}
+            self._data['last_full_sync'] = time.time()
+            self._data['last_sync'] = time.time()
+            self._save()
+
+    def merge_new(self, videos):
+        """증분 조회로 받은 새 영상(최신순)을 앞에 추가 (이미 있는 ID는 제목/시각만 갱신)"""
+        with self._lock:
+            known = {v['id']: v for v in self._data['videos']}
+            fresh = []
+            for video in videos:
+                if video['id'] in known:
+                    known[video['id']].update(video)
+                else:
+                    fresh.append(dict(video))
+            self._data['videos'] = fresh + self._data['videos']
+            self._data['last_sync'] = time.time()
+            self._save()
+            return len(fresh)
+
+    def stats_due(self, tiers=None, now=None):
+        """통계를 갱신할 영상 ID 목록 (통계가 없거나 경과 일수 구간의 갱신 주기가 지난 영상)"""
+        tiers = tiers or DEFAULT_STATS_TIERS
+        now = now or time.time()
+        due = []
+        with self._lock:
+            for video in self._data['videos']:
+                entry = self._data['stats'].get(video['id'])
+                if entry is None:
+                    due.append(video['id'])
+                    continue
+                published = _published_ts(video.get('published_at'))
+                age_days = (now - published) / 86400 if published else float('inf')
+                interval_hours = tiers[-1]['interval_hours']
+                for tier in tiers:
+                    if tier.get('max_age_days') is None or age_days <= tier['max_age_days']:
+                        interval_hours = tier['interval_hours']
+                        break
+                if now - entry.get('fetched_at', 0) >= interval_hours * 3600:
+                    due.append(video['id'])
+        return due
+
+    def update_stats(self, stats, requested=()):
+        """통계 저장 (stats: {id: {'views', 'likes'}})
+
+        requested 중 응답에 없던 영상(삭제/비공개)도 조회 시각을 기록해 매번 다시 요청하지 않음
+        """
+        now = time.time()
+        with self._lock:
+            for video_id, values in stats.items():
+                self._data['stats'][video_id] = dict(values, fetched_at=now)
+            for video_id in requested:
+                if video_id not in stats:
+                    entry = self._data['stats'].setdefault(video_id, {'views': 0, 'likes': 0})
+                    entry['fetched_at'] = now
+            self._save()
+
+    def stats(self):
+        """저장된 영상별 통계 {id: {'views', 'likes', 'fetched_at'}}"""
+        with self._lock:
+            return {k: dict(v) for k, v in self._data['stats'].items()}
+
+    @staticmethod
+    def _empty():
+        return {'playlist_id': None, 'owner': None, 'videos': [], 'stats': {},
+                'last_full_sync': 0, 'last_sync': 0}
+
+    def _load(self):
+        """저장소 로드 (없거나 손상되면 빈 저장소 → 다음 동기화에서 전체 조회)"""
+        empty = self._empty()
+        if not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            print(f"⚠️ 채널 영상 저장소 손상 → 전체 조회로 재생성: {self.path}")
+            return empty
+        for key, default in empty.items():
+            data.setdefault(key, default)
+        return data
+
+    def _save(self):
+        """원자적 저장 (lock 보유 상태에서 호출)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 채널 영상 저장소 저장 실패: {e}")
@@ -0,0 +1,137 @@
+"""
+외부 API 회로 차단기 모듈
+제공자(HuggingFace / Together / Pexels / Edge TTS)별로 최근 요청 성공률과 지연 시간을 추적하고,
+연속 실패가 임계값을 넘으면 회로를 열어 타임아웃을 기다리지 않고 바로 다음 단계로 넘어갑니다.
+- closed: 정상 요청
+- open: 요청 차단 (recovery_seconds 경과 후 half-open)
+- half-open: 탐색 요청 1건만 허용 → 성공 시 closed, 실패 시 다시 open
+"""
+
+import time
+import threading
+from collections import deque
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """제공자 하나의 회로 차단기 (스레드 안전)"""
+
+    def __init__(self, name, failure_threshold=3, recovery_seconds=120, window=20, slow_seconds=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.slow_seconds = slow_seconds  # 이 지연 이상이면 건강 점수 감점
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._results = deque(maxlen=window)  # (성공 여부, 지연 초)
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """요청 가능 여부 (open이면 False, half-open이면 탐색 1건만 True)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self.recovery_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            # half-open: 탐색 요청 하나만 통과
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency=0.0):
+        with self._lock:
+            self._results.append((True, latency))
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != CLOSED:
+                print(f"   🔌 [{self.name}] 회로 복구 (closed)")
+            self.state = CLOSED
+
+    def record_failure(self, latency=0.0):
+        with self._lock:
+            self._results.append((False, latency))
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or (
+                    self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = time.time()
+                print(f"   🔌 [{self.name}] 회로 차단 (연속 실패 {self.consecutive_failures}회, "
+                      f"{self.recovery_seconds}초 후 재시도)")
+
+    def error_rate(self):
+        """최근 window개 요청의 실패 비율"""
+        with self._lock:
+            if not self._results:
+                return 0.0
+            return sum(1 for ok, _ in self._results if not ok) / len(self._results)
+
+    def avg_latency(self):
+        """최근 window개 요청의 평균 지연 (초)"""
+        with self._lock:
+            if not self._results:
+                return 0.0
+            return sum(latency for _, latency in self._results) / len(self._results)
+
+    def health_score(self):
+        """건강 점수 0.0~1.0 (성공률 × 지연 감점, open이면 0)"""
+        if self.state == OPEN:
+            return 0.0
+        latency_penalty = min(1.0, self.avg_latency() / self.slow_seconds) * 0.5
+        return round((1.0 - self.error_rate()) * (1.0 - latency_penalty), 3)
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'error_rate': round(self.error_rate(), 3),
+            'avg_latency': round(self.avg_latency(), 2),
+            'health': self.health_score(),
+        }
+
+
+_breakers = {}
+_settings = {}
+_registry_lock = threading.Lock()
+
+
+def configure_breakers(config=None):
+    """config.json의 circuit_breaker 설정 적용 (이후 생성되는 차단기에 사용)
+
+    설정 예시:
+        "circuit_breaker": {"failure_threshold": 3, "recovery_seconds": 120, "window": 20}
+    """
+    with _registry_lock:
+        _settings.update(config or {})
+
+
+def get_breaker(name):
+    """제공자 이름별 공용 차단기 반환 (프로세스 내 모든 생성기가 공유)"""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=_settings.get('failure_threshold', 3),
+                recovery_seconds=_settings.get('recovery_seconds', 120),
+                window=_settings.get('window', 20),
+                slow_seconds=_settings.get('slow_seconds', 30),
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def health_report():
+    """전체 제공자 상태 {이름: stats}"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,415 @@
+"""
+FFmpeg 네이티브 렌더링 모듈
+MoviePy의 프레임 단위 Python 합성 대신 ffmpeg 명령 한 번으로 최종 영상을 만듭니다.
+- FFmpegRenderer: 배경 스틸 / 자막 PNG를 overlay=x:y:enable='between(t,a,b)'로 합성
+- ChangePointRenderer: 화면이 바뀌는 시점마다 프레임을 한 번만 합성 → concat demuxer(VFR)로 인코딩
+- ChunkedRenderer: 배경 경계로 타임라인을 나눠 프로세스 풀에서 병렬 인코딩 → concat demuxer로 무손실 연결
+- TTS 음성: 마지막 입력으로 mux
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+import numpy as np
+from tracing import span
+
+
+def get_ffmpeg_binary():
+    """MoviePy와 같은 ffmpeg 실행 파일 경로 반환 (FFMPEG_BINARY → imageio-ffmpeg → PATH)"""
+    env_binary = os.environ.get('FFMPEG_BINARY', '')
+    if env_binary and env_binary != 'ffmpeg-imageio':
+        return env_binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which('ffmpeg') or 'ffmpeg'
+
+
+def save_layer_image(image, path):
+    """레이어 이미지(PIL / numpy 배열 / 파일 경로)를 ffmpeg 입력용 파일로 저장하고 경로 반환"""
+    if isinstance(image, str):
+        return image
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    image.save(path)
+    return path
+
+
+class FFmpegRenderer:
+    """배경/자막 레이어 목록을 ffmpeg filtergraph로 합성하는 렌더러
+
+    레이어 형식 (시간 단위: 초):
+        backgrounds: [{'image': PIL.Image | np.ndarray | 경로, 'start': float, 'end': float}, ...]
+        overlays:    [{'image': ..., 'start': float, 'end': float, 'position': (x, y)}, ...]
+    """
+
+    def __init__(self, width, height, fps, preset='medium', ffmpeg_binary=None, threads=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.preset = preset
+        self.ffmpeg_binary = ffmpeg_binary or get_ffmpeg_binary()
+        self.threads = threads  # None이면 x264 자동 (청크 병렬 시 코어 분배용)
+
+    def render(self, backgrounds, overlays, audio_path, duration, output_path, work_dir=None):
+        """레이어를 합성하여 output_path에 mp4 저장 (실패 시 RuntimeError)"""
+        own_work_dir = work_dir is None
+        if own_work_dir:
+            work_dir = tempfile.mkdtemp(prefix='ffmpeg_render_')
+        os.makedirs(work_dir, exist_ok=True)
+
+        try:
+            with span('render.layers', cat='render', layers=len(backgrounds) + len(overlays)):
+                cmd = self._build_command(backgrounds, overlays, audio_path, duration, output_path, work_dir)
+            print(f"   ⚙️  ffmpeg 렌더링: 배경 {len(backgrounds)}장 + 자막 {len(overlays)}개")
+            with span('render.encode', cat='render', backend='ffmpeg', seconds=round(duration, 1)):
+                self._run(cmd)
+            return output_path
+        finally:
+            if own_work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _build_command(self, backgrounds, overlays, audio_path, duration, output_path, work_dir):
+        """ffmpeg 명령 + filtergraph 스크립트 생성"""
+        # 입력 0: 전체 길이의 검정 베이스 (CompositeVideoClip 기본 배경과 동일)
+        inputs = [
+            '-f', 'lavfi',
+            '-i', f"color=c=black:s={self.width}x{self.height}:r={self.fps}:d={duration:.3f}",
+        ]
+        filters = []
+        current = '0:v'
+        input_index = 1
+
+        # 배경 스틸: 한 장당 입력 1개, 화면 크기로 맞춘 뒤 해당 구간에만 표시
+        for i, layer in enumerate(backgrounds):
+            path = save_layer_image(layer['image'], os.path.join(work_dir, f"bg_{i:03d}.png"))
+            inputs += ['-i', path]
+            scaled = f"bg{i}"
+            filters.append(f"[{input_index}:v]scale={self.width}:{self.height},setsar=1[{scaled}]")
+            filters.append(
+                f"[{current}][{scaled}]overlay=0:0:"
+                f"enable='between(t,{layer['start']:.3f},{layer['end']:.3f})'[vb{i}]"
+            )
+            current = f"vb{i}"
+            input_index += 1
+
+        # 자막 PNG: 알파 포함 정지 이미지 → 지정 위치/구간에 overlay
+        for i, layer in enumerate(overlays):
+            path = save_layer_image(layer['image'], os.path.join(work_dir, f"sub_{i:04d}.png"))
+            inputs += ['-i', path]
+            x, y = layer.get('position', (0, 0))
+            filters.append(
+                f"[{current}][{input_index}:v]overlay={int(x)}:{int(y)}:"
+                f"enable='between(t,{layer['start']:.3f},{layer['end']:.3f})'[vs{i}]"
+            )
+            current = f"vs{i}"
+            input_index += 1
+
+        filters.append(f"[{current}]format=yuv420p[vout]")
+
+        # 자막이 수백 개인 경우 명령행 길이 제한을 피하기 위해 스크립트 파일 사용
+        filter_path = os.path.join(work_dir, 'filtergraph.txt')
+        with open(filter_path, 'w', encoding='utf-8') as f:
+            f.write(';\n'.join(filters))
+
+        cmd = [self.ffmpeg_binary, '-hide_banner', '-loglevel', 'error', '-y'] + inputs
+        audio_args = []
+        if audio_path:
+            cmd += ['-i', audio_path]
+            audio_args = ['-map', f"{input_index}:a", '-c:a', 'aac']
+
+        cmd += ['-filter_complex_script', filter_path, '-map', '[vout]'] + audio_args
+        cmd += self.video_codec_args()
+        cmd += ['-t', f"{duration:.3f}", output_path]
+        return cmd
+
+    def video_codec_args(self):
+        """MoviePy write_videofile(codec='libx264', preset=...)과 동일한 인코딩 파라미터"""
+        args = [
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-pix_fmt', 'yuv420p',
+            '-r', str(self.fps),
+        ]
+        if self.threads:
+            args += ['-threads', str(self.threads)]
+        return args
+
+    def _run(self, cmd):
+        """ffmpeg 실행 (실패 시 stderr 마지막 부분을 담아 RuntimeError)"""
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            err = proc.stderr.decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg 종료 코드 {proc.returncode}: {err[-500:]}")
+
+
+class ChangePointRenderer(FFmpegRenderer):
+    """변화 시점(change point) 기반 렌더러
+
+    배경은 섹션/30초 경계에서만, 자막은 sentence_timings 경계에서만 바뀌므로
+    화면은 구간별로 일정합니다. 경계 시각으로 타임라인을 나누고 구간마다 프레임을
+    한 번만 합성한 뒤, concat demuxer의 duration으로 각 프레임을 유지시켜 인코딩합니다.
+    """
+
+    def render(self, backgrounds, overlays, audio_path, duration, output_path, work_dir=None):
+        """레이어를 합성하여 output_path에 mp4 저장 (실패 시 RuntimeError)"""
+        own_work_dir = work_dir is None
+        if own_work_dir:
+            work_dir = tempfile.mkdtemp(prefix='changepoint_render_')
+        os.makedirs(work_dir, exist_ok=True)
+
+        try:
+            with span('render.composite', cat='render', layers=len(backgrounds) + len(overlays)):
+                intervals = self._build_timeline(backgrounds, overlays, duration)
+                list_path, distinct = self._write_frames(intervals, backgrounds, overlays, work_dir)
+            print(f"   ⚙️  변화 시점 렌더링: 구간 {len(intervals)}개, 고유 프레임 {distinct}장 "
+                  f"(전체 {int(round(duration * self.fps))}프레임)")
+
+            cmd = [self.ffmpeg_binary, '-hide_banner', '-loglevel', 'error', '-y',
+                   '-f', 'concat', '-safe', '0', '-i', list_path]
+            audio_args = []
+            if audio_path:
+                cmd += ['-i', audio_path]
+                audio_args = ['-map', '1:a', '-c:a', 'aac']
+            # VFR 입력 → fps 필터로 고정 프레임레이트 변환 (정지 구간은 x264가 거의 비용 없이 처리)
+            cmd += ['-map', '0:v', '-vf', f"fps={self.fps},format=yuv420p"] + audio_args
+            cmd += self.video_codec_args()
+            cmd += ['-t', f"{duration:.3f}", output_path]
+            with span('render.encode', cat='render', backend='changepoint', seconds=round(duration, 1)):
+                self._run(cmd)
+            return output_path
+        finally:
+            if own_work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _build_timeline(self, backgrounds, overlays, duration):
+        """레이어 시작/끝 시각으로 타임라인 분할 → [(start, end, 활성 레이어 키)]
+
+        경계는 프레임 단위로 맞춰 구간 길이 합이 전체 프레임 수와 정확히 일치하도록 합니다.
+        """
+        total_frames = max(1, int(round(duration * self.fps)))
+        edges = {0, total_frames}
+        for layer in list(backgrounds) + list(overlays):
+            for t in (layer['start'], layer['end']):
+                frame = int(round(t * self.fps))
+                if 0 < frame < total_frames:
+                    edges.add(frame)
+        edges = sorted(edges)
+
+        intervals = []
+        for f0, f1 in zip(edges, edges[1:]):
+            mid = (f0 + f1) / 2 / self.fps
+            active_bg = tuple(i for i, layer in enumerate(backgrounds)
+                              if layer['start'] <= mid < layer['end'])
+            active_ov = tuple(i for i, layer in enumerate(overlays)
+                              if layer['start'] <= mid < layer['end'])
+            key = (active_bg, active_ov)
+            # 같은 화면이 이어지면 구간 병합
+            if intervals and intervals[-1][2] == key:
+                intervals[-1] = (intervals[-1][0], f1, key)
+            else:
+                intervals.append((f0, f1, key))
+        return [(f0 / self.fps, f1 / self.fps, key) for f0, f1, key in intervals]
+
+    def _write_frames(self, intervals, backgrounds, overlays, work_dir):
+        """구간별 고유 프레임을 한 번씩만 합성/저장하고 concat 목록 파일 작성"""
+        frame_files = {}
+        bg_cache = {}
+        lines = ['ffconcat version 1.0']
+
+        for start, end, key in intervals:
+            if key not in frame_files:
+                frame = self._compose_frame(key, backgrounds, overlays, bg_cache)
+                name = f"frame_{len(frame_files):05d}.png"
+                frame.save(os.path.join(work_dir, name), compress_level=1)
+                frame_files[key] = name
+            lines.append(f"file '{frame_files[key]}'")
+            lines.append(f"duration {end - start:.6f}")
+
+        # concat demuxer는 마지막 항목의 duration을 무시하므로 마지막 파일을 한 번 더 명시
+        if intervals:
+            lines.append(f"file '{frame_files[intervals[-1][2]]}'")
+
+        list_path = os.path.join(work_dir, 'frames.ffconcat')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return list_path, len(frame_files)
+
+    def _compose_frame(self, key, backgrounds, overlays, bg_cache):
+        """활성 레이어 키 → 합성된 RGB 프레임 (검정 바탕 위에 배경 → 자막 순서로 합성)"""
+        active_bg, active_ov = key
+        canvas = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 255))
+
+        for i in active_bg:
+            if i not in bg_cache:
+                bg = self._load_layer(backgrounds[i]['image']).convert('RGBA')
+                if bg.size != (self.width, self.height):
+                    bg = bg.resize((self.width, self.height), Image.LANCZOS)
+                bg_cache[i] = bg
+            canvas.alpha_composite(bg_cache[i])
+
+        for i in active_ov:
+            layer = overlays[i]
+            img = self._load_layer(layer['image']).convert('RGBA')
+            x, y = (int(v) for v in layer.get('position', (0, 0)))
+            # 화면 밖으로 나간 부분은 잘라서 합성 (음수 dest는 ValueError, MoviePy와 같은 클리핑)
+            left, top = max(0, -x), max(0, -y)
+            right = min(img.width, self.width - x)
+            bottom = min(img.height, self.height - y)
+            if right <= left or bottom <= top:
+                continue
+            canvas.alpha_composite(img, dest=(x + left, y + top), source=(left, top, right, bottom))
+
+        return canvas.convert('RGB')
+
+    @staticmethod
+    def _load_layer(image):
+        """레이어 이미지(PIL / numpy 배열 / 파일 경로) → PIL.Image"""
+        if isinstance(image, str):
+            return Image.open(image)
+        if isinstance(image, np.ndarray):
+            return Image.fromarray(image)
+        return image
+
+
+def _render_chunk(task):
+    """프로세스 풀 워커: 청크 하나를 무음 mp4로 인코딩"""
+    renderer = create_renderer(
+        task['backend'], task['width'], task['height'], task['fps'],
+        preset=task['preset'], threads=task['threads']
+    )
+    renderer.render(task['backgrounds'], task['overlays'], None,
+                    task['duration'], task['output_path'], work_dir=task['work_dir'])
+    return task['output_path']
+
+
+class ChunkedRenderer:
+    """청크 병렬 렌더러
+
+    배경 이미지 경계(롱폼은 30초 간격)에서 타임라인을 나누고, 청크마다 동일한 코덱 파라미터로
+    프로세스 풀에서 무음 영상을 인코딩합니다. 청크는 concat demuxer(-c copy)로 재인코딩 없이
+    연결하고, 음성은 마지막에 한 번만 mux합니다.
+    """
+
+    def __init__(self, backend, width, height, fps, preset='medium', workers=None):
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.preset = preset
+        self.workers = workers or os.cpu_count() or 1
+        self.ffmpeg_binary = get_ffmpeg_binary()
+
+    def render(self, backgrounds, overlays, audio_path, duration, output_path, work_dir=None):
+        """레이어를 청크 단위로 병렬 인코딩하여 output_path에 mp4 저장 (실패 시 RuntimeError)"""
+        own_work_dir = work_dir is None
+        if own_work_dir:
+            work_dir = tempfile.mkdtemp(prefix='chunked_render_')
+        os.makedirs(work_dir, exist_ok=True)
+
+        try:
+            # 워커로 넘길 레이어는 파일 경로로 통일 (numpy 배열 피클 전송 방지)
+            with span('render.layers', cat='render', layers=len(backgrounds) + len(overlays)):
+                backgrounds = [dict(layer, image=save_layer_image(layer['image'], os.path.join(work_dir, f"bg_{i:03d}.png")))
+                               for i, layer in enumerate(backgrounds)]
+                overlays = [dict(layer, image=save_layer_image(layer['image'], os.path.join(work_dir, f"sub_{i:04d}.png")))
+                            for i, layer in enumerate(overlays)]
+
+            chunks = self._chunk_edges(backgrounds, duration)
+            workers = min(self.workers, len(chunks))
+            # 실제 실행되는 워커 수로 코어를 나눔 (청크가 적으면 청크당 x264 스레드↑)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            tasks = self._build_tasks(chunks, backgrounds, overlays, threads, work_dir)
+            print(f"   ⚙️  청크 병렬 인코딩: {len(tasks)}개 청크, 워커 {workers}개 × 스레드 {threads}개 ({self.backend})")
+
+            # 청크 내부 합성/인코딩은 워커 프로세스에서 실행되므로 전체를 span 하나로 기록
+            # spawn: 다른 스레드(선요청 풀, 추적 샘플러 등)가 잡고 있던 lock을 fork로 복제해 워커가 멈추는 문제 방지
+            with span('render.chunks', cat='render', backend=self.backend, chunks=len(tasks), workers=workers), \
+                    ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                chunk_paths = list(pool.map(_render_chunk, tasks))
+
+            with span('render.concat', cat='render', chunks=len(chunk_paths)):
+                self._concat(chunk_paths, audio_path, duration, output_path, work_dir)
+            return output_path
+        finally:
+            if own_work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _chunk_edges(self, backgrounds, duration):
+        """청크 경계 (배경 시작 시각, 프레임 단위로 정렬) → [(start, end)]"""
+        total_frames = max(1, int(round(duration * self.fps)))
+        edges = {0, total_frames}
+        for layer in backgrounds:
+            frame = int(round(layer['start'] * self.fps))
+            if 0 < frame < total_frames:
+                edges.add(frame)
+        edges = sorted(edges)
+        return [(f0 / self.fps, f1 / self.fps) for f0, f1 in zip(edges, edges[1:])]
+
+    def _build_tasks(self, chunks, backgrounds, overlays, threads, work_dir):
+        """청크별 레이어를 잘라 청크 시작 기준 상대 시간으로 변환"""
+        tasks = []
+
+        for index, (chunk_start, chunk_end) in enumerate(chunks):
+            def clip_layers(layers):
+                clipped = []
+                for layer in layers:
+                    start = max(layer['start'], chunk_start)
+                    end = min(layer['end'], chunk_end)
+                    if end > start:
+                        clipped.append(dict(layer, start=start - chunk_start, end=end - chunk_start))
+                return clipped
+
+            tasks.append({
+                'backend': self.backend,
+                'width': self.width,
+                'height': self.height,
+                'fps': self.fps,
+                'preset': self.preset,
+                'threads': threads,
+                'backgrounds': clip_layers(backgrounds),
+                'overlays': clip_layers(overlays),
+                'duration': chunk_end - chunk_start,
+                'output_path': os.path.join(work_dir, f"chunk_{index:03d}.mp4"),
+                'work_dir': os.path.join(work_dir, f"chunk_{index:03d}"),
+            })
+        return tasks
+
+    def _concat(self, chunk_paths, audio_path, duration, output_path, work_dir):
+        """청크를 concat demuxer로 무손실 연결 + 음성 mux"""
+        list_path = os.path.join(work_dir, 'chunks.ffconcat')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('ffconcat version 1.0\n')
+            for path in chunk_paths:
+                f.write(f"file '{os.path.basename(path)}'\n")
+
+        cmd = [self.ffmpeg_binary, '-hide_banner', '-loglevel', 'error', '-y',
+               '-f', 'concat', '-safe', '0', '-i', list_path]
+        audio_args = []
+        if audio_path:
+            cmd += ['-i', audio_path]
+            audio_args = ['-map', '1:a', '-c:a', 'aac']
+        cmd += ['-map', '0:v', '-c:v', 'copy'] + audio_args
+        cmd += ['-t', f"{duration:.3f}", output_path]
+
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            err = proc.stderr.decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg concat 종료 코드 {proc.returncode}: {err[-500:]}")
+
+
+def create_renderer(backend, width, height, fps, preset='medium', threads=None, parallel_workers=0):
+    """config의 render_backend 값에 맞는 렌더러 생성 ("ffmpeg" | "changepoint")
+
+    parallel_workers > 1이면 해당 백엔드를 청크 병렬 인코딩(ChunkedRenderer)으로 감쌉니다.
+    """
+    if parallel_workers and parallel_workers > 1:
+        return ChunkedRenderer(backend, width, height, fps, preset=preset, workers=parallel_workers)
+    if backend == 'changepoint':
+        return ChangePointRenderer(width, height, fps, preset=preset, threads=threads)
+    return FFmpegRenderer(width, height, fps, preset=preset, threads=threads)
@@ -0,0 +1,141 @@
+"""
+폰트 레지스트리 모듈
+한글 폰트 경로 탐색과 FreeTypeFont 로드를 프로세스당 한 번만 수행하고,
+단어 폭(advance) 캐시로 줄바꿈 시 문장 전체를 반복 측정하지 않도록 합니다.
+"""
+
+import os
+import threading
+from PIL import ImageFont
+
+
+# 한글 지원 폰트 우선, 마지막 두 개는 한글이 없는 최후 폴백
+FONT_CANDIDATES = [
+    # macOS
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Arial Unicode.ttf",
+    "/Library/Fonts/NotoSansCJK.ttc",
+    # Linux (GitHub Actions)
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    # Windows
+    "/Windows/Fonts/malgun.ttf",
+    # 한글 미지원 폴백
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+]
+
+# 단어 폭 캐시 최대 항목 수 (초과 시 비움)
+MAX_WIDTH_ENTRIES = 50000
+
+_lock = threading.Lock()
+_UNRESOLVED = object()
+_font_path = _UNRESOLVED
+_fonts = {}          # (path, size) -> FreeTypeFont
+_widths = {}         # (id(font), text) -> advance 폭(px)
+
+
+def find_korean_font():
+    """한글 폰트 경로 반환 (프로세스당 한 번만 탐색, 없으면 None)"""
+    global _font_path
+    with _lock:
+        if _font_path is _UNRESOLVED:
+            _font_path = next((p for p in FONT_CANDIDATES if os.path.exists(p)), None)
+            if _font_path:
+                print(f"✅ 한글 폰트 발견: {_font_path}")
+            else:
+                print("⚠️ 한글 폰트를 찾지 못했습니다. 기본 폰트 사용")
+        return _font_path
+
+
+def get_font(size, font_path=None):
+    """크기별 폰트 반환 (같은 경로/크기는 캐시된 객체 재사용, 로드 실패 시 기본 폰트)"""
+    font_path = font_path or find_korean_font()
+    key = (font_path, size)
+    with _lock:
+        font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    font = None
+    if font_path:
+        try:
+            font = ImageFont.truetype(font_path, size)
+        except Exception as e:
+            print(f"⚠️ 폰트 로드 실패 ({font_path}, {size}px): {e}")
+    if font is None:
+        font = ImageFont.load_default()
+
+    with _lock:
+        return _fonts.setdefault(key, font)
+
+
+def text_width(font, text):
+    """텍스트 advance 폭 (캐시, 레지스트리에서 받은 폰트 객체 기준)"""
+    key = (id(font), text)
+    width = _widths.get(key)
+    if width is None:
+        width = font.getlength(text)
+        with _lock:
+            if len(_widths) >= MAX_WIDTH_ENTRIES:
+                _widths.clear()
+            _widths[key] = width
+    return width
+
+
+def wrap_words(text, font, max_width):
+    """단어 단위 줄바꿈 → 줄 목록
+
+    줄 폭을 단어 폭 + 공백 폭으로 누적 계산하므로 단어마다 줄 전체를 다시 측정하지 않습니다.
+    한 단어가 max_width보다 길면 그 단어만 한 줄로 둡니다.
+    """
+    space_width = text_width(font, ' ')
+    lines = []
+    current_line = ""
+    current_width = 0
+
+    for word in text.split(' '):
+        word_width = text_width(font, word)
+        test_width = current_width + space_width + word_width if current_line else word_width
+        if test_width <= max_width:
+            current_line = current_line + (' ' if current_line else '') + word
+            current_width = test_width
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+            current_width = word_width
+
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def wrap_chars(text, font, max_width):
+    """글자 단위 줄바꿈 → 줄 목록 (글자 폭 누적)"""
+    lines = []
+    current_line = ""
+    current_width = 0
+
+    for char in text:
+        char_width = text_width(font, char)
+        if current_width + char_width <= max_width:
+            current_line += char
+            current_width += char_width
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = char
+            current_width = char_width
+
+    if current_line:
+        lines.append(current_line)
+    return lines
@@ -0,0 +1,68 @@
+"""
+공용 HTTP 클라이언트 모듈
+HuggingFace / Together / Pexels 요청마다 새 TCP+TLS 연결을 맺지 않도록
+호스트별 커넥션 풀과 keep-alive를 가진 requests.Session 하나를 프로세스 전체에서 공유합니다.
+API 호스트 요청은 rate_limit의 API별 동시성/속도 제한을 거칩니다.
+"""
+
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limit import get_limiter
+from tracing import span
+
+
+# 요청 호스트 → 제한기 이름 (이미지 다운로드 등 그 외 호스트는 제한 없음)
+HOST_LIMITERS = {
+    'router.huggingface.co': 'huggingface',
+    'api-inference.huggingface.co': 'huggingface',
+    'api.together.xyz': 'together',
+    'api.pexels.com': 'pexels',
+}
+
+
+class LimitedSession(requests.Session):
+    """API 호스트별 동시 요청 수/분당 요청 수 제한을 적용하는 세션"""
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).hostname or ''
+        name = HOST_LIMITERS.get(host)
+        if name is None:
+            with span(f"http.{host}", cat='http', method=method):
+                return super().request(method, url, *args, **kwargs)
+        with get_limiter(name), span(f"http.{name}", cat='http', method=method):
+            return super().request(method, url, *args, **kwargs)
+
+
+def create_session(config=None):
+    """커넥션 풀 세션 생성 (config: config.json의 http)
+
+    설정 예시:
+        "http": {"pool_connections": 10, "pool_maxsize": 16}
+    pool_connections: 풀을 유지할 호스트 수, pool_maxsize: 호스트당 동시 연결 수
+    (동시 이미지 요청 수 이상으로 설정해야 연결이 버려지지 않습니다)
+    """
+    config = config or {}
+    adapter = HTTPAdapter(
+        pool_connections=config.get('pool_connections', 10),
+        pool_maxsize=config.get('pool_maxsize', 16),
+        max_retries=0,  # 재시도는 호출 측 루프와 회로 차단기가 담당
+    )
+    session = LimitedSession()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_http_session(config=None):
+    """프로세스 공용 세션 반환 (처음 호출 시 config로 생성)"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session(config)
+        return _shared_session
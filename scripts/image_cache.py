@@ -0,0 +1,167 @@
+"""
+이미지 캐시 모듈
+AI 생성/다운로드 이미지 원본 바이트를 (제공자, 모델, 프롬프트, 가로, 세로) 해시로 저장해
+같은 요청은 네트워크 없이 재사용합니다.
+- 저장: cache/images/{sha256}.bin + index.json (크기, 마지막 사용 시각)
+- 용량 상한(max_mb)을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 적중 시 마지막 사용 시각은 메모리에서만 갱신하고, 인덱스는 저장(put)/정리 때나 종료 시(flush) 기록
+"""
+
+import io
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from PIL import Image
+
+
+class ImageCache:
+    """내용 주소 기반 이미지 바이트 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_dir="cache/images", max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False  # 디스크에 기록되지 않은 인덱스 변경(마지막 사용 시각 등) 여부
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    @staticmethod
+    def make_key(provider, model, prompt, width=0, height=0):
+        """(제공자, 모델, 프롬프트, 가로, 세로) → sha256 키"""
+        raw = json.dumps([provider, model, prompt, int(width or 0), int(height or 0)], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """캐시된 바이트 반환 (없으면 None, 파일 읽기는 lock 밖에서 수행)"""
+        with self._lock:
+            if key not in self._index:
+                return None
+        try:
+            with open(self._blob_path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = None
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if data is None:
+                # 파일이 지워졌으면 인덱스에서도 제거
+                del self._index[key]
+            else:
+                entry['last_access'] = time.time()
+            self._dirty = True
+            return data
+
+    def flush(self):
+        """기록되지 않은 인덱스 변경 저장 (종료 시 자동 호출)"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def get_image(self, key):
+        """캐시된 이미지를 PIL Image로 반환 (없거나 디코딩 실패 시 None)"""
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            img = Image.open(io.BytesIO(data))
+            img.load()
+            return img
+        except Exception:
+            return None
+
+    def put(self, key, data, provider=""):
+        """바이트 저장 후 용량 상한 초과분 정리 (실패는 경고만)"""
+        if not data:
+            return
+        with self._lock:
+            path = self._blob_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"   ⚠️ 이미지 캐시 저장 실패: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            now = time.time()
+            self._index[key] = {
+                'size': len(data),
+                'provider': provider,
+                'created': now,
+                'last_access': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def _blob_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _evict(self):
+        """총 용량이 상한을 넘으면 마지막 사용 시각이 오래된 것부터 삭제 (lock 보유 상태에서 호출)"""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._blob_path(key))
+            except OSError:
+                pass
+            total -= entry['size']
+            del self._index[key]
+
+    def _load_index(self):
+        """index.json 로드 (없거나 손상되면 빈 인덱스)"""
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            print("   ⚠️ 이미지 캐시 인덱스 손상 → 새로 시작")
+            return {}
+
+    def _save_index(self):
+        """index.json 원자적 저장 (lock 보유 상태에서 호출)"""
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"   ⚠️ 이미지 캐시 인덱스 저장 실패: {e}")
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_image_cache(config=None):
+    """프로세스 공용 이미지 캐시 반환 (config: config.json의 cache.images)
+
+    설정 예시:
+        "cache": {"images": {"enabled": true, "dir": "cache/images", "max_mb": 2048}}
+    enabled가 false면 None을 반환합니다.
+    """
+    global _shared_cache
+    config = config or {}
+    if not config.get('enabled', True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ImageCache(
+                cache_dir=config.get('dir', 'cache/images'),
+                max_bytes=int(config.get('max_mb', 2048)) * 1024 * 1024,
+            )
+            atexit.register(_shared_cache.flush)
+        return _shared_cache
@@ -0,0 +1,144 @@
+"""
+작업 매니페스트 모듈
+작업 공간(work/{job_id}/manifest.json)에 완료된 단계의 산출물과 파일 내용 해시(sha256)를 기록해
+실패하거나 중단된 작업을 --resume JOB_ID로 이어서 실행할 수 있게 합니다.
+- 단계 완료 시: 산출물(JSON) + 산출물이 가리키는 파일들의 sha256 저장
+- 재개 시: 파일이 모두 있고 해시가 같은 단계는 다시 실행하지 않고 기록된 산출물 사용
+- 파일을 output/으로 옮기면(promote) relocate로 기록된 경로도 함께 갱신
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """파일 내용 sha256 (없거나 읽기 실패 시 None)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class JobManifest:
+    """작업 하나의 단계 완료 기록 (스레드 안전, 변경할 때마다 원자적 저장)"""
+
+    def __init__(self, workspace_dir):
+        self.path = os.path.join(workspace_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    @property
+    def job(self):
+        """작업 파라미터 (type, topic, upload, publish_at 등)"""
+        return dict(self._data['job'])
+
+    @property
+    def done(self):
+        """작업 전체(업로드 포함)가 끝났는지 여부"""
+        return self._data.get('done', False)
+
+    def set_job(self, **params):
+        """작업 파라미터 기록 (재개 시 같은 설정으로 다시 실행)"""
+        with self._lock:
+            self._data['job'].update(params)
+            self._save()
+
+    def record(self, stage, value, files=()):
+        """단계 완료 기록 (value는 JSON 직렬화 가능해야 함, 실패는 경고만)"""
+        hashes = {}
+        for path in files:
+            if not path:
+                continue
+            digest = file_sha256(path)
+            if digest is None:
+                print(f"   ⚠️ [{stage}] 산출물 파일 없음 → 매니페스트 기록 생략: {path}")
+                return
+            hashes[path] = digest
+        try:
+            json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            print(f"   ⚠️ [{stage}] 산출물 직렬화 불가 → 매니페스트 기록 생략: {e}")
+            return
+        with self._lock:
+            self._data['stages'][stage] = {
+                'value': value,
+                'files': hashes,
+                'finished': time.time(),
+            }
+            self._save()
+
+    def lookup(self, stage):
+        """기록된 단계 산출물 반환 (기록이 없거나 파일이 바뀌었으면 None)"""
+        with self._lock:
+            entry = self._data['stages'].get(stage)
+        if entry is None:
+            return None
+        for path, digest in entry['files'].items():
+            if file_sha256(path) != digest:
+                print(f"   ⚠️ [{stage}] 산출물 변경/누락 → 다시 실행: {path}")
+                with self._lock:
+                    self._data['stages'].pop(stage, None)
+                    self._save()
+                return None
+        return entry['value']
+
+    def relocate(self, src, dst):
+        """파일 이동을 기록에 반영 (해시 목록과 산출물 안의 같은 경로 문자열을 모두 교체)"""
+        if not src or src == dst:
+            return
+        with self._lock:
+            for entry in self._data['stages'].values():
+                if src in entry['files']:
+                    entry['files'][dst] = entry['files'].pop(src)
+                    entry['value'] = self._replace_path(entry['value'], src, dst)
+            self._save()
+
+    def mark_done(self):
+        """작업 완료 표시 (이후 --resume 대상이 아님)"""
+        with self._lock:
+            self._data['done'] = True
+            self._save()
+
+    @classmethod
+    def _replace_path(cls, value, src, dst):
+        if value == src:
+            return dst
+        if isinstance(value, dict):
+            return {k: cls._replace_path(v, src, dst) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._replace_path(v, src, dst) for v in value]
+        return value
+
+    def _load(self):
+        """manifest.json 로드 (없거나 손상되면 빈 기록)"""
+        empty = {'job': {}, 'stages': {}, 'done': False}
+        if not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            print(f"   ⚠️ 작업 매니페스트 손상 → 처음부터 실행: {self.path}")
+            return empty
+        for key, default in empty.items():
+            data.setdefault(key, default)
+        return data
+
+    def _save(self):
+        """manifest.json 원자적 저장 (lock 보유 상태에서 호출)"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"   ⚠️ 작업 매니페스트 저장 실패: {e}")
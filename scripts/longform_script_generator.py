@@ -9,8 +9,10 @@ import sys
 import re
 import time
 from datetime import datetime
+from rate_limit import get_limiter
+from tracing import span
 from topic_manager import (
-    pick_unique_topic, record_topic, filter_trending_topics, is_topic_blocked
+    pick_unique_topic, pick_trending_topic, release_topic, record_topic, is_topic_blocked
 )
 
 try:
@@ -54,7 +56,8 @@ class LongformScriptGenerator:
 다음 JSON 형식으로만 답변하세요:
 {"topics":["주제1","주제2","주제3"]}"""
 
-            response = self.model.generate_content(prompt)
+            with get_limiter('gemini'), span('gemini.generate_content', cat='api'):
+                response = self.model.generate_content(prompt)
             content = response.text.strip()
 
             json_match = re.search(r'\{[^{}]*"topics"[^{}]*\}', content)
@@ -76,14 +79,15 @@ class LongformScriptGenerator:
 
     def generate_script(self, topic=None):
         """롱폼 스크립트 생성"""
+        reserved = not topic
         if not topic:
             use_trending = random.random() < 0.5
             if use_trending:
                 trending = self.get_trending_topic()
                 if trending:
-                    filtered = filter_trending_topics(trending, 'longform')
-                    if filtered:
-                        topic = random.choice(filtered)
+                    # 필터링·선택·예약을 한 번에 (동시 작업끼리 같은 트렌딩 주제 방지)
+                    topic = pick_trending_topic(trending, 'longform')
+                    if topic:
                         print(f"✅ 트렌디한 주제 선택: {topic}")
                     else:
                         topic = pick_unique_topic(self.topics, 'longform')
@@ -94,7 +98,14 @@ class LongformScriptGenerator:
             else:
                 topic = pick_unique_topic(self.topics, 'longform')
                 print(f"📌 고정 주제 선택: {topic}")
-        
+
+        script_data = self._generate_for_topic(topic)
+        if script_data is None and reserved:
+            release_topic(topic)  # 기록 전에 실패한 주제는 예약 해제
+        return script_data
+
+    def _generate_for_topic(self, topic):
+        """정해진 주제로 롱폼 스크립트 생성 (성공 시 이력 기록, 실패 시 None)"""
         print(f"\n📚 롱폼 스크립트 생성 중: {topic}")
         
         # 프롬프트 작성
@@ -109,7 +120,8 @@ class LongformScriptGenerator:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = self.model.generate_content(prompt)
+                    with get_limiter('gemini'), span('gemini.generate_content', cat='api'):
+                        response = self.model.generate_content(prompt)
                     script_text = response.text
                     break
                 except Exception as e:
@@ -323,7 +335,8 @@ YouTube 롱폼 비디오(10-15분, 약 2000-2500단어)를 위한 깊이 있는
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
+                with get_limiter('gemini'), span('gemini.generate_content', cat='api'):
+                    response = self.model.generate_content(prompt)
                 return self._parse_metadata(response.text, script_data)
             except Exception as e:
                 err_msg = str(e)
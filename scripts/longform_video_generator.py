@@ -9,10 +9,23 @@
 import json
 import os
 import random
-import requests
 import time
-from PIL import Image, ImageDraw, ImageFont
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw
 import numpy as np
+from ffmpeg_renderer import create_renderer
+from subtitle_cache import get_subtitle_cache
+from font_registry import find_korean_font, get_font, wrap_words
+from text_effects import draw_outlined_text, draw_text_layers, square_offsets
+from image_cache import ImageCache, get_image_cache
+from circuit_breaker import configure_breakers, get_breaker
+from http_client import get_http_session
+from asset_prefetch import AssetPrefetcher
+from rate_limit import get_limiter
+from tracing import span
+from workspace import unique_path
+from audio_utils import probe_mp3_duration
 
 try:
     from moviepy import (
@@ -43,7 +56,7 @@ class LongformVideoGenerator:
         "desert sand dunes",
     ]
 
-    def __init__(self, config_path="config/config.json"):
+    def __init__(self, config_path="config/config.json", http_session=None):
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
 
@@ -57,6 +70,14 @@ class LongformVideoGenerator:
         self.text_color = cfg.get('text_color', '#ffffff')
         self.accent_color = cfg.get('accent_color', '#00d4ff')
         self.font_size = cfg.get('text_font_size', 48)
+        # 렌더 백엔드: "moviepy" | "ffmpeg" (filtergraph) | "changepoint" (화면이 바뀔 때만 합성)
+        self.render_backend = cfg.get('render_backend', 'moviepy')
+        # 청크 병렬 인코딩 (ffmpeg 기반 백엔드 전용, chunk_workers 0이면 CPU 코어 수)
+        self.parallel_chunks = cfg.get('parallel_chunks', False)
+        self.chunk_workers = cfg.get('chunk_workers', 0) or os.cpu_count() or 1
+
+        # 공용 HTTP 세션 (호스트별 커넥션 풀 + keep-alive)
+        self.http = http_session or get_http_session(self.config.get('http'))
 
         # Pexels API 키
         self.pexels_api_key = self.config.get('pexels_api_key', '')
@@ -68,77 +89,93 @@ class LongformVideoGenerator:
         # Together AI API (2순위 폴백)
         self.together_api_key = self.config.get('together_api_key', '')
 
+        # 제공자별 회로 차단기 (장애 시 타임아웃 대기 없이 다음 단계로)
+        configure_breakers(self.config.get('circuit_breaker'))
+
+        # 이미지 캐시 (AI 생성 결과 / Pexels 검색·사진 재사용)
+        self.image_cache = get_image_cache(self.config.get('cache', {}).get('images'))
+
+        # 배경 이미지 동시 요청 수 (전체 워커 수, 제공자별 상한은 공용 세션의 rate_limits 제한기가 적용)
+        self.image_concurrency = max(1, cfg.get('image_concurrency', 4))
+
         # 한글 폰트 찾기
-        self.font_path = self._find_korean_font()
+        self.font_path = find_korean_font()
+
+        # 자막 래스터 캐시 (같은 텍스트/스타일 자막은 한 번만 그림)
+        self.subtitle_cache = get_subtitle_cache(self.config.get('cache', {}).get('subtitles'))
+
+        # 작업(스레드)별 상태: 동시 작업이 같은 생성기를 공유해도 썸네일 경로가 섞이지 않음
+        self._local = threading.local()
 
         # 출력 디렉토리 생성
         os.makedirs("output/longform_images", exist_ok=True)
         os.makedirs("output/longform_videos", exist_ok=True)
 
-    def _find_korean_font(self):
-        """한글 폰트 찾기"""
-        possible_paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Arial Unicode.ttf",
-            "/Library/Fonts/NotoSansCJK.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-            "/usr/share/fonts/nanum/NanumGothic.ttf",
-            "/Windows/Fonts/malgun.ttf",
-        ]
-
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-
-        return None
-
     def create_video(self, script_data, audio_path, video_output_path,
-                     sentence_timings=None, use_ai_background=True):
-        """롱폼 비디오 생성 메인 메서드 (thumbnail_path 함께 반환)"""
+                     sentence_timings=None, use_ai_background=True, prefetcher=None, workspace=None):
+        """롱폼 비디오 생성 메인 메서드 (thumbnail_path 함께 반환)
+
+        prefetcher: TTS 중 선작업한 AssetPrefetcher (create_prefetcher 참고)
+        workspace: 작업별 JobWorkspace (배경 이미지/썸네일/렌더링 임시 파일 위치)
+        """
         print("\n🎬 롱폼 비디오 생성 시작")
-        self._thumbnail_path = None  # 썸네일 경로 저장용
+        self._local.thumbnail_path = None  # 썸네일 경로 저장용
 
         audio_clip = None
         final_video = None
         try:
             # 1. 오디오 로드
             print("📊 오디오 분석 중...")
-            audio_clip = AudioFileClip(audio_path)
-            total_duration = audio_clip.duration
+            # MP3 헤더로 길이 계산 (실패 시에만 AudioFileClip 로드)
+            total_duration = probe_mp3_duration(audio_path)
+            if total_duration is None:
+                audio_clip = AudioFileClip(audio_path)
+                total_duration = audio_clip.duration
             print(f"✓ 오디오 길이: {total_duration:.1f}초 ({total_duration/60:.1f}분)")
 
             if total_duration < 600:
                 print(f"⚠️ 경고: 목표(10-15분)보다 짧음 ({total_duration/60:.1f}분)")
 
-            # 2. 비디오 클립 생성 (AI 배경 + PIL 자막)
+            # 2. 배경/자막 배치 (AI 배경 + PIL 자막)
             print("🎬 비디오 클립 생성 중...")
-            video_clips = self._create_video_clips_with_subtitles(
+            bg_layers, text_layers = self._build_scene_layers(
                 script_data.get('title', ''),
                 total_duration,
-                sentence_timings
+                sentence_timings,
+                prefetcher=prefetcher,
+                workspace=workspace
             )
 
-            # 3. 최종 비디오 합성
-            print("🔗 비디오 합성 중...")
-            final_video = concatenate_videoclips(video_clips)
-            final_video = final_video.with_audio(audio_clip)
-
-            # 4. 저장
             print(f"💾 비디오 저장 중: {video_output_path}")
             os.makedirs(os.path.dirname(video_output_path), exist_ok=True)
 
-            final_video.write_videofile(
-                video_output_path,
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile='temp-audio-longform.m4a',
-                remove_temp=True,
-                preset='medium'
-            )
+            # 3. ffmpeg 백엔드: MoviePy 프레임 합성 없이 렌더링 (실패 시 MoviePy로 폴백)
+            rendered = False
+            if self.render_backend in ('ffmpeg', 'changepoint'):
+                rendered = self._render_with_ffmpeg(
+                    bg_layers, text_layers, audio_path, total_duration, video_output_path,
+                    work_dir=workspace.path("render") if workspace else None
+                )
+
+            if not rendered:
+                # 4. 최종 비디오 합성 + 저장
+                print("🔗 비디오 합성 중...")
+                if audio_clip is None:
+                    audio_clip = AudioFileClip(audio_path)
+                video_clips = self._compose_clips(bg_layers, text_layers, total_duration)
+                final_video = concatenate_videoclips(video_clips)
+                final_video = final_video.with_audio(audio_clip)
+
+                with get_limiter('render'), span('render.moviepy', cat='render'):
+                    final_video.write_videofile(
+                        video_output_path,
+                        fps=self.fps,
+                        codec='libx264',
+                        audio_codec='aac',
+                        temp_audiofile=self._temp_audio_path(video_output_path, workspace),
+                        remove_temp=True,
+                        preset='medium'
+                    )
 
             print(f"✅ 비디오 생성 완료: {video_output_path}")
 
@@ -162,12 +199,76 @@ class LongformVideoGenerator:
                 except Exception:
                     pass
 
+    def create_prefetcher(self, workers=None, workspace=None):
+        """TTS 스트리밍 타이밍으로 자막 예열 + 30초 장면 배경 선요청을 하는 AssetPrefetcher 생성"""
+        image_dir = workspace.path("images") if workspace else None
+        return AssetPrefetcher(
+            subtitle_fn=self._prewarm_subtitle if self.subtitle_cache else None,
+            scene_prompt_fn=lambda i, scene_text, used_prompts: self._build_illustration_prompt(
+                scene_text, used_prompts=used_prompts),
+            scene_fetch_fn=lambda i, prompt: self._acquire_background_image(i, prompt, image_dir),
+            scene_seconds=30,
+            workers=workers or self.image_concurrency,
+        )
+
+    def _prewarm_subtitle(self, timing, index):
+        """스트리밍 타이밍 1건의 자막 이미지를 미리 그려 캐시에 저장
+
+        색상은 _build_scene_layers와 같은 규칙 (마지막 2문장은 전체 개수를 몰라 흰색으로 예열,
+        실제 빨간 자막은 비디오 단계에서 그림)
+        """
+        text = timing['text'].strip()
+        if not text:
+            return
+        RED = (255, 0, 0, 255)
+        WHITE = (255, 255, 255, 255)
+        tc = RED if index < 2 else WHITE
+        for chunk in self._split_text_to_subtitle_chunks(text):
+            self._create_subtitle_image(chunk, text_color=tc, is_bold=index == 0)
+
+    def _image_output_path(self, prefix, index, image_dir=None):
+        """배경 이미지 저장 경로 (동시 작업끼리 겹치지 않는 고유 이름)"""
+        return unique_path(image_dir or "output/longform_images", f"{prefix}_{index}", ".jpg")
+
     def get_thumbnail_path(self):
-        """마지막 create_video 호출 시 생성된 썸네일 경로 반환"""
-        return self._thumbnail_path
+        """현재 스레드의 마지막 create_video 호출 시 생성된 썸네일 경로 반환"""
+        return getattr(self._local, 'thumbnail_path', None)
+
+    def _temp_audio_path(self, output_path, workspace=None):
+        """MoviePy 임시 오디오 경로 (작업별로 분리해 동시 렌더링 충돌 방지)"""
+        if workspace:
+            return workspace.path("temp-audio-longform.m4a")
+        return f"{os.path.splitext(output_path)[0]}_temp-audio.m4a"
+
+    def _render_with_ffmpeg(self, bg_layers, text_layers, audio_path, total_duration, output_path, work_dir=None):
+        """ffmpeg 기반 백엔드(filtergraph / 변화 시점)로 렌더링 (성공 여부 반환)
+
+        work_dir: 레이어 PNG/프레임 임시 디렉토리 (None이면 렌더러가 임시 디렉토리 생성)
+        """
+        try:
+            parallel_workers = self.chunk_workers if self.parallel_chunks else 0
+            renderer = create_renderer(self.render_backend, self.width, self.height, self.fps,
+                                       preset='medium', parallel_workers=parallel_workers)
+            with get_limiter('render'):  # 동시 작업 시 CPU 인코딩 수 제한
+                renderer.render(bg_layers, text_layers, audio_path, total_duration, output_path,
+                                work_dir=work_dir)
+            return True
+        except Exception as e:
+            print(f"⚠️ ffmpeg 렌더링 실패: {str(e)[:200]} → MoviePy 폴백")
+            return False
 
     def _create_video_clips_with_subtitles(self, title, total_duration, sentence_timings):
         """Pexels 배경 이미지 + 음성 싱크 자막으로 비디오 클립 생성"""
+        bg_layers, text_layers = self._build_scene_layers(title, total_duration, sentence_timings)
+        return self._compose_clips(bg_layers, text_layers, total_duration)
+
+    def _build_scene_layers(self, title, total_duration, sentence_timings, prefetcher=None, workspace=None):
+        """배경 이미지 + 음성 싱크 자막 배치 계산 (렌더 백엔드 공통)
+
+        Returns: (배경 레이어, 자막 레이어)
+            배경: [{'image': 경로, 'start', 'end'}]
+            자막: [{'image': RGBA 배열, 'start', 'end', 'position': (x, y)}]
+        """
 
         # ── 1. 배경 이미지 생성 (30초마다 교체) ──
         num_images = max(1, int(total_duration / 30) + 1)
@@ -176,50 +277,29 @@ class LongformVideoGenerator:
         # 자막 텍스트에서 AI 프롬프트 생성용 키워드 추출
         scene_texts = self._extract_scene_keywords(sentence_timings, total_duration, num_images)
 
-        bg_images = []
+        # AI 프롬프트는 중복 방지 상태를 공유하므로 먼저 순서대로 생성 (HF, Together AI 공통 사용)
+        prompts = []
         used_prompts = set()  # 중복 프롬프트 방지
         for i in range(num_images):
-            img_path = None
-
-            # AI 프롬프트 생성 (HF, Together AI 공통 사용)
-            prompt = self._build_illustration_prompt(
+            prompts.append(self._build_illustration_prompt(
                 scene_texts[i] if i < len(scene_texts) else "",
                 used_prompts=used_prompts
-            )
-
-            # 1순위: HuggingFace AI 일러스트
-            if self.hf_token:
-                img_path = self._generate_ai_illustration(prompt, i + 1)
+            ))
 
-            # 2순위: Together AI 폴백
-            if not img_path and self.together_api_key:
-                print(f"  [{i+1}] Together AI 폴백...")
-                img_path = self._generate_ai_image_together(prompt, i + 1)
+        image_dir = workspace.path("images") if workspace else None
+        bg_images = self._fetch_background_images(prompts, prefetcher=prefetcher, image_dir=image_dir)
 
-            # 3순위: Pexels 사진
-            if not img_path:
-                keyword = self.IMAGE_KEYWORDS[i % len(self.IMAGE_KEYWORDS)]
-                img_path = self._download_pexel_image(keyword, i + 1)
-
-            # 4순위: 그라디언트 배경
-            if not img_path:
-                img_path = self._create_gradient_background(i)
-
-            bg_images.append(img_path)
-
-        # ── 2. 배경 이미지 → ImageClip (30초마다 교체) ──
-        bg_clips = []
+        # ── 2. 배경 이미지 배치 (30초마다 교체) ──
+        bg_layers = []
         for i, bg_path in enumerate(bg_images):
             start_time = i * 30
             end_time = min((i + 1) * 30, total_duration)
-            dur = end_time - start_time
 
-            if dur > 0:
-                bg_clip = ImageClip(bg_path).with_duration(dur).with_start(start_time)
-                bg_clips.append(bg_clip)
+            if end_time - start_time > 0:
+                bg_layers.append({'image': bg_path, 'start': start_time, 'end': end_time})
 
         # ── 3. 자막 생성 (PIL 기반, 색상/볼드 지원) ──
-        text_clips = []
+        text_layers = []
         hook_text = None  # 썸네일용 후킹 문장 저장
         first_bg_path = bg_images[0] if bg_images else None
         if sentence_timings:
@@ -284,11 +364,12 @@ class LongformVideoGenerator:
                             chunk, text_color=tc, is_bold=bold
                         )
 
-                        clip = ImageClip(subtitle_img)
-                        clip = clip.with_duration(chunk_dur)
-                        clip = clip.with_start(chunk_start)
-                        clip = clip.with_position(('center', self.height - 300))
-                        text_clips.append(clip)
+                        text_layers.append({
+                            'image': subtitle_img,
+                            'start': chunk_start,
+                            'end': chunk_start + chunk_dur,
+                            'position': ((self.width - subtitle_img.shape[1]) // 2, self.height - 300),
+                        })
                         chunk_start += chunk_dur
 
                     success_count += 1
@@ -303,21 +384,33 @@ class LongformVideoGenerator:
             # 썸네일 생성: 영상 제목 기반 AI 배경 + 제목 오버레이
             title_for_thumb = title if title else hook_text
             if title_for_thumb:
-                thumb_path = f"output/thumbnails/longform_thumb_{int(time.time())}.jpg"
+                if workspace:
+                    thumb_path = workspace.path("longform_thumb.jpg")
+                else:
+                    thumb_path = unique_path("output/thumbnails", "longform_thumb", ".jpg")
                 os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
                 # 썸네일용 AI 배경 이미지 생성 (제목과 어울리는)
                 thumb_bg = self._generate_thumbnail_background(title_for_thumb)
                 if not thumb_bg and first_bg_path:
                     thumb_bg = first_bg_path
                 if thumb_bg:
-                    self._thumbnail_path = self._create_hook_thumbnail(
+                    self._local.thumbnail_path = self._create_hook_thumbnail(
                         thumb_bg, title_for_thumb, thumb_path
                     )
         else:
             print("⚠️ sentence_timings 없음 → 자막 생략")
 
-        # ── 4. 모든 클립 합성 ──
-        all_clips = bg_clips + text_clips
+        return bg_layers, text_layers
+
+    def _compose_clips(self, bg_layers, text_layers, total_duration):
+        """레이어 목록 → MoviePy 클립 (실패 시 검정 배경)"""
+        all_clips = []
+        for layer in bg_layers + text_layers:
+            clip = ImageClip(layer['image']).with_duration(layer['end'] - layer['start'])
+            clip = clip.with_start(layer['start'])
+            if 'position' in layer:
+                clip = clip.with_position(layer['position'])
+            all_clips.append(clip)
 
         if all_clips:
             try:
@@ -337,6 +430,67 @@ class LongformVideoGenerator:
     #  AI 일러스트 생성 (HuggingFace)
     # ─────────────────────────────────────────────
 
+    def _fetch_background_images(self, prompts, prefetcher=None, image_dir=None):
+        """배경 이미지 동시 생성 (네트워크 대기 병렬화, 결과는 장면 순서 유지)
+
+        prefetcher가 TTS 중에 같은 장면/프롬프트를 이미 요청했으면 그 결과를 사용합니다.
+        image_dir: 이미지 저장 위치 (None이면 output/longform_images)
+        """
+        prefetched = {}
+        if prefetcher:
+            for i, prompt in enumerate(prompts):
+                future = prefetcher.take_scene(i, prompt)
+                if future:
+                    prefetched[i] = future
+            if prefetched:
+                print(f"  ⚡ TTS 중 선요청한 배경 {len(prefetched)}/{len(prompts)}장 사용")
+
+        missing = [i for i in range(len(prompts)) if i not in prefetched]
+        bg_images = [None] * len(prompts)
+        workers = min(self.image_concurrency, len(missing))
+        if workers <= 1:
+            for i in missing:
+                bg_images[i] = self._acquire_background_image(i, prompts[i], image_dir)
+        else:
+            print(f"  ⚡ 배경 이미지 동시 생성 (워커 {workers}개)")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fetched = pool.map(self._acquire_background_image, missing,
+                                   [prompts[i] for i in missing], [image_dir] * len(missing))
+                for i, img_path in zip(missing, fetched):
+                    bg_images[i] = img_path
+
+        for i, future in prefetched.items():
+            try:
+                bg_images[i] = future.result()
+            except Exception as e:
+                print(f"  [{i+1}] 선요청 실패 ({e}) → 다시 요청")
+                bg_images[i] = self._acquire_background_image(i, prompts[i], image_dir)
+        return bg_images
+
+    def _acquire_background_image(self, i, prompt, image_dir=None):
+        """장면 i의 배경 이미지 1장 확보 (HF → Together → Pexels → 그라디언트)"""
+        img_path = None
+
+        # 1순위: HuggingFace AI 일러스트
+        if self.hf_token:
+            img_path = self._generate_ai_illustration(prompt, i + 1, image_dir=image_dir)
+
+        # 2순위: Together AI 폴백
+        if not img_path and self.together_api_key:
+            print(f"  [{i+1}] Together AI 폴백...")
+            img_path = self._generate_ai_image_together(prompt, i + 1, image_dir=image_dir)
+
+        # 3순위: Pexels 사진
+        if not img_path:
+            keyword = self.IMAGE_KEYWORDS[i % len(self.IMAGE_KEYWORDS)]
+            img_path = self._download_pexel_image(keyword, i + 1, image_dir=image_dir)
+
+        # 4순위: 그라디언트 배경
+        if not img_path:
+            img_path = self._create_gradient_background(i, image_dir=image_dir)
+
+        return img_path
+
     def _extract_scene_keywords(self, sentence_timings, total_duration, num_images):
         """각 30초 구간의 자막 전체 텍스트 수집 (AI 프롬프트용)"""
         scene_texts = []
@@ -516,9 +670,17 @@ class LongformVideoGenerator:
 
         return prompt
 
-    def _generate_ai_illustration(self, prompt, index):
+    def _generate_ai_illustration(self, prompt, index, image_dir=None):
         """HuggingFace FLUX.1-schnell로 AI 일러스트 생성"""
         try:
+            cache_key = ImageCache.make_key('huggingface', 'FLUX.1-schnell', prompt, 1344, 768)
+            cached = self.image_cache.get_image(cache_key) if self.image_cache else None
+            if cached is not None:
+                output_path = self._image_output_path("bg_ai", index, image_dir)
+                self._center_crop_resize(cached).save(output_path, "JPEG", quality=90)
+                print(f"  ♻️ [{index}] AI 일러스트 캐시 사용")
+                return output_path
+
             headers = {
                 "Authorization": f"Bearer {self.hf_token}",
                 "Content-Type": "application/json",
@@ -528,28 +690,42 @@ class LongformVideoGenerator:
                 "parameters": {"width": 1344, "height": 768}
             }
 
+            breaker = get_breaker('huggingface')
+            if not breaker.allow_request():
+                print(f"  ⏭️ [{index}] HF 회로 차단 중 → 폴백")
+                return None
+
             print(f"  [{index}] AI 일러스트 생성 중...")
-            response = requests.post(
-                self.hf_model_url,
-                json=payload,
-                headers=headers,
-                timeout=60,
-            )
+            started = time.time()
+            try:
+                response = self.http.post(
+                    self.hf_model_url,
+                    json=payload,
+                    headers=headers,
+                    timeout=60,
+                )
+            except Exception:
+                breaker.record_failure(time.time() - started)
+                raise
 
             ct = response.headers.get("content-type", "")
             if response.status_code == 200 and "image" in ct:
+                breaker.record_success(time.time() - started)
                 from io import BytesIO
                 img = Image.open(BytesIO(response.content))
+                if self.image_cache:
+                    self.image_cache.put(cache_key, response.content, provider='huggingface')
 
                 # Center crop으로 비율 유지하며 리사이즈
                 img_cropped = self._center_crop_resize(img)
-                output_path = f"output/longform_images/bg_ai_{index}_{int(time.time())}.jpg"
+                output_path = self._image_output_path("bg_ai", index, image_dir)
                 img_cropped.save(output_path, "JPEG", quality=90)
 
                 fsize = os.path.getsize(output_path) // 1024
                 print(f"  ✓ [{index}] AI 일러스트 완료 ({fsize}KB)")
                 return output_path
-            elif response.status_code == 503:
+            breaker.record_failure(time.time() - started)
+            if response.status_code == 503:
                 print(f"  ⚠️ [{index}] 모델 로딩 중... Pexels 폴백")
             else:
                 print(f"  ⚠️ [{index}] AI 생성 실패 ({response.status_code}) → Pexels 폴백")
@@ -560,7 +736,7 @@ class LongformVideoGenerator:
             print(f"  ⚠️ [{index}] AI 생성 에러: {e} → 폴백")
             return None
 
-    def _generate_ai_image_together(self, prompt, index, retry_count=2):
+    def _generate_ai_image_together(self, prompt, index, retry_count=2, image_dir=None):
         """Together AI FLUX.1-schnell로 이미지 생성 (16:9 가로)"""
         if not self.together_api_key:
             return None
@@ -581,34 +757,51 @@ class LongformVideoGenerator:
             "n": 1,
         }
 
+        cache_key = ImageCache.make_key('together', 'FLUX.1-schnell', prompt, 1344, 768)
+        cached = self.image_cache.get_image(cache_key) if self.image_cache else None
+        if cached is not None:
+            output_path = self._image_output_path("bg_together", index, image_dir)
+            self._center_crop_resize(cached).save(output_path, "JPEG", quality=90)
+            print(f"  ♻️ [{index}] Together AI 캐시 사용")
+            return output_path
+
+        breaker = get_breaker('together')
         for attempt in range(retry_count):
+            if not breaker.allow_request():
+                print(f"  ⏭️ [{index}] Together 회로 차단 중 → 폴백")
+                return None
+            started = time.time()
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=60)
+                resp = self.http.post(url, headers=headers, json=payload, timeout=60)
                 if resp.status_code == 200:
                     import base64
                     from io import BytesIO
                     data = resp.json()
                     img_data = data.get('data', [{}])[0]
+                    img_bytes = None
                     if 'b64_json' in img_data:
                         img_bytes = base64.b64decode(img_data['b64_json'])
-                        img = Image.open(BytesIO(img_bytes))
                     elif 'url' in img_data:
-                        img_resp = requests.get(img_data['url'], timeout=30)
+                        img_resp = self.http.get(img_data['url'], timeout=30)
                         if img_resp.status_code == 200:
-                            img = Image.open(BytesIO(img_resp.content))
-                        else:
-                            continue
-                    else:
+                            img_bytes = img_resp.content
+                    if img_bytes is None:
+                        breaker.record_failure(time.time() - started)
                         continue
+                    img = Image.open(BytesIO(img_bytes))
+                    breaker.record_success(time.time() - started)
+                    if self.image_cache:
+                        self.image_cache.put(cache_key, img_bytes, provider='together')
 
                     # Center crop으로 비율 유지하며 리사이즈
                     img_cropped = self._center_crop_resize(img)
-                    output_path = f"output/longform_images/bg_together_{index}_{int(time.time())}.jpg"
+                    output_path = self._image_output_path("bg_together", index, image_dir)
                     img_cropped.save(output_path, "JPEG", quality=90)
 
                     fsize = os.path.getsize(output_path) // 1024
                     print(f"  ✓ [{index}] Together AI 성공 ({fsize}KB)")
                     return output_path
+                breaker.record_failure(time.time() - started)
                 # 에러 응답 본문 로깅
                 try:
                     err_body = resp.text[:200]
@@ -617,6 +810,7 @@ class LongformVideoGenerator:
                 print(f"  ⚠️ [{index}] Together 응답 {resp.status_code}: {err_body}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
             except Exception as e:
+                breaker.record_failure(time.time() - started)
                 print(f"  ⚠️ [{index}] Together 오류: {str(e)[:80]}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
         return None
@@ -625,7 +819,7 @@ class LongformVideoGenerator:
     #  배경 이미지 관련 (Pexels 폴백)
     # ─────────────────────────────────────────────
 
-    def _download_pexel_image(self, keyword, index):
+    def _download_pexel_image(self, keyword, index, image_dir=None):
         """Pexels API에서 배경 이미지 다운로드"""
 
         if not self.pexels_api_key:
@@ -641,27 +835,60 @@ class LongformVideoGenerator:
                 "size": "large",
             }
 
-            print(f"  [{index}] Pexels 검색: {keyword}...")
-            response = requests.get(
-                "https://api.pexels.com/v1/search",
-                headers=headers,
-                params=params,
-                timeout=15,
-            )
+            # 검색 결과(JSON)와 사진 바이트를 각각 캐시 → 무작위 선택은 유지하면서 재요청 제거
+            search_key = ImageCache.make_key('pexels', 'search', json.dumps(params, sort_keys=True))
+            cached_search = self.image_cache.get(search_key) if self.image_cache else None
+            if cached_search is not None:
+                print(f"  [{index}] Pexels 검색 (캐시): {keyword}")
+                status_code, data = 200, json.loads(cached_search.decode('utf-8'))
+            else:
+                breaker = get_breaker('pexels')
+                if not breaker.allow_request():
+                    print(f"  ⏭️ [{index}] Pexels 회로 차단 중 → 그라디언트 배경")
+                    return None
+                print(f"  [{index}] Pexels 검색: {keyword}...")
+                started = time.time()
+                try:
+                    response = self.http.get(
+                        "https://api.pexels.com/v1/search",
+                        headers=headers,
+                        params=params,
+                        timeout=15,
+                    )
+                except Exception:
+                    breaker.record_failure(time.time() - started)
+                    raise
+                status_code = response.status_code
+                if status_code == 200:
+                    breaker.record_success(time.time() - started)
+                else:
+                    breaker.record_failure(time.time() - started)
+                data = response.json() if status_code == 200 else {}
+                if status_code == 200 and self.image_cache and data.get("photos"):
+                    self.image_cache.put(search_key, response.content, provider='pexels')
 
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 photos = data.get("photos", [])
 
                 if photos:
                     photo = random.choice(photos)
                     img_url = photo["src"]["landscape"]
 
-                    img_resp = requests.get(img_url, timeout=20)
-                    if img_resp.status_code == 200:
-                        output_path = f"output/longform_images/bg_pexel_{index}_{int(time.time())}.jpg"
+                    photo_key = ImageCache.make_key('pexels', 'photo', img_url)
+                    img_bytes = self.image_cache.get(photo_key) if self.image_cache else None
+                    img_status = 200
+                    if img_bytes is None:
+                        img_resp = self.http.get(img_url, timeout=20)
+                        img_status = img_resp.status_code
+                        if img_status == 200:
+                            img_bytes = img_resp.content
+                            if self.image_cache:
+                                self.image_cache.put(photo_key, img_bytes, provider='pexels')
+
+                    if img_status == 200:
+                        output_path = self._image_output_path("bg_pexel", index, image_dir)
                         with open(output_path, 'wb') as f:
-                            f.write(img_resp.content)
+                            f.write(img_bytes)
 
                         # Center crop으로 비율 유지하며 리사이즈
                         try:
@@ -674,13 +901,13 @@ class LongformVideoGenerator:
                         print(f"  ✓ [{index}] 다운로드 완료")
                         return output_path
                     else:
-                        print(f"  ⚠️ [{index}] 이미지 다운로드 실패: {img_resp.status_code}")
+                        print(f"  ⚠️ [{index}] 이미지 다운로드 실패: {img_status}")
                 else:
                     print(f"  ⚠️ [{index}] 검색 결과 없음: {keyword}")
-            elif response.status_code == 401:
+            elif status_code == 401:
                 print(f"  ⚠️ [{index}] Pexels API 키가 올바르지 않습니다")
             else:
-                print(f"  ⚠️ [{index}] API 에러: {response.status_code}")
+                print(f"  ⚠️ [{index}] API 에러: {status_code}")
 
             return None
 
@@ -688,7 +915,7 @@ class LongformVideoGenerator:
             print(f"  ⚠️ [{index}] 다운로드 에러: {e}")
             return None
 
-    def _create_gradient_background(self, index):
+    def _create_gradient_background(self, index, image_dir=None):
         """그라디언트 배경 이미지 생성 (Pexels 실패 시 폴백)"""
         colors = [
             ((15, 25, 50), (40, 70, 130)),   # 진한 파랑
@@ -709,7 +936,7 @@ class LongformVideoGenerator:
             color = tuple(int(c1[j] + (c2[j] - c1[j]) * r) for j in range(3))
             draw.line([(0, y), (self.width, y)], fill=color)
 
-        path = f"output/longform_images/bg_grad_{index}_{int(time.time())}.jpg"
+        path = self._image_output_path("bg_grad", index, image_dir)
         img.save(path, 'JPEG', quality=90)
         print(f"  ✓ [{index+1}] 그라디언트 배경 생성")
         return path
@@ -719,55 +946,15 @@ class LongformVideoGenerator:
     # ─────────────────────────────────────────────
 
     def _load_font(self, font_size):
-        """한글 폰트 로드"""
-        font = None
-        try:
-            if self.font_path:
-                font = ImageFont.truetype(self.font_path, font_size)
-            else:
-                fallback_fonts = [
-                    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                ]
-                for fp in fallback_fonts:
-                    if os.path.exists(fp):
-                        try:
-                            font = ImageFont.truetype(fp, font_size)
-                            break
-                        except:
-                            continue
-        except:
-            pass
-        if not font:
-            font = ImageFont.load_default()
-        return font
+        """한글 폰트 로드 (프로세스 공용 레지스트리 캐시)"""
+        return get_font(font_size, self.font_path)
 
     def _split_text_to_subtitle_chunks(self, text, font_size=72, max_lines=2):
         """텍스트를 최대 max_lines줄 단위 청크로 분할하여 반환"""
-        temp_img = Image.new('RGBA', (self.width, 400), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
         font = self._load_font(font_size)
 
         max_width = self.width - 250
-        lines = []
-        current_line = ""
-        words = text.split(' ')
-
-        for word in words:
-            test_line = current_line + (' ' if current_line else '') + word
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    lines.append(word)
-                    current_line = ""
-        if current_line:
-            lines.append(current_line)
+        lines = wrap_words(text, font, max_width)
 
         # max_lines줄 단위로 청크 분할
         if len(lines) <= max_lines:
@@ -780,31 +967,24 @@ class LongformVideoGenerator:
         return chunks
 
     def _create_subtitle_image(self, text, font_size=72, text_color=(255, 255, 255, 255), is_bold=False):
+        """자막 이미지 반환 (래스터 캐시 우선, 없으면 그려서 캐시에 저장)"""
+        if self.subtitle_cache is None:
+            with span('subtitle.raster', cat='render'):
+                return self._render_subtitle_image(text, font_size, text_color, is_bold)
+        key = self.subtitle_cache.make_key(
+            'longform', text, self.font_path, font_size, text_color, is_bold, self.width
+        )
+        return self.subtitle_cache.get_or_render(
+            key, lambda: self._render_subtitle_image(text, font_size, text_color, is_bold)
+        )
+
+    def _render_subtitle_image(self, text, font_size=72, text_color=(255, 255, 255, 255), is_bold=False):
         """PIL로 자막 이미지 생성 (한글 지원, 색상/볼드, 최대 2줄)"""
-        temp_img = Image.new('RGBA', (self.width, 400), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
         font = self._load_font(font_size)
 
         # 단어 단위 줄바꿈
         max_width = self.width - 250
-        lines = []
-        current_line = ""
-        words = text.split(' ')
-
-        for word in words:
-            test_line = current_line + (' ' if current_line else '') + word
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    lines.append(word)
-                    current_line = ""
-        if current_line:
-            lines.append(current_line)
+        lines = wrap_words(text, font, max_width)
 
         # 최대 2줄로 제한 (안전장치)
         if len(lines) > 2:
@@ -837,19 +1017,13 @@ class LongformVideoGenerator:
             text_width = bbox[2] - bbox[0]
             x = (self.width - text_width) // 2
 
-            # 그림자
-            for offset in [(3, 3), (2, 2)]:
-                draw.text((x + offset[0], y_offset + offset[1]), line, font=font, fill=(0, 0, 0, 200))
-            # 외곽선
-            for dx in [-2, -1, 0, 1, 2]:
-                for dy in [-2, -1, 0, 1, 2]:
-                    if dx != 0 or dy != 0:
-                        draw.text((x + dx, y_offset + dy), line, font=font, fill=(0, 0, 0, 255))
-            # 본문
-            draw.text((x, y_offset), line, font=font, fill=text_color)
-            if is_bold:
-                draw.text((x + 1, y_offset), line, font=font, fill=text_color)
-                draw.text((x + 2, y_offset), line, font=font, fill=text_color)
+            # 그림자 + 2px 외곽선 + 본문 (볼드는 가로 2px 확장)
+            draw_outlined_text(
+                img, (x, y_offset), line, font, text_color,
+                outline=2, outline_fill=(0, 0, 0, 255),
+                shadow_offsets=[(3, 3), (2, 2)], shadow_fill=(0, 0, 0, 200),
+                bold=2 if is_bold else 0
+            )
             y_offset += line_height
 
         return np.array(img)
@@ -873,19 +1047,7 @@ class LongformVideoGenerator:
 
             # 단어 단위 줄바꿈 (여백 충분히)
             max_width = self.width - 300
-            lines = []
-            current_line = ""
-            for word in hook_text.split(' '):
-                test_line = current_line + (' ' if current_line else '') + word
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                if bbox[2] - bbox[0] <= max_width:
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
+            lines = wrap_words(hook_text, font, max_width)
 
             # 최대 4줄로 제한
             if len(lines) > 4:
@@ -916,15 +1078,11 @@ class LongformVideoGenerator:
                 x = (self.width - tw) // 2
                 y = y_start + idx * line_height
 
-                # 두꺼운 외곽선 (가독성)
-                for dx in range(-4, 5):
-                    for dy in range(-4, 5):
-                        if dx != 0 or dy != 0:
-                            draw.text((x + dx, y + dy), line, font=font, fill=(0, 0, 0))
-                # 빨간 본문 + 굵은 볼드 (여러 번 겹쳐 그리기)
-                for bx in range(-2, 3):
-                    for by in range(-1, 2):
-                        draw.text((x + bx, y + by), line, font=font, fill=RED)
+                # 두꺼운 외곽선 (가독성) + 빨간 본문 굵은 볼드 (가로 ±2, 세로 ±1 확장)
+                draw_text_layers(bg, (x, y), line, font, [
+                    (square_offsets(4), (0, 0, 0)),
+                    ([(bx, by) for bx in range(-2, 3) for by in range(-1, 2)], RED),
+                ])
 
             bg.save(output_path, 'JPEG', quality=95)
             print(f"  ✅ 후킹 썸네일 생성: {output_path}")
@@ -0,0 +1,153 @@
+"""
+파이프라인 단계 실행 모듈
+스크립트 → TTS → 이미지/비디오 → 업로드 흐름을 의존 관계 그래프(DAG)로 표현하고,
+입력이 준비된 단계부터 스레드 풀에서 동시에 실행합니다.
+- 단계 = 이름(= 산출물 이름) + 실행 함수 + 입력 산출물 이름 목록 + 기대 타입
+- 서로 의존하지 않는 단계(예: 쇼츠 배경 이미지 ↔ TTS, 롱폼 메타데이터 ↔ TTS)는 겹쳐서 실행
+- 작업 전체 시간 = 단계 합계가 아닌 임계 경로(critical path) 길이
+- manifest가 있으면 완료된 단계의 산출물을 기록하고, 재개 시 기록이 유효한 단계는 건너뜀
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from tracing import span
+
+
+class Stage:
+    """파이프라인 단계 하나 (결과는 name 이름의 산출물로 저장)"""
+
+    def __init__(self, name, fn, inputs=(), required=True, expect=None, files=None):
+        """
+        fn(*inputs): 입력 산출물을 inputs 순서대로 받아 산출물을 반환
+        required: True면 실패(None 반환/예외/타입 불일치) 시 파이프라인 중단,
+                  False면 산출물을 None으로 두고 의존 단계 계속 진행
+        expect: 산출물 기대 타입 (None이 아닌 결과가 이 타입이 아니면 실패로 처리)
+        files(산출물): 산출물이 가리키는 파일 경로 목록 (매니페스트에 내용 해시 기록)
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.required = required
+        self.expect = expect
+        self.files = files
+
+
+class Pipeline:
+    """단계 DAG 실행기"""
+
+    def __init__(self, name="pipeline", max_workers=4, manifest=None):
+        """manifest: 단계 완료 기록용 JobManifest (None이면 항상 모든 단계 실행)"""
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.manifest = manifest
+        self.stages = {}
+        self.artifacts = {}
+        self.timings = {}  # 단계 이름 → (시작, 종료) time.time()
+        self.failed = None  # 파이프라인을 중단시킨 단계 이름
+        self.resumed = set()  # 매니페스트 기록으로 건너뛴 단계 이름
+
+    def add(self, name, fn, inputs=(), required=True, expect=None, files=None):
+        """단계 추가 (입력 단계는 먼저 추가되어 있어야 함 → 순환 불가)"""
+        if name in self.stages:
+            raise ValueError(f"중복 단계: {name}")
+        missing = [dep for dep in inputs if dep not in self.stages]
+        if missing:
+            raise ValueError(f"{name}: 정의되지 않은 입력 단계 {missing}")
+        self.stages[name] = Stage(name, fn, inputs, required, expect, files)
+        return self
+
+    def run(self):
+        """모든 단계 실행 후 산출물 dict 반환 (필수 단계 실패 시 self.failed에 단계 이름 기록)"""
+        pending = dict(self.stages)
+        done = set()
+        running = {}
+        started_at = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as pool:
+            while pending or running:
+                if self.failed is None:
+                    for name, stage in list(pending.items()):
+                        if all(dep in done for dep in stage.inputs):
+                            del pending[name]
+                            running[pool.submit(self._run_stage, stage)] = stage
+                if not running:
+                    break  # 실패로 남은 단계를 실행할 수 없음
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    ok = future.result()
+                    if ok or not stage.required:
+                        done.add(stage.name)
+                    elif self.failed is None:
+                        self.failed = stage.name
+
+        self._print_summary(time.time() - started_at)
+        return self.artifacts
+
+    def _run_stage(self, stage):
+        """단계 실행 → 산출물 저장 (성공 여부 반환)"""
+        start = time.time()
+        result = self._resume_stage(stage)
+        if result is not None:
+            self.timings[stage.name] = (start, time.time())
+            self.artifacts[stage.name] = result
+            return True
+
+        args = [self.artifacts.get(dep) for dep in stage.inputs]
+        try:
+            with span(f"{self.name}.{stage.name}", cat='stage'):
+                result = stage.fn(*args)
+        except Exception as e:
+            print(f"❌ [{stage.name}] 단계 오류: {e}")
+            import traceback
+            traceback.print_exc()
+            result = None
+        self.timings[stage.name] = (start, time.time())
+
+        if result is not None and stage.expect is not None and not isinstance(result, stage.expect):
+            print(f"❌ [{stage.name}] 산출물 타입 오류: {type(result).__name__} "
+                  f"(기대: {stage.expect.__name__})")
+            result = None
+        self.artifacts[stage.name] = result
+        if result is not None and self.manifest is not None:
+            self.manifest.record(stage.name, result, stage.files(result) if stage.files else ())
+        return result is not None
+
+    def _resume_stage(self, stage):
+        """매니페스트에 유효한 기록이 있으면 그 산출물 반환 (입력 단계가 다시 실행됐으면 None)"""
+        if self.manifest is None:
+            return None
+        # 입력이 새로 만들어졌으면 기록된 산출물은 이전 입력 기준이므로 다시 실행
+        if any(dep not in self.resumed for dep in stage.inputs):
+            return None
+        result = self.manifest.lookup(stage.name)
+        if result is None or (stage.expect is not None and not isinstance(result, stage.expect)):
+            return None
+        print(f"♻️ [{stage.name}] 이전 실행 산출물 재사용")
+        self.resumed.add(stage.name)
+        return result
+
+    def critical_path(self):
+        """실행된 단계 중 가장 늦게 끝난 단계부터 입력 단계를 거슬러 올라간 경로"""
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        path = [name]
+        while True:
+            deps = [dep for dep in self.stages[name].inputs if dep in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda n: self.timings[n][1])
+            path.append(name)
+        return list(reversed(path))
+
+    def _print_summary(self, wall):
+        """단계별 소요 시간 + 임계 경로 출력"""
+        if not self.timings:
+            return
+        total = sum(end - start for start, end in self.timings.values())
+        stages = ", ".join(f"{name} {'재사용' if name in self.resumed else f'{end - start:.1f}s'}"
+                           for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]))
+        print(f"\n⏱️ [{self.name}] 단계: {stages}")
+        print(f"   전체 {wall:.1f}초 (단계 합계 {total:.1f}초), 임계 경로: {' → '.join(self.critical_path())}")
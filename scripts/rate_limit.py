@@ -0,0 +1,99 @@
+"""
+API 동시성/속도 제한 모듈
+여러 영상을 동시에 만들 때 고정 대기(sleep) 대신 API별로
+동시 요청 수(세마포어)와 분당 요청 수(토큰 버킷)를 제한합니다.
+- 네트워크 작업: gemini / edge-tts / huggingface / together / pexels
+- CPU 작업: render (동시에 인코딩할 영상 수)
+- youtube: 업로드 (API 클라이언트 공유로 한 번에 하나)
+"""
+
+import time
+import threading
+
+
+class ApiLimiter:
+    """API 하나의 동시 요청 수 + 분당 요청 수 제한 (with 문으로 사용, 스레드 안전)"""
+
+    def __init__(self, name, concurrency=0, per_minute=0):
+        """concurrency / per_minute가 0이면 해당 제한 없음"""
+        self.name = name
+        self.per_minute = per_minute
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+        self._tokens = float(per_minute)  # 최대 1분치 버스트 허용
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        if self._slots:
+            self._slots.acquire()
+        try:
+            self._wait_for_token()
+        except BaseException:
+            if self._slots:
+                self._slots.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._slots:
+            self._slots.release()
+        return False
+
+    def _wait_for_token(self):
+        """토큰 버킷에서 1건 차감 (부족하면 다음 토큰이 찰 때까지 대기)"""
+        if self.per_minute <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.per_minute,
+                                   self._tokens + (now - self._updated) * self.per_minute / 60.0)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) * 60.0 / self.per_minute
+            time.sleep(wait_time)
+
+
+# 설정이 없을 때 기본값 (동시 요청 수, 분당 요청 수)
+DEFAULT_LIMITS = {
+    'gemini': {'concurrency': 2, 'per_minute': 10},
+    'edge-tts': {'concurrency': 2, 'per_minute': 0},
+    'huggingface': {'concurrency': 2, 'per_minute': 0},
+    'together': {'concurrency': 3, 'per_minute': 0},
+    'pexels': {'concurrency': 4, 'per_minute': 0},
+    'render': {'concurrency': 1, 'per_minute': 0},
+    'youtube': {'concurrency': 1, 'per_minute': 0},
+}
+
+_limiters = {}
+_settings = {}
+_registry_lock = threading.Lock()
+
+
+def configure_limits(config=None):
+    """config.json의 rate_limits 설정 적용 (이후 생성되는 제한기에 사용)
+
+    설정 예시:
+        "rate_limits": {"gemini": {"concurrency": 2, "per_minute": 10}, "render": {"concurrency": 1}}
+    """
+    with _registry_lock:
+        for name, limits in (config or {}).items():
+            _settings[name] = dict(limits)
+
+
+def get_limiter(name):
+    """API 이름별 공용 제한기 반환 (프로세스 내 모든 작업이 공유)"""
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limits = dict(DEFAULT_LIMITS.get(name, {}))
+            limits.update(_settings.get(name, {}))
+            limiter = ApiLimiter(
+                name,
+                concurrency=limits.get('concurrency', 0),
+                per_minute=limits.get('per_minute', 0),
+            )
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,233 @@
+"""
+재개 가능한 업로드 모듈
+YouTube resumable upload 프로토콜로 큰 영상을 청크 단위로 올리고, 끊기면 이어서 전송합니다.
+- 세션 시작: POST ?uploadType=resumable → Location 헤더의 세션 URI (state_path에 저장)
+- 청크 전송: PUT + Content-Range, 308 응답의 Range 헤더로 서버가 받은 위치 확인
+- 네트워크 오류/5xx: 지수 백오프 후 서버 위치 조회(Content-Range: bytes */전체)로 이어서 전송
+- 프로세스 재시작: 저장된 세션 URI로 서버 위치를 조회해 이어서 전송 (세션 만료 시 새로 시작)
+"""
+
+import os
+import json
+import time
+import random
+import requests
+from tracing import span
+
+UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+CHUNK_ALIGN = 256 * 1024  # 마지막 청크를 제외한 청크 크기는 256KB 배수여야 함
+RETRY_STATUS = {429, 500, 502, 503, 504}
+EXPIRED_STATUS = {404, 410}
+
+
+class UploadError(Exception):
+    """재시도할 수 없는 업로드 실패"""
+
+
+class ResumableUpload:
+    """파일 하나의 재개 가능한 업로드 (run()이 완료 응답 JSON 반환)"""
+
+    def __init__(self, session, file_path, body, part, state_path=None, chunk_size=8 * 1024 * 1024,
+                 max_retries=8, base_delay=1.0, max_delay=64.0, upload_url=UPLOAD_URL, timeout=300):
+        """
+        session: 인증된 requests 호환 세션 (google.auth AuthorizedSession 등)
+        body: videos.insert 리소스 (snippet/status), part: 'snippet,status'
+        state_path: 세션 URI 저장 파일 (None이면 저장하지 않음 → 프로세스 재시작 시 처음부터)
+        chunk_size: 청크 크기 (256KB 배수로 내림, 0이면 나머지 전체를 한 번에 전송)
+        max_retries: 진전 없이 연속 실패할 수 있는 횟수 (청크가 전송되면 초기화)
+        """
+        self.session = session
+        self.file_path = file_path
+        self.body = body
+        self.part = part
+        self.state_path = state_path
+        self.chunk_size = max(CHUNK_ALIGN, chunk_size // CHUNK_ALIGN * CHUNK_ALIGN) if chunk_size > 0 else 0
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.upload_url = upload_url
+        self.timeout = timeout
+        self.total = os.path.getsize(file_path)
+
+    def run(self, on_progress=None):
+        """업로드 실행 → 생성된 영상 리소스 dict (실패 시 UploadError)
+
+        on_progress(fraction): 서버가 받은 비율이 바뀔 때마다 호출
+        """
+        session_uri = self._load_session()
+        need_query = session_uri is not None
+        if session_uri:
+            print("   ♻️ 저장된 업로드 세션으로 이어서 전송")
+        else:
+            session_uri = self._start()
+        offset = 0
+        retries = 0
+
+        with open(self.file_path, 'rb') as f:
+            while True:
+                queried = need_query or offset >= self.total
+                try:
+                    if queried:
+                        kind, value = self._query(session_uri)
+                    else:
+                        kind, value = self._put_chunk(f, session_uri, offset)
+                    need_query = False
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    kind, value = 'retry', type(e).__name__
+
+                if kind == 'done':
+                    self._clear_session()
+                    if on_progress:
+                        on_progress(1.0)
+                    return value
+                if kind == 'offset':
+                    if value > offset or (queried and value < self.total):
+                        if value > offset:
+                            retries = 0  # 진전이 있으면 재시도 횟수 초기화
+                            if on_progress:
+                                on_progress(value / self.total if self.total else 1.0)
+                        offset = value
+                        continue
+                    # 청크를 보냈는데 서버 위치가 그대로이거나, 다 받았는데 완료 응답이 없음 → 재시도
+                    kind, value = 'retry', f"308 Range {value}"
+                if kind == 'expired':
+                    retries += 1
+                    if retries > self.max_retries:
+                        raise UploadError(f"업로드 세션이 계속 만료됨 ({value})")
+                    print(f"   ⚠️ 업로드 세션 만료 ({value}) → 새 세션으로 처음부터 전송")
+                    self._clear_session()
+                    session_uri = self._start()
+                    offset = 0
+                    continue
+
+                # 재시도 가능한 실패: 백오프 후 서버가 받은 위치부터 이어서 전송
+                retries += 1
+                if retries > self.max_retries:
+                    raise UploadError(f"업로드 재시도 {self.max_retries}회 초과 (마지막 오류: {value})")
+                delay = self._backoff(retries)
+                print(f"   ⚠️ 업로드 청크 실패 ({value}), {delay:.1f}초 후 재시도 ({retries}/{self.max_retries})")
+                time.sleep(delay)
+                need_query = True
+
+    def _start(self):
+        """업로드 세션 시작 → 세션 URI (state_path에 저장)"""
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                resp = self.session.post(
+                    self.upload_url,
+                    params={'uploadType': 'resumable', 'part': self.part},
+                    data=json.dumps(self.body).encode('utf-8'),
+                    headers={
+                        'Content-Type': 'application/json; charset=UTF-8',
+                        'X-Upload-Content-Length': str(self.total),
+                        'X-Upload-Content-Type': 'video/*',
+                    },
+                    timeout=self.timeout,
+                )
+                error = resp.status_code
+                if resp.status_code == 200 and resp.headers.get('Location'):
+                    session_uri = resp.headers['Location']
+                    self._save_session(session_uri)
+                    return session_uri
+                if resp.status_code not in RETRY_STATUS:
+                    raise UploadError(f"업로드 세션 시작 실패 {resp.status_code}: {resp.text[:300]}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = type(e).__name__
+            if attempt > self.max_retries:
+                break
+            delay = self._backoff(attempt)
+            print(f"   ⚠️ 업로드 세션 시작 실패 ({error}), {delay:.1f}초 후 재시도")
+            time.sleep(delay)
+        raise UploadError(f"업로드 세션 시작 재시도 {self.max_retries}회 초과")
+
+    def _put_chunk(self, f, session_uri, offset):
+        """offset부터 청크 하나 전송 → 응답 분류"""
+        f.seek(offset)
+        data = f.read(self.chunk_size or self.total - offset)
+        end = offset + len(data) - 1
+        with span('upload.chunk', cat='upload', offset=offset, bytes=len(data)):
+            resp = self.session.put(
+                session_uri,
+                data=data,
+                headers={
+                    'Content-Length': str(len(data)),
+                    'Content-Range': f"bytes {offset}-{end}/{self.total}",
+                },
+                timeout=self.timeout,
+            )
+        return self._classify(resp)
+
+    def _query(self, session_uri):
+        """서버가 받은 위치 조회 (빈 PUT + Content-Range: bytes */전체) → 응답 분류"""
+        with span('upload.query', cat='upload'):
+            resp = self.session.put(
+                session_uri,
+                headers={'Content-Length': '0', 'Content-Range': f"bytes */{self.total}"},
+                timeout=self.timeout,
+            )
+        return self._classify(resp)
+
+    @staticmethod
+    def _classify(resp):
+        """응답 → ('done', 영상 리소스) / ('offset', 다음 전송 위치) / ('expired', 코드) / ('retry', 코드)"""
+        status = resp.status_code
+        if status in (200, 201):
+            return 'done', resp.json()
+        if status == 308:
+            # Range: bytes=0-N → 서버가 N까지 받음 (헤더가 없으면 아직 받은 바이트 없음)
+            received = resp.headers.get('Range', '')
+            if received.startswith('bytes=') and '-' in received:
+                return 'offset', int(received.rsplit('-', 1)[1]) + 1
+            return 'offset', 0
+        if status in EXPIRED_STATUS:
+            return 'expired', status
+        if status in RETRY_STATUS:
+            return 'retry', status
+        raise UploadError(f"업로드 실패 {status}: {resp.text[:300]}")
+
+    def _backoff(self, attempt):
+        """지수 백오프 + 지터 (초)"""
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) + random.uniform(0, self.base_delay)
+
+    def _load_session(self):
+        """저장된 세션 URI (같은 파일/크기/수정 시각일 때만, 없으면 None)"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception:
+            return None
+        stat = os.stat(self.file_path)
+        if (state.get('file') != os.path.abspath(self.file_path) or state.get('size') != stat.st_size
+                or state.get('mtime') != stat.st_mtime):
+            print("   ⚠️ 저장된 업로드 세션이 현재 파일과 다름 → 새로 시작")
+            return None
+        return state.get('session_uri')
+
+    def _save_session(self, session_uri):
+        """세션 URI 저장 (원자적 쓰기)"""
+        if not self.state_path:
+            return
+        stat = os.stat(self.file_path)
+        state = {
+            'session_uri': session_uri,
+            'file': os.path.abspath(self.file_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'created': time.time(),
+        }
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"   ⚠️ 업로드 세션 저장 실패: {e}")
+
+    def _clear_session(self):
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                os.remove(self.state_path)
+            except OSError:
+                pass
@@ -9,8 +9,10 @@ import random
 import re
 import os
 from datetime import datetime
+from rate_limit import get_limiter
+from tracing import span
 from topic_manager import (
-    pick_unique_topic, record_topic, filter_trending_topics, is_topic_blocked,
+    pick_unique_topic, pick_trending_topic, release_topic, record_topic, is_topic_blocked,
     get_popular_categories_hint, get_existing_titles_for_prompt
 )
 
@@ -79,7 +81,8 @@ class ScriptGenerator:
 다음 JSON 형식으로만 답변하세요:
 {{"topics":["주제1","주제2","주제3"]}}"""
 
-            response = self.model.generate_content(prompt)
+            with get_limiter('gemini'), span('gemini.generate_content', cat='api'):
+                response = self.model.generate_content(prompt)
             content = response.text.strip()
 
             json_match = re.search(r'\{[^{}]*"topics"[^{}]*\}', content)
@@ -114,9 +117,8 @@ class ScriptGenerator:
         if use_trending:
             trending = self.get_trending_topic()
             if trending:
-                filtered = filter_trending_topics(trending, 'shorts')
-                if filtered:
-                    topic = random.choice(filtered)
+                topic = pick_trending_topic(trending, 'shorts')
+                if topic:
                     print(f"✅ 공유 트렌디 주제 선택: {topic}")
                     return topic
         topic = pick_unique_topic(self.topics, 'shorts')
@@ -142,15 +144,15 @@ class ScriptGenerator:
             print("❌ Gemini 모델이 초기화되지 않았습니다.")
             return None
 
+        reserved = topic is None
         if topic is None:
             use_trending = random.random() < 0.5
             if use_trending:
                 trending = self.get_trending_topic()
                 if trending:
-                    # 트렌딩 주제 중 차단/중복 필터링
-                    filtered = filter_trending_topics(trending, 'shorts')
-                    if filtered:
-                        topic = random.choice(filtered)
+                    # 트렌딩 주제 중 차단/중복 필터링 후 선택·예약 (동시 작업끼리 같은 주제 방지)
+                    topic = pick_trending_topic(trending, 'shorts')
+                    if topic:
                         print(f"✅ 트렌디한 주제 선택: {topic}")
                     else:
                         topic = pick_unique_topic(self.topics, 'shorts')
@@ -162,12 +164,20 @@ class ScriptGenerator:
                 topic = pick_unique_topic(self.topics, 'shorts')
                 print(f"📌 고정 주제 선택: {topic}")
 
+        result = self._generate_for_topic(topic, paired_with_longform)
+        if result is None and reserved:
+            release_topic(topic)  # 기록 전에 실패한 주제는 예약 해제
+        return result
+
+    def _generate_for_topic(self, topic, paired_with_longform=False):
+        """정해진 주제로 Gemini 호출 + 파싱 (성공 시 이력 기록, 실패 시 None)"""
         prompt = self._build_prompt(topic, paired_with_longform=paired_with_longform)
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
+                with get_limiter('gemini'), span('gemini.generate_content', cat='api'):
+                    response = self.model.generate_content(prompt)
                 raw = response.text.strip()
                 result = self._parse_response(raw, topic)
                 if result:
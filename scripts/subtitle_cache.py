@@ -0,0 +1,191 @@
+"""
+자막 래스터 캐시 모듈
+같은 텍스트/스타일/크기의 자막 이미지를 다시 그리지 않도록 결과 RGBA 배열을 재사용합니다.
+- 메모리: 프로세스 공용 LRU (OrderedDict)
+- 디스크: cache/subtitles/v{RENDER_VERSION}/{key}.png (선택, 재실행/재렌더링 시 재사용)
+  - 용량 상한(disk_max_mb)을 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU, 파일 수정 시각 기준)
+  - 이전 RENDER_VERSION 디렉토리는 시작 시 삭제
+"""
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from PIL import Image
+import numpy as np
+from tracing import span
+
+
+# 자막 그리기 코드가 바뀌면 올려서 디스크 캐시 무효화
+RENDER_VERSION = 2
+
+
+class SubtitleRasterCache:
+    """자막 이미지 LRU 캐시 (메모리 + 선택적 디스크 PNG)
+
+    반환된 배열은 여러 클립이 공유하므로 호출 측에서 수정하지 않습니다.
+    """
+
+    def __init__(self, max_items=512, disk_dir=None, disk_max_bytes=512 * 1024 ** 2):
+        self.max_items = max_items
+        self.disk_dir = os.path.join(disk_dir, f"v{RENDER_VERSION}") if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_files = {}  # key → (바이트 수, 마지막 사용 시각)
+        self.hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            self._purge_stale_versions(disk_dir)
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    @staticmethod
+    def make_key(variant, text, font_path, font_size, text_color, is_bold, width):
+        """(스타일 종류, 텍스트, 폰트, 크기, 색상, 볼드, 가로 폭) → 캐시 키"""
+        raw = repr((RENDER_VERSION, variant, text, font_path, font_size,
+                    tuple(text_color), bool(is_bold), width))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get_or_render(self, key, render_fn):
+        """캐시에 있으면 반환, 없으면 render_fn()으로 그려서 저장 후 반환"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+
+        image = self._load_disk(key)
+        if image is None:
+            with span('subtitle.raster', cat='render'):
+                image = render_fn()
+            self._save_disk(key, image)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        with self._lock:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return image
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.png")
+
+    def _load_disk(self, key):
+        """디스크 캐시 로드 (없거나 손상되면 None)"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as img:
+                image = np.array(img.convert('RGBA'))
+        except Exception:
+            return None
+        # 사용 시각 갱신 (수정 시각을 LRU 기준으로 사용 → 재실행 후에도 유지)
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._disk_files:
+                self._disk_files[key] = (self._disk_files[key][0], now)
+        return image
+
+    def _save_disk(self, key, image):
+        """디스크 캐시 저장 (임시 파일 → rename으로 부분 기록 방지, 실패는 무시)"""
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            Image.fromarray(image).save(tmp_path, format='PNG', compress_level=1)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            print(f"   ⚠️ 자막 캐시 저장 실패: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._disk_files[key] = (size, time.time())
+            self._evict_disk()
+
+    def _scan_disk(self):
+        """디스크 캐시 파일 목록/크기/사용 시각 수집 (시작 시 1회)"""
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith('.png'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            self._disk_files[entry.name[:-4]] = (stat.st_size, stat.st_mtime)
+        with self._lock:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """디스크 총 용량이 상한을 넘으면 마지막 사용 시각이 오래된 것부터 삭제 (lock 보유 상태에서 호출)"""
+        total = sum(size for size, _ in self._disk_files.values())
+        if total <= self.disk_max_bytes:
+            return
+        for key, (size, _) in sorted(self._disk_files.items(), key=lambda item: item[1][1]):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+            total -= size
+            del self._disk_files[key]
+
+    @staticmethod
+    def _purge_stale_versions(root):
+        """이전 RENDER_VERSION 디렉토리(v숫자)와 버전 구분 전 자막 PNG(sha1 이름) 삭제 (다른 파일은 건드리지 않음)"""
+        if not os.path.isdir(root):
+            return
+        current = f"v{RENDER_VERSION}"
+        for entry in os.scandir(root):
+            try:
+                if entry.is_dir() and re.fullmatch(r'v\d+', entry.name) and entry.name != current:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                elif entry.is_file() and re.fullmatch(r'[0-9a-f]{40}\.png(\.\d+\.\d+\.tmp)?', entry.name):
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_subtitle_cache(config=None):
+    """프로세스 공용 자막 캐시 반환 (config: config.json의 cache.subtitles)
+
+    설정 예시:
+        "cache": {"subtitles": {"enabled": true, "memory_items": 512, "disk_dir": "cache/subtitles",
+                                "disk_max_mb": 512}}
+    disk_dir를 비우면 메모리 캐시만 사용합니다. enabled가 false면 None을 반환합니다.
+    """
+    global _shared_cache
+    config = config or {}
+    if not config.get('enabled', True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SubtitleRasterCache(
+                max_items=config.get('memory_items', 512),
+                disk_dir=config.get('disk_dir', 'cache/subtitles') or None,
+                disk_max_bytes=int(config.get('disk_max_mb', 512)) * 1024 * 1024,
+            )
+        return _shared_cache
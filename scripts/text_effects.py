@@ -0,0 +1,103 @@
+"""
+텍스트 효과 렌더링 모듈
+그림자/외곽선/가짜 볼드를 draw.text 수십 번 반복 대신 글리프 마스크 1회 래스터화 + NumPy 합성으로 그립니다.
+- 같은 색으로 여러 오프셋을 겹쳐 그리는 것은 마스크 이동본의 합집합(1 - Π(1 - m))과 같으므로
+  ImageDraw.text 반복 결과와 반올림 오차 수준으로 일치합니다.
+"""
+
+from PIL import Image, ImageColor, ImageDraw
+import numpy as np
+
+
+def square_offsets(radius):
+    """(-radius..radius)² 오프셋 목록 (중심 제외) — 기존 dx/dy 이중 루프 외곽선과 동일"""
+    return [(dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if dx != 0 or dy != 0]
+
+
+def _shift(mask, dx, dy):
+    """마스크를 (dx, dy)만큼 이동 (밖으로 나간 부분은 버림)"""
+    h, w = mask.shape
+    out = np.zeros_like(mask)
+    out[max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)] = \
+        mask[max(-dy, 0):h + min(-dy, 0), max(-dx, 0):w + min(-dx, 0)]
+    return out
+
+
+def _ink(color, mode):
+    """색상(문자열/튜플) → 이미지 모드에 맞는 밴드 튜플"""
+    if isinstance(color, str):
+        return ImageColor.getcolor(color, mode)
+    color = tuple(color)
+    if mode == 'RGBA' and len(color) == 3:
+        return color + (255,)
+    return color[:len(mode)]
+
+
+def draw_text_layers(img, xy, text, font, layers):
+    """글리프 마스크를 한 번만 만들고 레이어(오프셋 목록, 색상)를 순서대로 합성 (img를 직접 수정)
+
+    layers 예시 (그림자 → 외곽선 → 본문 + 볼드):
+        [([(3, 3), (2, 2)], (0, 0, 0, 200)),
+         (square_offsets(2), (0, 0, 0, 255)),
+         ([(0, 0), (1, 0), (2, 0)], text_color)]
+    """
+    if img.mode not in ('RGB', 'RGBA') or not text:
+        draw = ImageDraw.Draw(img)
+        for offsets, color in layers:
+            for dx, dy in offsets:
+                draw.text((xy[0] + dx, xy[1] + dy), text, font=font, fill=color)
+        return img
+
+    x, y = int(xy[0]), int(xy[1])
+    pad = max((max(abs(dx), abs(dy)) for offsets, _ in layers for dx, dy in offsets), default=0)
+    left, top, right, bottom = font.getbbox(text)
+    width = right - left + pad * 2
+    height = bottom - top + pad * 2
+    if width <= 0 or height <= 0:
+        return img
+
+    # 글리프 마스크 1회 래스터화 (ImageDraw.text와 같은 정수 좌표 기준)
+    mask_img = Image.new('L', (width, height), 0)
+    ImageDraw.Draw(mask_img).text((pad - left, pad - top), text, font=font, fill=255)
+    mask = np.asarray(mask_img, dtype=np.float32) / 255.0
+
+    box = (x + left - pad, y + top - pad, x + left - pad + width, y + top - pad + height)
+    region = np.asarray(img.crop(box), dtype=np.float32)
+    has_alpha = img.mode == 'RGBA'
+
+    for offsets, color in layers:
+        # 같은 색 반복 그리기 = 이동 마스크들의 합집합
+        keep = np.ones_like(mask)
+        for dx, dy in offsets:
+            keep *= 1.0 - _shift(mask, dx, dy)
+        coverage = 1.0 - keep
+        touched = coverage > 0
+        ink = np.array(_ink(color, img.mode), dtype=np.float32)
+
+        color_coverage = coverage
+        if has_alpha:
+            # ImageDraw 동작: 완전 투명 픽셀에 그리면 색상 채널은 잉크 색을 그대로 사용
+            color_coverage = np.where(touched & (region[..., 3] == 0), 1.0, coverage)
+            region[..., 3] = ink[3] * coverage + region[..., 3] * (1.0 - coverage)
+        bands = 3
+        region[..., :bands] = (ink[:bands] * color_coverage[..., None]
+                               + region[..., :bands] * (1.0 - color_coverage[..., None]))
+
+    out = Image.fromarray(np.clip(np.rint(region), 0, 255).astype(np.uint8), img.mode)
+    img.paste(out, box[:2])
+    return img
+
+
+def draw_outlined_text(img, xy, text, font, fill, outline=0, outline_fill=(0, 0, 0, 255),
+                       shadow_offsets=(), shadow_fill=(0, 0, 0, 200), bold=0):
+    """자막/썸네일 공통 스타일: 그림자 → 외곽선(정사각 반경) → 본문(+가로 bold px)"""
+    layers = []
+    if shadow_offsets:
+        layers.append((list(shadow_offsets), shadow_fill))
+    if outline:
+        layers.append((square_offsets(outline), outline_fill))
+    layers.append(([(bx, 0) for bx in range(bold + 1)], fill))
+    return draw_text_layers(img, xy, text, font, layers)
@@ -6,10 +6,15 @@ AI 일러스트 배경 + 텍스트 오버레이로 클릭을 유도하는 썸네
 import json
 import os
 import re
-import requests
 import time
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
+from font_registry import find_korean_font, get_font
+from text_effects import draw_text_layers
+from image_cache import ImageCache, get_image_cache
+from circuit_breaker import configure_breakers, get_breaker
+from http_client import get_http_session
+from workspace import unique_path
 
 
 class ThumbnailGenerator:
@@ -17,28 +22,36 @@ class ThumbnailGenerator:
     WIDTH = 1280
     HEIGHT = 720
 
-    def __init__(self, config_path="config/config.json"):
+    def __init__(self, config_path="config/config.json", http_session=None):
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
 
+        # 공용 HTTP 세션 (호스트별 커넥션 풀 + keep-alive)
+        self.http = http_session or get_http_session(self.config.get('http'))
+
         self.hf_token = self.config.get('huggingface_token', '')
         self.hf_model_url = (
             "https://router.huggingface.co/hf-inference/models/"
             "black-forest-labs/FLUX.1-schnell"
         )
-        self.font_path = self._find_korean_font()
+        self.font_path = find_korean_font()
+        self.image_cache = get_image_cache(self.config.get('cache', {}).get('images'))
+        configure_breakers(self.config.get('circuit_breaker'))
         os.makedirs("output/thumbnails", exist_ok=True)
 
     # ─────────────────────────────────────────────
     # 공개 API
     # ─────────────────────────────────────────────
-    def generate_thumbnail(self, title, script_text="", output_path=None):
+    def generate_thumbnail(self, title, script_text="", output_path=None, workspace=None):
         """썸네일 생성 메인 메서드
+        output_path가 없으면 작업 공간(workspace) 안, 작업 공간도 없으면 output/thumbnails에 고유 이름으로 저장
         Returns: 저장된 썸네일 파일 경로 (실패 시 None)
         """
         if not output_path:
-            ts = int(time.time())
-            output_path = f"output/thumbnails/thumb_{ts}.jpg"
+            if workspace:
+                output_path = workspace.path("thumb.jpg")
+            else:
+                output_path = unique_path("output/thumbnails", "thumb", ".jpg")
 
         print("🖼️  썸네일 생성 중...")
 
@@ -83,13 +96,24 @@ class ThumbnailGenerator:
         )
 
     def _hf_generate(self, prompt):
-        """HuggingFace API로 이미지 생성"""
+        """HuggingFace API로 이미지 생성 (이미지 캐시 우선)"""
+        cache_key = ImageCache.make_key('huggingface', 'FLUX.1-schnell', prompt)
+        if self.image_cache:
+            cached = self.image_cache.get_image(cache_key)
+            if cached is not None:
+                print("  ♻️ 썸네일 배경 캐시 사용")
+                return cached
+        breaker = get_breaker('huggingface')
+        if not breaker.allow_request():
+            print("  ⏭️ HF 회로 차단 중 → 그라디언트 폴백")
+            return None
+        started = time.time()
         try:
             headers = {
                 "Authorization": f"Bearer {self.hf_token}",
                 "Content-Type": "application/json",
             }
-            resp = requests.post(
+            resp = self.http.post(
                 self.hf_model_url,
                 json={"inputs": prompt},
                 headers=headers,
@@ -97,10 +121,15 @@ class ThumbnailGenerator:
             )
             ct = resp.headers.get("content-type", "")
             if resp.status_code == 200 and "image" in ct:
+                breaker.record_success(time.time() - started)
+                if self.image_cache:
+                    self.image_cache.put(cache_key, resp.content, provider='huggingface')
                 return Image.open(BytesIO(resp.content))
             else:
+                breaker.record_failure(time.time() - started)
                 print(f"  ⚠️ AI 썸네일 배경 실패 ({resp.status_code}), 그라디언트 폴백")
         except Exception as e:
+            breaker.record_failure(time.time() - started)
             print(f"  ⚠️ AI 배경 오류: {e}")
         return None
 
@@ -187,12 +216,11 @@ class ThumbnailGenerator:
         for i, line in enumerate(lines):
             y = y_start + i * line_height
 
-            # 그림자 (검정)
-            for dx, dy in [(-3, -3), (3, -3), (-3, 3), (3, 3), (0, 4)]:
-                draw.text((x_start + dx, y + dy), line, font=font, fill=(0, 0, 0))
-
-            # 메인 텍스트 (흰색)
-            draw.text((x_start, y), line, font=font, fill=(255, 255, 255))
+            # 그림자 (검정) + 메인 텍스트 (흰색)
+            draw_text_layers(img, (x_start, y), line, font, [
+                ([(-3, -3), (3, -3), (-3, 3), (3, 3), (0, 4)], (0, 0, 0)),
+                ([(0, 0)], (255, 255, 255)),
+            ])
 
         # 우상단에 이모지 악센트 (시선 유도)
         accent_font = self._get_font(48)
@@ -224,30 +252,9 @@ class ThumbnailGenerator:
     # ─────────────────────────────────────────────
     # 유틸리티
     # ─────────────────────────────────────────────
-    def _find_korean_font(self):
-        """한글 폰트 찾기"""
-        paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Arial Unicode.ttf",
-            "/Library/Fonts/NotoSansCJK.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-        ]
-        for p in paths:
-            if os.path.exists(p):
-                return p
-        return None
-
     def _get_font(self, size):
-        """PIL 폰트 반환"""
-        if self.font_path:
-            try:
-                return ImageFont.truetype(self.font_path, size)
-            except Exception:
-                pass
-        return ImageFont.load_default()
+        """PIL 폰트 반환 (프로세스 공용 레지스트리 캐시)"""
+        return get_font(size, self.font_path)
 
     def _strip_markdown(self, text):
         """마크다운 서식 제거"""
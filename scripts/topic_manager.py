@@ -5,11 +5,16 @@
 
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 
 
 HISTORY_FILE = "logs/topic_history.json"
 
+# 동시 작업 보호: 이력 파일 읽기/쓰기 + 생성 중(아직 기록 전)인 주제 예약
+_history_lock = threading.RLock()
+_reserved_topics = set()
+
 # 의미없는/저품질 주제 필터링 키워드
 BLOCKED_KEYWORDS = [
     "밈", "meme", "트렌드 밈", "짤", "유행어", "챌린지",
@@ -134,17 +139,19 @@ def _save_history(history):
 
 def record_topic(video_type, topic, title=""):
     """사용한 주제를 이력에 기록"""
-    history = _load_history()
-    if video_type not in history:
-        history[video_type] = []
+    with _history_lock:
+        history = _load_history()
+        if video_type not in history:
+            history[video_type] = []
 
-    history[video_type].append({
-        "topic": topic,
-        "title": title,
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M")
-    })
+        history[video_type].append({
+            "topic": topic,
+            "title": title,
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M")
+        })
 
-    _save_history(history)
+        _save_history(history)
+        _reserved_topics.discard(topic)
 
 
 def get_used_topics(video_type, days=9999):
@@ -176,6 +183,9 @@ def get_used_topics(video_type, days=9999):
 
     # YouTube 채널 전체 영상 제목도 포함
     used.extend(_youtube_titles)
+    # 다른 작업이 생성 중인 주제도 포함
+    with _history_lock:
+        used.extend(_reserved_topics)
     return used
 
 
@@ -244,6 +254,42 @@ def is_topic_duplicate(topic, used_topics):
 
 
 def pick_unique_topic(topics, video_type, days=9999):
+    """중복되지 않고 사용 가능한 주제를 선택 후 예약 (동시 작업끼리 같은 주제를 고르지 않도록)"""
+    with _history_lock:
+        choice = _pick_unique_topic(topics, video_type, days=days)
+        _reserved_topics.add(choice)
+        return choice
+
+
+def pick_trending_topic(trending_list, video_type):
+    """트렌딩 주제 중 차단/중복을 제외하고 하나를 선택 후 예약 (남은 주제가 없으면 None)
+
+    필터링-선택-예약을 한 lock 안에서 수행해 동시 작업끼리 같은 트렌딩 주제를 고르지 않도록 합니다.
+    """
+    import random
+
+    with _history_lock:
+        filtered = filter_trending_topics(trending_list, video_type)
+        if not filtered:
+            return None
+        choice = random.choice(filtered)
+        _reserved_topics.add(choice)
+        return choice
+
+
+def reserve_topic(topic):
+    """생성 중인 주제 예약 (record_topic 전까지 get_used_topics에 포함)"""
+    with _history_lock:
+        _reserved_topics.add(topic)
+
+
+def release_topic(topic):
+    """예약 해제 (기록 전에 생성이 실패한 주제를 다른 작업이 다시 고를 수 있도록)"""
+    with _history_lock:
+        _reserved_topics.discard(topic)
+
+
+def _pick_unique_topic(topics, video_type, days=9999):
     """중복되지 않고 사용 가능한 주제를 선택. 없으면 가장 오래된 것 재사용."""
     import random
 
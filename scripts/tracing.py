@@ -0,0 +1,174 @@
+"""
+실행 추적 모듈
+단계/하위 작업(Gemini 호출, TTS 시도, 이미지 요청, 자막 래스터, 합성/인코딩, 업로드 청크)을
+span으로 감싸 벽시계 시간, CPU 시간, 최대 메모리(RSS)를 기록하고
+Chrome trace-event 형식(logs/trace_{timestamp}.json)으로 저장합니다.
+- chrome://tracing 또는 https://ui.perfetto.dev 에서 열면 스레드별 타임라인으로 표시
+- cpu_ms: span을 실행한 스레드의 CPU 시간
+- cpu_children_ms: 그동안 종료된 자식 프로세스(ffmpeg 등)의 CPU 시간 (프로세스 전체 기준)
+- rss_peak_mb: span 동안 샘플링한 프로세스 RSS 최댓값 (psutil 필요, 없으면 생략)
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _children_cpu():
+    """종료된 자식 프로세스의 누적 CPU 시간(초)"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Tracer:
+    """span 기록기 (스레드 안전, 최근 max_events개만 보관)"""
+
+    def __init__(self, enabled=True, sample_interval=0.1, max_events=200000):
+        self.enabled = enabled
+        self.sample_interval = sample_interval
+        self._events = deque(maxlen=max_events)
+        self._thread_names = {}  # tid → 스레드 이름 (메타데이터 이벤트용)
+        self._open = {}  # 진행 중인 span → 관측한 최대 RSS
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._process = psutil.Process() if psutil else None
+
+    @contextmanager
+    def span(self, name, cat="", **args):
+        """with tracer.span('gemini.generate_content', cat='api'): ... (예외도 기록 후 그대로 전파)"""
+        if not self.enabled:
+            yield
+            return
+        token = object()
+        start = time.time()
+        start_cpu = time.thread_time()
+        start_children = _children_cpu()
+        with self._lock:
+            self._open[token] = self._rss()
+            self._start_sampler()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.time()
+            rss = self._rss()
+            with self._lock:
+                peak = max(self._open.pop(token), rss)
+            event_args = dict(args)
+            event_args['cpu_ms'] = round((time.thread_time() - start_cpu) * 1000, 1)
+            children = _children_cpu() - start_children
+            if children > 0:
+                event_args['cpu_children_ms'] = round(children * 1000, 1)
+            if peak:
+                event_args['rss_peak_mb'] = round(peak / 1024 / 1024, 1)
+            if error:
+                event_args['error'] = error
+            self._append({
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': int(start * 1e6),
+                'dur': int((end - start) * 1e6),
+                'args': event_args,
+            })
+
+    def export(self, path, since=None):
+        """since(time.time()) 이후 시작한 이벤트를 Chrome trace 파일로 저장 (저장 경로 반환)"""
+        since_us = int(since * 1e6) if since else 0
+        pid = os.getpid()
+        with self._lock:
+            events = [dict(e, pid=pid) for e in self._events if e['ts'] >= since_us]
+            names = dict(self._thread_names)
+        tids = {e['tid'] for e in events}
+        meta = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': names[tid]}}
+                for tid in tids if tid in names]
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{pid}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': meta + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def _append(self, event):
+        thread = threading.current_thread()
+        event['tid'] = thread.ident
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._events.append(event)
+
+    def _rss(self):
+        """현재 프로세스 RSS 바이트 (psutil 없으면 0)"""
+        if self._process is None:
+            return 0
+        try:
+            return self._process.memory_info().rss
+        except Exception:
+            return 0
+
+    def _start_sampler(self):
+        """진행 중인 span이 있는 동안 RSS를 주기적으로 샘플링 (lock 보유 상태에서 호출)"""
+        if self._process is None or self._sampler is not None:
+            return
+        self._sampler = threading.Thread(target=self._sample_loop, name='trace-sampler', daemon=True)
+        self._sampler.start()
+
+    def _sample_loop(self):
+        while True:
+            time.sleep(self.sample_interval)
+            rss = self._rss()
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                for token, peak in self._open.items():
+                    if rss > peak:
+                        self._open[token] = rss
+            # 메모리 사용량 그래프 (Chrome trace 카운터 이벤트)
+            self._append({'name': 'rss', 'ph': 'C', 'ts': int(time.time() * 1e6),
+                          'args': {'rss_mb': round(rss / 1024 / 1024, 1)}})
+
+
+_tracer = Tracer()
+
+
+def configure_tracing(config=None):
+    """config.json의 tracing 설정 적용
+
+    설정 예시:
+        "tracing": {"enabled": true, "sample_interval_ms": 100, "max_events": 200000}
+    """
+    global _tracer
+    config = config or {}
+    _tracer = Tracer(
+        enabled=config.get('enabled', True),
+        sample_interval=config.get('sample_interval_ms', 100) / 1000.0,
+        max_events=config.get('max_events', 200000),
+    )
+
+
+def get_tracer():
+    """프로세스 공용 추적기 반환"""
+    return _tracer
+
+
+def span(name, cat="", **args):
+    """공용 추적기의 span (with span('tts.attempt', cat='tts', attempt=1): ...)"""
+    return _tracer.span(name, cat, **args)
@@ -0,0 +1,86 @@
+"""
+TTS 캐시 모듈
+합성 단위(대본 전체, 청크 또는 문장)의 MP3 조각과 SentenceBoundary 타이밍을
+(정규화 텍스트, 음성, 속도) 해시로 저장해 같은 단위는 Edge TTS를 다시 호출하지 않고 재사용합니다.
+- 저장: cache/tts/{sha256}.mp3 + {sha256}.json (조각 길이, 조각 기준 상대 타이밍)
+"""
+
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+
+
+def normalize_text(text):
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class TTSCache:
+    """합성 단위별 TTS 조각 캐시"""
+
+    def __init__(self, cache_dir="cache/tts"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, voice, rate):
+        raw = json.dumps([normalize_text(text), voice, rate], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, text, voice, rate):
+        """(MP3 바이트, 타이밍 목록, 길이 초) 반환 (없거나 손상되면 None)"""
+        key = self.make_key(text, voice, rate)
+        audio_path, meta_path = self._paths(key)
+        if not (os.path.exists(audio_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(audio_path, 'rb') as f:
+                audio = f.read()
+        except Exception:
+            return None
+        if len(audio) != meta.get('size'):
+            return None
+        return audio, meta['sentence_timings'], meta['duration']
+
+    def put(self, text, voice, rate, audio, sentence_timings, duration):
+        """조각 저장 (MP3 먼저, 메타데이터는 마지막에 기록 → 메타가 있으면 완전한 항목)"""
+        key = self.make_key(text, voice, rate)
+        audio_path, meta_path = self._paths(key)
+        meta = {
+            'text': normalize_text(text),
+            'voice': voice,
+            'rate': rate,
+            'size': len(audio),
+            'duration': duration,
+            'sentence_timings': sentence_timings,
+        }
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(audio_path + suffix, 'wb') as f:
+                f.write(audio)
+            os.replace(audio_path + suffix, audio_path)
+            with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            print(f"   ⚠️ TTS 캐시 저장 실패: {e}")
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.mp3", f"{base}.json"
+
+
+def get_tts_cache(config=None):
+    """config.json의 cache.tts 설정으로 캐시 생성 (enabled가 false면 None)
+
+    설정 예시:
+        "cache": {"tts": {"enabled": true, "dir": "cache/tts", "sentence_level": false}}
+    """
+    config = config or {}
+    if not config.get('enabled', False):
+        return None
+    return TTSCache(config.get('dir', 'cache/tts'))
@@ -4,11 +4,16 @@ Edge TTS를 사용하여 대본을 자연스러운 음성으로 변환합니다.
 """
 
 import json
+import re
 import asyncio
 import edge_tts
-from pydub import AudioSegment
 import os
 import time
+from circuit_breaker import configure_breakers, get_breaker
+from tts_cache import get_tts_cache
+from audio_utils import get_audio_duration
+from rate_limit import get_limiter
+from tracing import span
 
 
 class TTSGenerator:
@@ -20,16 +25,43 @@ class TTSGenerator:
         self.speed = self.config['tts'].get('speed', 1.0)
         # 한국어 여성 음성 (자연스럽고 인기 있는 목소리)
         self.voice = self.config['tts'].get('voice', 'ko-KR-SunHiNeural')
+        # Edge TTS는 대체 수단이 없으므로 차단하지 않고 성공률/지연만 기록
+        configure_breakers(self.config.get('circuit_breaker'))
+
+        # 문장 청크 병렬 합성 (긴 대본만, 청크별 개별 재시도)
+        chunk_config = self.config['tts'].get('chunked', {})
+        self.chunked = chunk_config.get('enabled', False)
+        self.chunk_min_chars = chunk_config.get('min_chars', 1500)
+        self.chunk_chars = chunk_config.get('chunk_chars', 800)
+        self.chunk_concurrency = max(1, chunk_config.get('concurrency', 4))
+
+        # TTS 캐시: 합성 단위(대본 전체 또는 청크)별로 재사용
+        # sentence_level을 켠 경우에만 문장 단위로 합성 (문장 재사용률↑, 요청 수↑, 문장 경계 운율 단절)
+        cache_config = self.config.get('cache', {}).get('tts')
+        self.tts_cache = get_tts_cache(cache_config)
+        self.cache_sentences = bool(self.tts_cache) and (cache_config or {}).get('sentence_level', False)
+
+    def _rate_string(self):
+        """Edge TTS 속도 문자열 (예: 1.2 → "+20%")"""
+        return f"+{int((self.speed - 1) * 100)}%" if self.speed >= 1 else f"{int((self.speed - 1) * 100)}%"
     
-    async def _generate_speech_with_timing(self, text, output_path):
-        """Edge TTS로 음성 생성 + 타이밍 정보 추출 (비동기)"""
+    async def _generate_speech_with_timing(self, text, output_path, on_timing=None, on_restart=None):
+        """Edge TTS로 음성 생성 + 타이밍 정보 추출 (비동기)
+
+        on_timing: SentenceBoundary가 도착할 때마다 호출되는 콜백 (보정 전 타이밍)
+        on_restart: 재시도로 처음부터 다시 합성하기 직전에 호출 (이미 전달한 타이밍 무효화)
+        """
         # 속도 조절 문자열
-        rate = f"+{int((self.speed - 1) * 100)}%" if self.speed >= 1 else f"{int((self.speed - 1) * 100)}%"
+        rate = self._rate_string()
         
         max_retries = 5
         retry_delay = 2  # 초
         
+        breaker = get_breaker('edge-tts')
         for attempt in range(max_retries):
+            if attempt > 0:
+                self._notify_restart(on_restart)
+            started = time.time()
             try:
                 communicate = edge_tts.Communicate(text, self.voice, rate=rate)
                 
@@ -44,16 +76,20 @@ class TTSGenerator:
                             # SentenceBoundary: offset=시작시간, duration=지속시간 (100ns 단위)
                             start = chunk["offset"] / 10000000  # 100ns → 초
                             duration = chunk["duration"] / 10000000
-                            sentence_timings.append({
+                            timing = {
                                 "text": chunk["text"],
                                 "start": start,
                                 "end": start + duration,
                                 "duration": duration
-                            })
+                            }
+                            sentence_timings.append(timing)
+                            self._publish_timing(on_timing, dict(timing))
                 
+                breaker.record_success(time.time() - started)
                 return sentence_timings
                 
             except Exception as e:
+                breaker.record_failure(time.time() - started)
                 if "503" in str(e) or "Invalid response status" in str(e):
                     if attempt < max_retries - 1:
                         wait_time = retry_delay * (2 ** attempt)  # 지수 백오프
@@ -69,18 +105,22 @@ class TTSGenerator:
     async def _generate_speech(self, text, output_path):
         """Edge TTS로 음성 생성 (비동기)"""
         # 속도 조절 문자열
-        rate = f"+{int((self.speed - 1) * 100)}%" if self.speed >= 1 else f"{int((self.speed - 1) * 100)}%"
+        rate = self._rate_string()
         
         max_retries = 5
         retry_delay = 2
         
+        breaker = get_breaker('edge-tts')
         for attempt in range(max_retries):
+            started = time.time()
             try:
                 communicate = edge_tts.Communicate(text, self.voice, rate=rate)
                 await communicate.save(output_path)
+                breaker.record_success(time.time() - started)
                 return
                 
             except Exception as e:
+                breaker.record_failure(time.time() - started)
                 if "503" in str(e) or "Invalid response status" in str(e):
                     if attempt < max_retries - 1:
                         wait_time = retry_delay * (2 ** attempt)
@@ -93,32 +133,167 @@ class TTSGenerator:
                 else:
                     raise
     
-    def text_to_speech(self, text, output_path):
-        """텍스트를 음성으로 변환합니다."""
+    def _split_sentences(self, text):
+        """문장 부호/줄바꿈 기준 문장 분할"""
+        return [s.strip() for s in re.split(r'(?<=[.!?。])\s+|\n+', text) if s.strip()]
+
+    def _split_into_chunks(self, text):
+        """문장 경계에서 대본을 chunk_chars 내외의 청크로 분할"""
+        chunks = []
+        current = ""
+        for sentence in self._split_sentences(text):
+            if current and len(current) + 1 + len(sentence) > self.chunk_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _notify_restart(self, on_restart):
+        """재합성 알림 콜백 호출 (콜백 오류가 합성을 중단시키지 않도록 경고만)"""
+        if on_restart is None:
+            return
+        try:
+            on_restart()
+        except Exception as e:
+            print(f"   ⚠️ 재합성 콜백 오류: {e}")
+
+    def _publish_timing(self, on_timing, timing):
+        """스트리밍 콜백 호출 (콜백 오류가 합성을 중단시키지 않도록 경고만)"""
+        if on_timing is None:
+            return
+        try:
+            on_timing(timing)
+        except Exception as e:
+            print(f"   ⚠️ 타이밍 콜백 오류: {e}")
+
+    async def _generate_speech_units(self, units, output_path, on_timing=None, workspace=None):
+        """단위(청크 또는 문장)별 음성을 동시 합성(세마포어 제한) 후 MP3 이어붙이기 + 타이밍 오프셋 이동
+
+        TTS 캐시가 있으면 캐시에 있는 단위는 요청하지 않고, 새로 합성한 단위는 캐시에 저장합니다.
+        on_timing이 있으면 앞 단위부터 연속으로 준비된 구간의 타이밍을 전체 오프셋으로 바로 전달합니다.
+        workspace가 있으면 단위별 조각 파일을 작업 디렉토리에 만듭니다.
+        """
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        rate = self._rate_string()
+        if workspace:
+            part_paths = [workspace.temp_path(f"tts_part{i:03d}", ".mp3") for i in range(len(units))]
+        else:
+            part_paths = [f"{output_path}.part{i:03d}.mp3" for i in range(len(units))]
+        fragments = [None] * len(units)  # (MP3 바이트, 단위 기준 타이밍, 길이)
+
+        if self.tts_cache:
+            for i, unit in enumerate(units):
+                fragments[i] = self.tts_cache.get(unit, self.voice, rate)
+            hits = sum(1 for fragment in fragments if fragment)
+            print(f"   ♻️ TTS 캐시: {hits}/{len(units)}개 단위 재사용")
+
+        published = {'next': 0, 'offset': 0.0}
+
+        def publish_ready():
+            # 완료 순서는 뒤섞이므로 앞에서부터 연속으로 준비된 단위만 전달 (오프셋 확정)
+            while published['next'] < len(units) and fragments[published['next']] is not None:
+                _, timings, duration = fragments[published['next']]
+                for t in timings:
+                    self._publish_timing(on_timing, dict(
+                        t, start=t['start'] + published['offset'], end=t['end'] + published['offset']
+                    ))
+                published['offset'] += duration
+                published['next'] += 1
+
+        async def synthesize(i):
+            async with semaphore:
+                # _generate_speech_with_timing 내부 재시도 → 실패한 단위만 다시 요청
+                timings = await self._generate_speech_with_timing(units[i], part_paths[i])
+            with open(part_paths[i], 'rb') as f:
+                audio = f.read()
+            duration = get_audio_duration(part_paths[i])
+            self._fit_timings(timings, duration)
+            fragments[i] = (audio, timings, duration)
+            if self.tts_cache:
+                self.tts_cache.put(units[i], self.voice, rate, audio, timings, duration)
+            if on_timing:
+                publish_ready()
+
+        try:
+            if on_timing:
+                publish_ready()  # 캐시 적중 구간 먼저 전달
+            await asyncio.gather(*(synthesize(i) for i in range(len(units)) if fragments[i] is None))
+
+            # Edge TTS MP3는 헤더 없는 동일 포맷 프레임열이므로 바이트 단위로 이어붙임
+            sentence_timings = []
+            offset = 0.0
+            with open(output_path, 'wb') as out:
+                for audio, timings, duration in fragments:
+                    out.write(audio)
+                    for t in timings:
+                        sentence_timings.append(dict(
+                            t, start=t['start'] + offset, end=t['end'] + offset
+                        ))
+                    offset += duration
+            return sentence_timings
+        finally:
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+    def _fit_timings(self, sentence_timings, duration, verbose=False):
+        """SentenceBoundary 오프셋을 실제 오디오 길이에 맞게 비례 보정 (리스트 직접 수정)"""
+        if not sentence_timings or duration <= 0:
+            return
+        last_end = max(t['end'] for t in sentence_timings)
+        if last_end > 0 and abs(last_end - duration) > 0.1:
+            scale = duration / last_end
+            for t in sentence_timings:
+                t['start'] *= scale
+                t['end'] *= scale
+                t['duration'] = t['end'] - t['start']
+            if verbose:
+                print(f"   ⏱️ 타이밍 보정 적용: scale={scale:.4f} (오차 {last_end - duration:.2f}초)")
+
+    def text_to_speech(self, text, output_path, on_timing=None, workspace=None, on_restart=None):
+        """텍스트를 음성으로 변환합니다.
+
+        on_timing: 문장 타이밍이 준비되는 즉시 호출되는 콜백 (자막/장면 선작업용).
+                   전달되는 값은 길이 보정 전 근사치이며, 최종 타이밍은 반환값을 사용합니다.
+        on_restart: 실패 후 처음부터 다시 합성하기 직전에 호출되는 콜백 (이후 on_timing은 첫 문장부터 다시 전달)
+        workspace: 작업별 JobWorkspace (청크/문장 조각 임시 파일 위치)
+        """
         max_retries = 3
         
         for attempt in range(max_retries):
+            if attempt > 0:
+                self._notify_restart(on_restart)
             try:
                 print(f"🎤 TTS 생성 중: {len(text)}자 (음성: {self.voice})")
                 
                 # Edge TTS로 음성 생성 + 타이밍 정보 (SentenceBoundary)
-                sentence_timings = asyncio.run(self._generate_speech_with_timing(text, output_path))
+                if self.cache_sentences:
+                    # 문장 단위 캐시 모드 (명시적으로 켠 경우만): 캐시 미스 문장만 요청
+                    units = self._split_sentences(text)
+                elif self.chunked and len(text) >= self.chunk_min_chars:
+                    units = self._split_into_chunks(text)
+                    print(f"   🧩 문장 청크 {len(units)}개 병렬 합성 (동시 {self.chunk_concurrency}개)")
+                elif self.tts_cache:
+                    units = [text]  # 대본 전체를 한 단위로 캐시
+                else:
+                    units = []
+                # 동시 작업 시 Edge TTS 동시 합성 작업 수 제한 (작업 내부 청크 동시성은 chunk_concurrency)
+                with get_limiter('edge-tts'), span('tts.attempt', cat='tts', attempt=attempt + 1,
+                                                   chars=len(text), units=len(units)):
+                    if len(units) > 1 or (units and self.tts_cache):
+                        sentence_timings = asyncio.run(self._generate_speech_units(units, output_path, on_timing, workspace))
+                    else:
+                        sentence_timings = asyncio.run(self._generate_speech_with_timing(text, output_path, on_timing, on_restart))
                 
-                # 음성 길이 확인
-                audio = AudioSegment.from_mp3(output_path)
-                duration = len(audio) / 1000.0  # 초 단위
+                # 음성 길이 확인 (MP3 프레임 헤더만 읽음 → 전체 PCM 디코딩 없음)
+                duration = get_audio_duration(output_path)
                 
                 # 타이밍 보정: Edge TTS SentenceBoundary 오프셋이 실제 오디오 길이와
                 # 미세하게 어긋나는 문제 보정 (긴 텍스트일수록 누적 오차 커짐)
-                if sentence_timings and duration > 0:
-                    last_end = max(t['end'] for t in sentence_timings)
-                    if last_end > 0 and abs(last_end - duration) > 0.1:
-                        scale = duration / last_end
-                        for t in sentence_timings:
-                            t['start'] *= scale
-                            t['end'] *= scale
-                            t['duration'] = t['end'] - t['start']
-                        print(f"   ⏱️ 타이밍 보정 적용: scale={scale:.4f} (오차 {last_end - duration:.2f}초)")
+                self._fit_timings(sentence_timings, duration, verbose=True)
                 
                 print(f"✅ TTS 생성 완료: {output_path}")
                 print(f"   음성 길이: {duration:.1f}초")
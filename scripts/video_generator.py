@@ -6,11 +6,11 @@ AI 이미지 생성: HuggingFace FLUX.1-schnell (1순위) → Together AI (2순
 
 import json
 import os
-import requests
 import sys
 import time
 import io
-from contextlib import redirect_stdout
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 try:
     from moviepy import (
         ColorClip, AudioFileClip, CompositeVideoClip,
@@ -22,12 +22,55 @@ except ImportError:
         ColorClip, AudioFileClip, CompositeVideoClip,
         TextClip, concatenate_videoclips, ImageClip, VideoClip
     )
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import proglog
+from PIL import Image, ImageDraw, ImageFilter
 import numpy as np
+from ffmpeg_renderer import create_renderer
+from subtitle_cache import get_subtitle_cache
+from font_registry import find_korean_font, get_font, wrap_words, wrap_chars
+from text_effects import draw_outlined_text
+from image_cache import ImageCache, get_image_cache
+from circuit_breaker import configure_breakers, get_breaker
+from http_client import get_http_session
+from audio_utils import probe_mp3_duration
+from asset_prefetch import AssetPrefetcher
+from rate_limit import get_limiter
+from tracing import span
+
+
+class _OneLineProgressLogger(proglog.ProgressBarLogger):
+    """MoviePy 진행 로그를 한 줄로 표시하는 proglog 로거
+
+    sys.stdout을 바꾸지 않으므로 동시에 실행 중인 다른 작업의 출력이 섞이거나 사라지지 않습니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._last_percent = {}
+
+    def callback(self, **changes):
+        message = changes.get('message')
+        if message:
+            print(f"\n{message}" if self._last_percent else message)
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if attr != 'index':
+            return
+        total = self.bars[bar].get('total') or 0
+        percent = int(value * 100 / total) if total else 0
+        if percent != self._last_percent.get(bar):
+            # 1% 단위로만 갱신 (프레임마다 쓰지 않음)
+            self._last_percent[bar] = percent
+            sys.stdout.write(f"\r   {bar}: {percent:3d}% ({value}/{total})")
+            sys.stdout.flush()
+
+    def close(self):
+        if self._last_percent:
+            print()
 
 
 class VideoGenerator:
-    def __init__(self, config_path="config/config.json"):
+    def __init__(self, config_path="config/config.json", http_session=None):
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
 
@@ -40,14 +83,35 @@ class VideoGenerator:
         self.bg_color = shorts_config['background_color']
         self.text_color = shorts_config['text_color']
         self.accent_color = shorts_config['accent_color']
+        # 렌더 백엔드: "moviepy" (프레임 단위 Python 합성) | "ffmpeg" (filtergraph 네이티브 합성)
+        #             | "changepoint" (화면이 바뀔 때만 프레임 합성)
+        self.render_backend = shorts_config.get('render_backend', 'moviepy')
+
+        # 공용 HTTP 세션 (호스트별 커넥션 풀 + keep-alive)
+        self.http = http_session or get_http_session(self.config.get('http'))
 
         # AI 이미지 생성 설정
         self.hf_token = self.config.get('huggingface_token', '')
         self.together_api_key = self.config.get('together_api_key', '')
         self.pexels_api_key = self.config.get('pexels_api_key', '')
+        # 제공자별 회로 차단기 (장애 시 타임아웃 대기 없이 다음 단계로)
+        configure_breakers(self.config.get('circuit_breaker'))
+
+        # 헤지 요청: HF 시작 후 hedge_delay_seconds 안에 응답이 없으면 Together도 시작, 먼저 성공한 쪽 사용
+        hedge_config = shorts_config.get('hedged_images', {})
+        self.hedged_images = hedge_config.get('enabled', False)
+        self.hedge_delay = hedge_config.get('hedge_delay_seconds', 8)
 
         # 한글 폰트 찾기
-        self.font_path = self._find_korean_font()
+        self.font_path = find_korean_font()
+
+        # 자막 래스터 캐시 (같은 텍스트/스타일 자막은 한 번만 그림)
+        self.subtitle_cache = get_subtitle_cache(self.config.get('cache', {}).get('subtitles'))
+
+        # 작업(스레드)별 상태: 동시 작업이 같은 생성기를 공유해도 썸네일 경로가 섞이지 않음
+        self._local = threading.local()
+        # AI 이미지 캐시 (같은 프롬프트/크기는 API 재호출 없이 재사용)
+        self.image_cache = get_image_cache(self.config.get('cache', {}).get('images'))
 
     # ──────────────────────────────────────────────────
     # AI 이미지 생성 (3-tier 폴백)
@@ -68,16 +132,25 @@ class VideoGenerator:
             "parameters": {"width": 768, "height": 1344},
         }
 
+        breaker = get_breaker('huggingface')
         for attempt in range(retry_count):
+            if not breaker.allow_request():
+                print("   ⏭️ HF 회로 차단 중 → 다음 단계")
+                return None
+            started = time.time()
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=60)
+                resp = self.http.post(url, headers=headers, json=payload, timeout=60)
                 if resp.status_code == 200 and resp.headers.get('content-type', '').startswith('image'):
                     img = Image.open(io.BytesIO(resp.content))
                     if img.size[0] > 100:
+                        breaker.record_success(time.time() - started)
+                        self._cache_image_bytes('huggingface', prompt, resp.content)
                         return img
+                breaker.record_failure(time.time() - started)
                 print(f"   ⚠️ HF 응답 코드 {resp.status_code}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
             except Exception as e:
+                breaker.record_failure(time.time() - started)
                 print(f"   ⚠️ HF 오류: {str(e)[:80]}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
         return None
@@ -103,9 +176,14 @@ class VideoGenerator:
             "n": 1,
         }
 
+        breaker = get_breaker('together')
         for attempt in range(retry_count):
+            if not breaker.allow_request():
+                print("   ⏭️ Together 회로 차단 중 → 다음 단계")
+                return None
+            started = time.time()
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=60)
+                resp = self.http.post(url, headers=headers, json=payload, timeout=60)
                 if resp.status_code == 200:
                     data = resp.json()
                     img_data = data.get('data', [{}])[0]
@@ -113,40 +191,122 @@ class VideoGenerator:
                         import base64
                         img_bytes = base64.b64decode(img_data['b64_json'])
                         img = Image.open(io.BytesIO(img_bytes))
+                        breaker.record_success(time.time() - started)
+                        self._cache_image_bytes('together', prompt, img_bytes)
                         return img
                     elif 'url' in img_data:
-                        img_resp = requests.get(img_data['url'], timeout=30)
+                        img_resp = self.http.get(img_data['url'], timeout=30)
                         if img_resp.status_code == 200:
                             img = Image.open(io.BytesIO(img_resp.content))
+                            breaker.record_success(time.time() - started)
+                            self._cache_image_bytes('together', prompt, img_resp.content)
                             return img
+                breaker.record_failure(time.time() - started)
                 print(f"   ⚠️ Together 응답 코드 {resp.status_code}: {resp.text[:200]}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
             except Exception as e:
+                breaker.record_failure(time.time() - started)
                 print(f"   ⚠️ Together 오류: {str(e)[:80]}, 재시도 {attempt+1}/{retry_count}")
                 time.sleep(3)
         return None
 
+    def _image_cache_key(self, provider, prompt):
+        """AI 이미지 캐시 키 (두 제공자 모두 FLUX.1-schnell, 9:16 768x1344)"""
+        return ImageCache.make_key(provider, 'FLUX.1-schnell', prompt, 768, 1344)
+
+    def _get_cached_image(self, provider, prompt):
+        """캐시된 AI 이미지 반환 (캐시 비활성/미스 시 None)"""
+        if not self.image_cache:
+            return None
+        return self.image_cache.get_image(self._image_cache_key(provider, prompt))
+
+    def _cache_image_bytes(self, provider, prompt, data):
+        """AI 응답 원본 바이트를 캐시에 저장"""
+        if self.image_cache:
+            self.image_cache.put(self._image_cache_key(provider, prompt), data, provider=provider)
+
+    def _generate_ai_image_hedged(self, prompt, section_name):
+        """HF 요청 후 hedge_delay 동안 응답이 없으면 Together도 시작, 먼저 도착한 유효 이미지 반환
+
+        늦게 끝난 쪽은 기다리지 않고 버립니다 (성공 시 이미지 캐시에는 저장됨).
+        """
+        providers = [
+            ('HuggingFace', self.generate_ai_image_huggingface),
+            ('Together AI', self.generate_ai_image_together),
+        ]
+        pool = ThreadPoolExecutor(max_workers=len(providers))
+        futures = {}
+        try:
+            print(f"   🎨 [{section_name}] HuggingFace 이미지 생성 중 (헤지 {self.hedge_delay}초)...")
+            pending = set()
+            for i, (name, generate) in enumerate(providers):
+                if i > 0:
+                    # 헤지 지연: 앞선 요청이 먼저 성공하면 다음 제공자는 시작하지 않음
+                    done, pending = wait(pending, timeout=self.hedge_delay, return_when=FIRST_COMPLETED)
+                    img = self._first_valid_image(done, futures, section_name)
+                    if img:
+                        return img
+                    print(f"   🎨 [{section_name}] {name} 헤지 요청 시작...")
+                future = pool.submit(generate, prompt)
+                futures[future] = name
+                pending.add(future)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                img = self._first_valid_image(done, futures, section_name)
+                if img:
+                    return img
+            return None
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _first_valid_image(self, done, futures, section_name):
+        """완료된 요청 중 유효한 이미지 반환 (없으면 None)"""
+        for future in done:
+            try:
+                img = future.result()
+            except Exception as e:
+                print(f"   ⚠️ [{section_name}] {futures[future]} 오류: {str(e)[:80]}")
+                continue
+            if img:
+                print(f"   ✅ [{section_name}] {futures[future]} 성공")
+                return img
+        return None
+
     def generate_ai_image(self, prompt, section_name="image"):
         """3-tier 폴백: HuggingFace → Together AI → Pexels"""
         # 프롬프트에서 --ar 9:16 등 제거 (API는 width/height 파라미터 사용)
         import re
         clean_prompt = re.sub(r'--\w+\s+\S+', '', prompt).strip()
 
-        # 1차: HuggingFace FLUX.1-schnell
-        print(f"   🎨 [{section_name}] HuggingFace 이미지 생성 중...")
-        img = self.generate_ai_image_huggingface(clean_prompt)
-        if img:
-            print(f"   ✅ [{section_name}] HuggingFace 성공")
-            return img
-
-        # 2차: Together AI
-        if self.together_api_key:
-            print(f"   🎨 [{section_name}] Together AI 폴백...")
-            img = self.generate_ai_image_together(clean_prompt)
+        # 0차: 이미지 캐시 (이전 실행에서 같은 프롬프트로 생성한 이미지)
+        for provider in ('huggingface', 'together'):
+            img = self._get_cached_image(provider, clean_prompt)
             if img:
-                print(f"   ✅ [{section_name}] Together AI 성공")
+                print(f"   ♻️ [{section_name}] 캐시된 이미지 사용 ({provider})")
                 return img
 
+        if self.hedged_images and self.hf_token and self.together_api_key:
+            # 1·2차 동시: HuggingFace ↔ Together 헤지 요청
+            img = self._generate_ai_image_hedged(clean_prompt, section_name)
+            if img:
+                return img
+        else:
+            # 1차: HuggingFace FLUX.1-schnell
+            print(f"   🎨 [{section_name}] HuggingFace 이미지 생성 중...")
+            img = self.generate_ai_image_huggingface(clean_prompt)
+            if img:
+                print(f"   ✅ [{section_name}] HuggingFace 성공")
+                return img
+
+            # 2차: Together AI
+            if self.together_api_key:
+                print(f"   🎨 [{section_name}] Together AI 폴백...")
+                img = self.generate_ai_image_together(clean_prompt)
+                if img:
+                    print(f"   ✅ [{section_name}] Together AI 성공")
+                    return img
+
         # 3차: Pexels 키워드 검색
         print(f"   📷 [{section_name}] Pexels 폴백...")
         # 프롬프트에서 영어 키워드 추출
@@ -191,33 +351,6 @@ class VideoGenerator:
             print(f"❌ AI 배경 이미지 생성 실패: {e}")
             return None
     
-    def _find_korean_font(self):
-        """시스템에서 한글 폰트 찾기 (GitHub Actions 지원)"""
-        # macOS 폰트 경로들
-        font_paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
-            "/Library/Fonts/AppleGothic.ttf",
-            "/System/Library/Fonts/Helvetica.ttc",
-            # Linux 폰트 경로들 (GitHub Actions)
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Bold.ttc",
-            "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
-            "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-            # 추가 Linux 경로
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-        ]
-        
-        for path in font_paths:
-            if os.path.exists(path):
-                print(f"✅ 한글 폰트 발견: {path}")
-                return path
-        
-        print("⚠️ 한글 폰트를 찾지 못했습니다. 기본 폰트 사용")
-        return None
-    
     def extract_keywords_from_script(self, script_text):
         """대본에서 키워드 추출 - 다양성 증가"""
         import re
@@ -408,9 +541,9 @@ class VideoGenerator:
                     per_page = max(5, count - len(images) + 2)
                     
                     url = f"https://api.pexels.com/v1/search?query={query}&per_page={per_page}&page={page}&orientation=portrait"
-                    response = requests.get(url, headers=headers, timeout=10)
+                    response = self._pexels_search(url, headers)
                     
-                    if response.status_code == 200:
+                    if response is not None and response.status_code == 200:
                         data = response.json()
                         photos = data.get('photos', [])
                         
@@ -422,7 +555,7 @@ class VideoGenerator:
                                     break
                                 try:
                                     img_url = photo['src']['large2x']
-                                    img_response = requests.get(img_url, timeout=10)
+                                    img_response = self.http.get(img_url, timeout=10)
                                     if img_response.status_code == 200:
                                         from io import BytesIO
                                         img = Image.open(BytesIO(img_response.content))
@@ -472,9 +605,9 @@ class VideoGenerator:
                     print(f"📷 추가 배경 검색 ({query}) - page {page}...")
                     
                     url = f"https://api.pexels.com/v1/search?query={query}&per_page=5&page={page}&orientation=portrait"
-                    response = requests.get(url, headers=headers, timeout=10)
+                    response = self._pexels_search(url, headers)
                     
-                    if response.status_code == 200:
+                    if response is not None and response.status_code == 200:
                         data = response.json()
                         photos = data.get('photos', [])
                         
@@ -485,7 +618,7 @@ class VideoGenerator:
                                     break
                                 try:
                                     img_url = photo['src']['large2x']
-                                    img_response = requests.get(img_url, timeout=10)
+                                    img_response = self.http.get(img_url, timeout=10)
                                     if img_response.status_code == 200:
                                         from io import BytesIO
                                         img = Image.open(BytesIO(img_response.content))
@@ -503,9 +636,9 @@ class VideoGenerator:
                 print("📷 인기 이미지에서 추가 검색...")
                 page = random.randint(1, 50)
                 url = f"https://api.pexels.com/v1/curated?per_page={count - len(images) + 3}&page={page}&orientation=portrait"
-                response = requests.get(url, headers=headers, timeout=10)
+                response = self._pexels_search(url, headers)
                 
-                if response.status_code == 200:
+                if response is not None and response.status_code == 200:
                     data = response.json()
                     photos = data.get('photos', [])
                     
@@ -516,7 +649,7 @@ class VideoGenerator:
                                 break
                             try:
                                 img_url = photo['src']['large2x']
-                                img_response = requests.get(img_url, timeout=10)
+                                img_response = self.http.get(img_url, timeout=10)
                                 if img_response.status_code == 200:
                                     from io import BytesIO
                                     img = Image.open(BytesIO(img_response.content))
@@ -530,6 +663,24 @@ class VideoGenerator:
         
         return images
     
+    def _pexels_search(self, url, headers):
+        """Pexels 검색 요청 (회로 차단 중이면 None, 결과를 차단기에 기록)"""
+        breaker = get_breaker('pexels')
+        if not breaker.allow_request():
+            print("   ⏭️ Pexels 회로 차단 중 → 건너뜀")
+            return None
+        started = time.time()
+        try:
+            response = self.http.get(url, headers=headers, timeout=10)
+        except Exception:
+            breaker.record_failure(time.time() - started)
+            raise
+        if response.status_code == 200:
+            breaker.record_success(time.time() - started)
+        else:
+            breaker.record_failure(time.time() - started)
+        return response
+
     def _resize_and_crop(self, img):
         """이미지를 세로 형식으로 크롭 및 리사이즈"""
         target_ratio = self.height / self.width
@@ -588,7 +739,18 @@ class VideoGenerator:
                 duration=duration
             ).with_fps(self.fps)
         
-        clips = []
+        clips = [self._layer_to_clip(layer)
+                 for layer in self._build_background_layers(images, duration, section_times)]
+        return CompositeVideoClip(clips, size=(self.width, self.height)).with_fps(self.fps)
+    
+    def _build_background_layers(self, images, duration, section_times=None):
+        """배경 이미지 배치 계산 → [{'image', 'start', 'end'}] (렌더 백엔드 공통)"""
+        if not images:
+            # 이미지가 없으면 단색 배경 (ColorClip과 동일한 색)
+            return [{'image': Image.new('RGB', (self.width, self.height), (26, 26, 46)),
+                     'start': 0, 'end': duration}]
+        
+        layers = []
         
         # 섹션 타이밍이 있으면 섹션별로 이미지 배치
         if section_times and len(section_times) == len(images) + 1:
@@ -598,84 +760,38 @@ class VideoGenerator:
                 end = section_times[i + 1]
                 dur = max(0.1, end - start)  # 최소 0.1초
                 
-                img_array = np.array(img)
-                clip = ImageClip(img_array).with_duration(dur)
-                clip = clip.with_start(start)
-                clips.append(clip)
+                layers.append({'image': img, 'start': start, 'end': start + dur})
                 print(f"      이미지 {i+1}: {start:.1f}s ~ {end:.1f}s ({dur:.1f}s)")
         else:
             # 균등 분배 (폴백)
             time_per_image = duration / len(images)
             for i, img in enumerate(images):
-                img_array = np.array(img)
-                clip = ImageClip(img_array).with_duration(time_per_image)
-                clip = clip.with_start(i * time_per_image)
-                clips.append(clip)
+                start = i * time_per_image
+                layers.append({'image': img, 'start': start, 'end': start + time_per_image})
         
-        return CompositeVideoClip(clips, size=(self.width, self.height)).with_fps(self.fps)
+        return layers
     
     def _create_subtitle_image(self, text, font_size=80, text_color=(255, 255, 255, 255), is_bold=False):
+        """자막 이미지 반환 (래스터 캐시 우선, 없으면 그려서 캐시에 저장)"""
+        if self.subtitle_cache is None:
+            with span('subtitle.raster', cat='render'):
+                return self._render_subtitle_image(text, font_size, text_color, is_bold)
+        key = self.subtitle_cache.make_key(
+            'shorts', text, self.font_path, font_size, text_color, is_bold, self.width
+        )
+        return self.subtitle_cache.get_or_render(
+            key, lambda: self._render_subtitle_image(text, font_size, text_color, is_bold)
+        )
+
+    def _render_subtitle_image(self, text, font_size=80, text_color=(255, 255, 255, 255), is_bold=False):
         """PIL로 자막 이미지 생성 (한글 지원, 단어 단위 줄바꿈, 색상/볼드 지원)"""
-        # 일단 임시 이미지로 텍스트 크기 측정
-        temp_img = Image.new('RGBA', (self.width, 400), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
-        
-        # 폰트 로드 (GitHub Actions 호환)
-        font = None
-        try:
-            if self.font_path:
-                font = ImageFont.truetype(self.font_path, font_size)
-            else:
-                # GitHub Actions에서 폴백
-                fallback_fonts = [
-                    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                ]
-                for font_path in fallback_fonts:
-                    if os.path.exists(font_path):
-                        try:
-                            font = ImageFont.truetype(font_path, font_size)
-                            break
-                        except:
-                            continue
-        except:
-            pass
-        
-        if not font:
-            font = ImageFont.load_default()
+        # 폰트 로드 (레지스트리 캐시, GitHub Actions 호환)
+        font = get_font(font_size, self.font_path)
         
         # 텍스트 줄바꿈 처리 - 단어 단위로 줄바꿈 (문자 단위 아님)
         # 최대 2줄이 기본이지만, 문장이 길면 3줄 이상까지 허용 (문장이 잘리지 않도록)
         max_width = self.width - 120
-        lines = []
-        current_line = ""
-        
-        # 공백 단위로 단어 분할 (띄어쓰기 기준)
-        words = text.split(' ')
-        
-        for word in words:
-            # 현재 줄에 단어 추가 시도
-            test_line = current_line + (' ' if current_line else '') + word
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            
-            if bbox[2] - bbox[0] <= max_width:
-                # 단어가 들어감
-                current_line = test_line
-            else:
-                # 단어가 들어가지 않음
-                if current_line:
-                    # 현재 줄 저장하고 새로운 줄에 단어 추가
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    # 현재 줄이 비어있는데도 단어가 너무 긴 경우
-                    # 어쩔 수 없이 단어 자체를 줄로 추가
-                    lines.append(word)
-                    current_line = ""
-        
-        if current_line:
-            lines.append(current_line)
+        lines = wrap_words(text, font, max_width)
         
         # 필요한 이미지 높이 계산 (줄 수에 따라 동적 조정)
         line_height = font_size + 25
@@ -720,34 +836,71 @@ class VideoGenerator:
             text_width = bbox[2] - bbox[0]
             x = (self.width - text_width) // 2
             
-            # 그림자 효과
-            for offset in [(4, 4), (3, 3), (2, 2)]:
-                draw.text((x + offset[0], y_offset + offset[1]), line, font=font, fill=(0, 0, 0, 200))
-            
-            # 외곽선
-            for dx in [-2, -1, 0, 1, 2]:
-                for dy in [-2, -1, 0, 1, 2]:
-                    if dx != 0 or dy != 0:
-                        draw.text((x + dx, y_offset + dy), line, font=font, fill=(0, 0, 0, 255))
-            
-            # 본문 텍스트 (지정 색상)
-            draw.text((x, y_offset), line, font=font, fill=text_color)
-            if is_bold:
-                # Faux-bold: 1px, 2px 오프셋으로 중복 그리기
-                draw.text((x + 1, y_offset), line, font=font, fill=text_color)
-                draw.text((x + 2, y_offset), line, font=font, fill=text_color)
+            # 그림자 + 2px 외곽선 + 본문 (Faux-bold: 1px, 2px 가로 확장) — 마스크 1회 래스터화
+            draw_outlined_text(
+                img, (x, y_offset), line, font, text_color,
+                outline=2, outline_fill=(0, 0, 0, 255),
+                shadow_offsets=[(4, 4), (3, 3), (2, 2)], shadow_fill=(0, 0, 0, 200),
+                bold=2 if is_bold else 0
+            )
             y_offset += line_height
         
         return np.array(img)
     
     def create_subtitle_clips(self, script_text, audio_duration, sentence_timings=None):
         """자막 클립 생성 (PIL 기반, 한글 지원, 음성 타이밍 기반)"""
+        layers = self._build_subtitle_layers(script_text, audio_duration, sentence_timings)
+        return [self._layer_to_clip(layer) for layer in layers]
+    
+    def _layer_to_clip(self, layer):
+        """레이어 dict → MoviePy ImageClip"""
+        clip = ImageClip(np.asarray(layer['image'])).with_duration(layer['end'] - layer['start'])
+        clip = clip.with_start(layer['start'])
+        if 'position' in layer:
+            clip = clip.with_position(layer['position'])
+        return clip
+    
+    def _subtitle_layer(self, subtitle_img, start_time, duration):
+        """자막 이미지 → 레이어 dict (위치: 가로 중앙, 상단에서 1/4 지점)"""
+        x = (self.width - subtitle_img.shape[1]) // 2
+        return {
+            'image': subtitle_img,
+            'start': start_time,
+            'end': start_time + duration,
+            'position': (x, int(self.height * 0.25)),
+        }
+    
+    def create_prefetcher(self):
+        """TTS 스트리밍 타이밍으로 자막 이미지를 미리 그리는 AssetPrefetcher 생성
+        (쇼츠 배경은 대본의 image_prompts로 정해지므로 장면 선요청은 하지 않음)"""
+        return AssetPrefetcher(subtitle_fn=self._prewarm_subtitle if self.subtitle_cache else None)
+
+    def _prewarm_subtitle(self, timing, index):
+        """스트리밍 타이밍 1건의 자막 이미지를 미리 그려 캐시에 저장 (_build_subtitle_layers와 같은 분리/색상 규칙)"""
+        import re
+        RED = (255, 0, 0, 255)
+        WHITE = (255, 255, 255, 255)
+        sub_sents = [s.strip() for s in re.split(r'(?<=[.!?])\s+', timing['text'].strip()) if s.strip()]
+        for j, text in enumerate(sub_sents):
+            tc = WHITE
+            bold = False
+            if index == 0 and j == 0:
+                tc = RED
+            elif re.search(r'\d+가지', text):
+                tc = RED
+                bold = True
+            elif re.match(r'^(첫째|둘째|셋째)', text):
+                tc = RED
+            self._create_subtitle_image(text, text_color=tc, is_bold=bold)
+
+    def _build_subtitle_layers(self, script_text, audio_duration, sentence_timings=None):
+        """자막 이미지 + 표시 구간 계산 → [{'image', 'start', 'end', 'position'}] (렌더 백엔드 공통)"""
         import re
         
         # 음성 타이밍 정보가 있으면 그것을 사용
         if sentence_timings and len(sentence_timings) > 0:
             print(f"   📝 음성 타이밍 기반 자막 생성 ({len(sentence_timings)}개 문장)")
-            clips = []
+            layers = []
             
             # ── 1단계: TTS 타이밍을 개별 문장으로 분리 ──
             # Edge TTS SentenceBoundary가 "첫째, ~~~. 그래서~~~." 을 하나로 묶는 경우 분리
@@ -818,16 +971,9 @@ class VideoGenerator:
                 
                 # PIL로 자막 이미지 생성
                 subtitle_img = self._create_subtitle_image(text, text_color=tc, is_bold=bold)
-                
-                # ImageClip으로 변환
-                clip = ImageClip(subtitle_img)
-                clip = clip.with_duration(duration)
-                clip = clip.with_start(start_time)
-                clip = clip.with_position(('center', int(self.height * 0.25)))
-                
-                clips.append(clip)
+                layers.append(self._subtitle_layer(subtitle_img, start_time, duration))
             
-            return clips
+            return layers
         
         # 타이밍 정보가 없으면 기존 방식 (균등 분배)
         print("   📝 균등 분배 방식 자막 생성")
@@ -893,7 +1039,7 @@ class VideoGenerator:
         if not final_segments:
             final_segments = [script_text]
         
-        clips = []
+        layers = []
         time_per_segment = audio_duration / len(final_segments)
         
         # 자막이 음성보다 살짝 빨리 나오도록 (싱크 맞추기)
@@ -903,19 +1049,11 @@ class VideoGenerator:
             start_time = max(0, i * time_per_segment + sync_offset)
             duration = time_per_segment
             
-            # PIL로 자막 이미지 생성
+            # PIL로 자막 이미지 생성 (위치: 상단에서 1/4 지점)
             subtitle_img = self._create_subtitle_image(segment)
-            
-            # ImageClip으로 변환
-            clip = ImageClip(subtitle_img)
-            clip = clip.with_duration(duration)
-            clip = clip.with_start(start_time)
-            # 자막 위치: 상단에서 1/4 지점 (높이 25%)
-            clip = clip.with_position(('center', int(self.height * 0.25)))
-            
-            clips.append(clip)
+            layers.append(self._subtitle_layer(subtitle_img, start_time, duration))
         
-        return clips
+        return layers
     
     def create_thumbnail(self, text, output_path, background_img=None):
         """썸네일 이미지 생성"""
@@ -926,47 +1064,12 @@ class VideoGenerator:
         
         draw = ImageDraw.Draw(img)
         
-        # 한글 폰트 로드 (GitHub Actions 호환)
-        font = None
-        try:
-            if self.font_path:
-                font = ImageFont.truetype(self.font_path, 100)
-            else:
-                # GitHub Actions에서 폴백
-                fallback_fonts = [
-                    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                ]
-                for font_path in fallback_fonts:
-                    if os.path.exists(font_path):
-                        try:
-                            font = ImageFont.truetype(font_path, 100)
-                            break
-                        except:
-                            continue
-        except:
-            pass
-        
-        if not font:
-            font = ImageFont.load_default()
+        # 한글 폰트 로드 (레지스트리 캐시)
+        font = get_font(100, self.font_path)
         
         # 텍스트 줄바꿈
         max_width = self.width - 100
-        lines = []
-        current_line = ""
-        
-        for char in text:
-            test_line = current_line + char
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-        if current_line:
-            lines.append(current_line)
+        lines = wrap_chars(text, font, max_width)
         
         # 총 텍스트 높이 계산
         line_height = 120
@@ -990,8 +1093,8 @@ class VideoGenerator:
         return output_path
     
     def get_thumbnail_path(self):
-        """마지막 create_video 호출 시 생성된 썸네일 경로 반환"""
-        return getattr(self, '_thumbnail_path', None)
+        """현재 스레드의 마지막 create_video 호출 시 생성된 썸네일 경로 반환"""
+        return getattr(self._local, 'thumbnail_path', None)
 
     def _create_hook_thumbnail(self, pil_image, hook_text, output_path):
         """인트로 배경 이미지 + 후킹 문장 오버레이로 썸네일 생성 (쇼츠 9:16)"""
@@ -1000,30 +1103,11 @@ class VideoGenerator:
             draw = ImageDraw.Draw(bg)
 
             font_size = 72
-            font = None
-            try:
-                if self.font_path:
-                    font = ImageFont.truetype(self.font_path, font_size)
-            except:
-                pass
-            if not font:
-                font = ImageFont.load_default()
+            font = get_font(font_size, self.font_path)
 
             # 단어 단위 줄바꿈
             max_width = self.width - 150
-            lines = []
-            current_line = ""
-            for word in hook_text.split(' '):
-                test_line = current_line + (' ' if current_line else '') + word
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                if bbox[2] - bbox[0] <= max_width:
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
+            lines = wrap_words(hook_text, font, max_width)
 
             line_height = font_size + 25
             total_text_h = len(lines) * line_height
@@ -1047,15 +1131,13 @@ class VideoGenerator:
                 x = (self.width - tw) // 2
                 y = y_start + idx * line_height
 
-                for ox, oy in [(4, 4), (3, 3), (2, 2)]:
-                    draw.text((x + ox, y + oy), line, font=font, fill=(0, 0, 0))
-                for dx in [-3, -2, -1, 0, 1, 2, 3]:
-                    for dy in [-3, -2, -1, 0, 1, 2, 3]:
-                        if dx != 0 or dy != 0:
-                            draw.text((x + dx, y + dy), line, font=font, fill=(0, 0, 0))
-                draw.text((x, y), line, font=font, fill=RED)
-                draw.text((x + 1, y), line, font=font, fill=RED)
-                draw.text((x + 2, y), line, font=font, fill=RED)
+                # 그림자 + 3px 외곽선 + 빨간 볼드 본문
+                draw_outlined_text(
+                    bg, (x, y), line, font, RED,
+                    outline=3, outline_fill=(0, 0, 0),
+                    shadow_offsets=[(4, 4), (3, 3), (2, 2)], shadow_fill=(0, 0, 0),
+                    bold=2
+                )
 
             bg.save(output_path, 'JPEG', quality=95)
             print(f"   ✅ 쇼츠 후킹 썸네일 생성: {output_path}")
@@ -1101,47 +1183,121 @@ class VideoGenerator:
         
         return boundaries
     
-    def create_video(self, script_data, audio_path, output_path, sentence_timings=None, use_ai_background=True):
-        """최종 비디오 생성 (AI 배경 이미지 옵션, 썸네일 자동 생성)"""
-        self._thumbnail_path = None  # 썸네일 경로
+    def _render_with_ffmpeg(self, background_layers, subtitle_layers, audio_path, duration, output_path,
+                            work_dir=None):
+        """ffmpeg 기반 백엔드(filtergraph / 변화 시점)로 렌더링 (성공 여부 반환)
+
+        work_dir: 레이어 PNG/프레임 임시 디렉토리 (None이면 렌더러가 임시 디렉토리 생성)
+        """
+        try:
+            renderer = create_renderer(self.render_backend, self.width, self.height, self.fps, preset='medium')
+            with get_limiter('render'):  # 동시 작업 시 CPU 인코딩 수 제한
+                renderer.render(background_layers, subtitle_layers, audio_path, duration, output_path,
+                                work_dir=work_dir)
+            return True
+        except Exception as e:
+            print(f"   ⚠️ ffmpeg 렌더링 실패: {str(e)[:200]} → MoviePy 폴백")
+            return False
+    
+    def _write_with_moviepy(self, final_video, output_path, workspace=None):
+        """MoviePy write_videofile로 저장 (진행 로그는 한 줄로 표시)
+
+        임시 오디오는 작업 공간(없으면 출력 파일 옆 고유 이름)에 만들어 동시 렌더링 충돌 방지
+        """
+        if workspace:
+            temp_audiofile = workspace.path('temp-audio.m4a')
+        else:
+            temp_audiofile = f"{os.path.splitext(output_path)[0]}_temp-audio.m4a"
+        # 비디오 저장 (MoviePy 진행 로그는 전용 로거로 한 줄에 표시, sys.stdout은 그대로 둠)
+        logger = _OneLineProgressLogger()
+        try:
+            with get_limiter('render'), span('render.moviepy', cat='render'):
+                final_video.write_videofile(
+                    output_path,
+                    fps=self.fps,
+                    codec='libx264',
+                    audio_codec='aac',
+                    temp_audiofile=temp_audiofile,
+                    remove_temp=True,
+                    preset='medium',
+                    logger=logger
+                )
+        finally:
+            logger.close()
+    
+    def prepare_background_images(self, script_data, use_ai_background=True, save_dir=None):
+        """섹션 순서 배경 이미지 목록 준비 (AI 이미지 → 실패 시 대본 키워드 검색)
+
+        대본의 image_prompts만 필요하므로 TTS와 동시에 실행할 수 있습니다.
+        save_dir: 지정하면 이미지를 PNG로 저장하고 파일 경로 목록을 반환 (작업 재개용)
+        """
+        images = self._prepare_background_images(script_data, use_ai_background)
+        if not save_dir or not images:
+            return images
+        os.makedirs(save_dir, exist_ok=True)
+        paths = []
+        for i, img in enumerate(images):
+            path = os.path.join(save_dir, f"bg_{i}.png")
+            img.save(path)
+            paths.append(path)
+        return paths
+
+    def _prepare_background_images(self, script_data, use_ai_background=True):
+        """prepare_background_images 본문 (PIL 이미지 목록 반환)"""
+        # AI 배경 이미지 생성 시도
+        ai_images = None
+        if use_ai_background:
+            ai_images = self.generate_ai_background_images(script_data, use_ai=True)
+        
+        # AI 이미지가 없으면 기존 방식 사용
+        if not ai_images:
+            print("📷 기존 방식: 대본 키워드 기반 배경 이미지 검색 중...")
+            script_text = script_data.get('script', '')
+            topic = script_data.get('topic', '흥미로운 사실')
+            return self.download_background_images(topic, count=5, script_text=script_text)
+
+        # AI 이미지 사용 (섹션 순서로 정렬)
+        section_order = ["intro", "section1", "section2", "section3", "outro"]
+        background_images = []
+        for section in section_order:
+            for sec, img in ai_images:
+                if sec == section:
+                    background_images.append(img)
+                    break
+        return background_images
+
+    def create_video(self, script_data, audio_path, output_path, sentence_timings=None, use_ai_background=True,
+                     background_images=None, workspace=None):
+        """최종 비디오 생성 (AI 배경 이미지 옵션, 썸네일 자동 생성)
+
+        background_images: prepare_background_images로 미리 준비한 배경 이미지 또는 파일 경로
+                           (None이면 여기서 준비)
+        workspace: 작업별 JobWorkspace (렌더링/MoviePy 임시 파일 위치)
+        """
+        self._local.thumbnail_path = None  # 썸네일 경로
         audio = None
         final_video = None
         try:
             print("🎬 비디오 생성 중...")
             
-            # 오디오 로드
-            audio = AudioFileClip(audio_path)
-            duration = audio.duration
-            
-            # AI 배경 이미지 생성 시도
-            ai_images = None
-            if use_ai_background:
-                ai_images = self.generate_ai_background_images(script_data, use_ai=True)
+            # 오디오 길이: MP3 헤더로 먼저 계산 (ffmpeg 백엔드는 AudioFileClip이 필요 없음)
+            duration = probe_mp3_duration(audio_path)
+            if duration is None:
+                audio = AudioFileClip(audio_path)
+                duration = audio.duration
             
-            # AI 이미지가 없으면 기존 방식 사용
-            if not ai_images:
-                print("📷 기존 방식: 대본 키워드 기반 배경 이미지 검색 중...")
-                script_text = script_data.get('script', '')
-                topic = script_data.get('topic', '흥미로운 사실')
-                background_images = self.download_background_images(topic, count=5, script_text=script_text)
-            else:
-                # AI 이미지 사용 (섹션 순서로 정렬)
-                section_order = ["intro", "section1", "section2", "section3", "outro"]
-                background_images = []
-                for section in section_order:
-                    for sec, img in ai_images:
-                        if sec == section:
-                            background_images.append(img)
-                            break
+            # 배경 이미지 (파이프라인에서 TTS와 동시에 준비했으면 그대로 사용)
+            if not background_images:
+                background_images = self.prepare_background_images(script_data, use_ai_background)
+            background_images = [Image.open(img).convert('RGB') if isinstance(img, str) else img
+                                 for img in background_images]
             
             # 섹션 경계 감지 (이미지 타이밍 동기화)
             section_times = self._detect_section_boundaries(sentence_timings, duration) if sentence_timings else None
             
-            # 배경 비디오 생성 (섹션 타이밍 적용)
-            background = self.create_background_video(background_images, duration, section_times=section_times)
-            
-            # 자막 생성 (음성 타이밍 기반)
-            subtitle_clips = self.create_subtitle_clips(script_data['script'], duration, sentence_timings=sentence_timings)
+            # 배경/자막 레이어 배치 (렌더 백엔드 공통)
+            background_layers = self._build_background_layers(background_images, duration, section_times=section_times)
+            subtitle_layers = self._build_subtitle_layers(script_data['script'], duration, sentence_timings=sentence_timings)
             
             # 썸네일 생성: 인트로 배경 + 후킹 문장 (N가지) 오버레이
             if sentence_timings and background_images:
@@ -1154,48 +1310,27 @@ class VideoGenerator:
                 if hook_text and len(background_images) > 0:
                     thumb_path = output_path.replace('.mp4', '_thumb.jpg')
                     os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
-                    self._thumbnail_path = self._create_hook_thumbnail(
+                    self._local.thumbnail_path = self._create_hook_thumbnail(
                         background_images[0], hook_text, thumb_path
                     )
             
-            # 모든 클립 합성
-            final_video = CompositeVideoClip(
-                [background] + subtitle_clips,
-                size=(self.width, self.height)
-            ).with_duration(duration).with_audio(audio)
-            
-            # 비디오 저장 (MoviePy 출력을 캡처하여 한 줄로 표시)
-            captured_output = io.StringIO()
-            
-            with redirect_stdout(captured_output):
-                final_video.write_videofile(
-                    output_path,
-                    fps=self.fps,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    preset='medium'
+            # ffmpeg 백엔드: MoviePy 프레임 합성 없이 렌더링 (실패 시 MoviePy로 폴백)
+            rendered = False
+            if self.render_backend in ('ffmpeg', 'changepoint'):
+                rendered = self._render_with_ffmpeg(
+                    background_layers, subtitle_layers, audio_path, duration, output_path,
+                    work_dir=workspace.path("render") if workspace else None
                 )
             
-            # 캡처된 출력에서 progress bar 라인들만 추출
-            output_lines = captured_output.getvalue().split('\n')
-            last_progress_line = ""
-            
-            for line in output_lines:
-                # frame_index나 chunk를 포함한 진행 라인 찾기
-                if 'frame_index' in line or 'chunk' in line or '|' in line:
-                    # 한 줄에 덮어씌우기
-                    sys.stdout.write(f'\r{line}')
-                    sys.stdout.flush()
-                    last_progress_line = line
-                elif line.strip() and 'MoviePy' in line:
-                    # 완료 메시지는 새 줄로 출력
-                    print(f"\n{line}")
-            
-            # 마지막에 새 줄 추가
-            if last_progress_line:
-                print()
+            if not rendered:
+                if audio is None:
+                    audio = AudioFileClip(audio_path)
+                # 모든 클립 합성
+                final_video = CompositeVideoClip(
+                    [self._layer_to_clip(layer) for layer in background_layers + subtitle_layers],
+                    size=(self.width, self.height)
+                ).with_duration(duration).with_audio(audio)
+                self._write_with_moviepy(final_video, output_path, workspace=workspace)
             
             print(f"✅ 비디오 생성 완료: {output_path}")
             return output_path
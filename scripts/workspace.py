@@ -0,0 +1,122 @@
+"""
+작업 공간 모듈
+영상 작업 하나마다 고유 디렉토리(work/{job_id}/)를 만들어 중간 파일(TTS 조각, 배경 이미지,
+MoviePy 임시 오디오, 렌더링 프레임)을 격리하고, 완성된 결과물만 output/으로 원자적으로 옮깁니다.
+- 같은 프로세스/같은 호스트에서 여러 작업이 동시에 돌아도 임시 파일 이름이 겹치지 않음
+- promote: 같은 파일시스템이면 os.replace (중간 상태의 파일이 output/에 보이지 않음)
+- cleanup: 작업 종료 시 디렉토리 삭제
+- open: 실패한 작업의 디렉토리를 다시 열어 재개 (--resume JOB_ID)
+- prune_workspaces: 재개하지 않고 오래 남은 작업 디렉토리 삭제 (시작 시)
+"""
+
+import os
+import time
+import uuid
+import shutil
+import threading
+
+
+class JobWorkspace:
+    """영상 작업 하나의 격리된 작업 디렉토리"""
+
+    def __init__(self, job_id, root="work"):
+        """job_id가 이미 쓰이는 중이면(다른 프로세스) 접미사를 붙여 고유 디렉토리 확보"""
+        os.makedirs(root, exist_ok=True)
+        candidate = job_id
+        while True:
+            try:
+                os.makedirs(os.path.join(root, candidate))
+                break
+            except FileExistsError:
+                candidate = f"{job_id}_{uuid.uuid4().hex[:4]}"
+        self.job_id = candidate
+        self.dir = os.path.join(root, candidate)
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, job_id, root="work"):
+        """기존 작업 디렉토리 다시 열기 (없으면 FileNotFoundError)"""
+        job_dir = os.path.join(root, job_id)
+        if not os.path.isdir(job_dir):
+            raise FileNotFoundError(f"작업 공간 없음: {job_dir}")
+        workspace = cls.__new__(cls)
+        workspace.job_id = job_id
+        workspace.dir = job_dir
+        workspace._counter = 0
+        workspace._lock = threading.Lock()
+        return workspace
+
+    def path(self, name):
+        """작업 디렉토리 안의 파일 경로 (하위 디렉토리는 자동 생성)"""
+        full_path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return full_path
+
+    def temp_path(self, prefix, suffix=""):
+        """작업 안에서 겹치지 않는 임시 파일 경로 (예: temp_path('bg_ai_3', '.jpg'))
+
+        재개한 작업 공간에는 이전 실행의 파일이 남아 있으므로 이미 있는 이름은 건너뜀
+        """
+        while True:
+            with self._lock:
+                self._counter += 1
+                n = self._counter
+            path = self.path(f"{prefix}_{n:04d}{suffix}")
+            if not os.path.exists(path):
+                return path
+
+    def promote(self, temp_path, final_path):
+        """완성된 파일을 최종 위치로 이동 (같은 파일시스템이면 원자적 rename)
+
+        Returns: final_path (temp_path가 없으면 None)
+        """
+        if not temp_path or not os.path.exists(temp_path):
+            return None
+        final_dir = os.path.dirname(final_path)
+        if final_dir:
+            os.makedirs(final_dir, exist_ok=True)
+        try:
+            os.replace(temp_path, final_path)
+        except OSError:
+            # 다른 파일시스템: 최종 디렉토리에 임시 이름으로 복사한 뒤 rename
+            staging = f"{final_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(temp_path, staging)
+            os.replace(staging, final_path)
+            os.remove(temp_path)
+        return final_path
+
+    def cleanup(self):
+        """작업 디렉토리 삭제 (실패는 무시)"""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def prune_workspaces(root="work", max_age_days=3):
+    """마지막 변경 후 max_age_days가 지난 작업 디렉토리 삭제 → 삭제한 작업 ID 목록
+
+    변경 시각은 디렉토리 안 파일 중 가장 최근 수정 시각 (진행 중인 작업은 계속 갱신되므로 삭제되지 않음)
+    """
+    if not os.path.isdir(root):
+        return []
+    cutoff = time.time() - max_age_days * 86400
+    removed = []
+    for entry in os.scandir(root):
+        if not entry.is_dir():
+            continue
+        try:
+            latest = entry.stat().st_mtime
+            for dirpath, _, filenames in os.walk(entry.path):
+                for name in filenames:
+                    latest = max(latest, os.path.getmtime(os.path.join(dirpath, name)))
+        except OSError:
+            continue
+        if latest < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed.append(entry.name)
+    return removed
+
+
+def unique_path(directory, prefix, suffix):
+    """작업 공간 없이 호출될 때 쓰는 고유 파일 경로 (초 단위 타임스탬프 충돌 방지)"""
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{prefix}_{uuid.uuid4().hex[:10]}{suffix}")
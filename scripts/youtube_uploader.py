@@ -5,12 +5,15 @@ Google YouTube Data API v3를 사용하여 영상을 자동으로 업로드합
 
 import json
 import os
+import threading
 from datetime import datetime, timezone, timedelta
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+from resumable_upload import ResumableUpload
+from channel_store import ChannelStore, DEFAULT_STATS_TIERS
 
 
 class YouTubeUploader:
@@ -37,7 +40,21 @@ class YouTubeUploader:
         else:
             self.credentials_file = self.config['youtube']['credentials_file']
         
+        # 채널 영상 목록 로컬 저장소 (새 영상만 증분 조회)
+        store_config = self.config['youtube'].get('channel_store', {})
+        self.channel_store = ChannelStore(store_config.get('path', 'logs/channel_store.json'))
+        self.full_sync_days = store_config.get('full_sync_days', 7)
+        self.stats_tiers = store_config.get('stats_tiers', DEFAULT_STATS_TIERS)
+        self._inventory = None  # 이번 프로세스에서 동기화한 영상 목록 (제목 동기화/인기 분석 공용)
+        self._inventory_lock = threading.Lock()
+        
+        # 청크 업로드 설정 (청크 실패 시 지수 백오프 재시도, 세션 URI는 작업 공간에 저장)
+        upload_config = self.config.get('upload', {})
+        self.upload_chunk_size = int(upload_config.get('chunk_size_mb', 8) * 1024 * 1024)
+        self.upload_max_retries = upload_config.get('max_retries', 8)
+        
         self.youtube = None
+        self.credentials = None
     
     def authenticate(self):
         """YouTube API 인증"""
@@ -87,6 +104,7 @@ class YouTubeUploader:
             with open(self.credentials_file, 'w', encoding='utf-8') as token:
                 token.write(creds.to_json())
         
+        self.credentials = creds
         self.youtube = build('youtube', 'v3', credentials=creds)
         print("✅ YouTube API 인증 완료")
         return True
@@ -166,134 +184,167 @@ class YouTubeUploader:
             print(f"❌ 채널 조회 오류: {e}")
             return None
     
-    def get_recent_videos(self, max_results=None):
-        """채널의 전체 업로드 영상 제목 목록 조회 (중복 방지용)
-        
-        Args:
-            max_results: 최대 조회 수 (None이면 전체 조회)
+    def get_channel_inventory(self, refresh=False):
+        """채널 업로드 영상 목록 (ID/제목/게시 시각, 최신순)
+
+        제목 동기화(get_recent_videos)와 인기 분석(get_popular_videos)이 같은 목록을 쓰도록
+        프로세스당 한 번만 동기화합니다. 로컬 저장소(channel_store)의 커서보다 새 영상만 조회하고,
+        full_sync_days마다 한 번 전체 목록을 다시 받아 삭제/제목 변경을 반영합니다.
+
+        Returns:
+            list of dict (실패 시 None)
         """
+        with self._inventory_lock:
+            if self._inventory is None or refresh:
+                self._inventory = self._sync_inventory()
+            return self._inventory
+
+    def _sync_inventory(self):
+        """로컬 저장소를 채널과 동기화 후 영상 목록 반환 (실패 시 None → 다음 호출에서 재시도)"""
         if not self.youtube:
             if not self.authenticate():
-                return []
+                return None
 
         try:
-            # 채널의 uploads playlist ID 가져오기
-            channel_resp = self.youtube.channels().list(
-                part='contentDetails',
-                mine=True
-            ).execute()
+            store = self.channel_store
+            full_sync = store.needs_full_sync(self.full_sync_days)
+            # 업로드 재생목록 ID는 저장된 값 사용 (전체 재조정 때만 채널 조회로 다시 확인)
+            uploads_id = self._uploads_playlist_id(refresh=full_sync)
+            if not uploads_id:
+                return None
+            full_sync = full_sync or store.needs_full_sync(self.full_sync_days)
+
+            if full_sync:
+                # 전체 재조정 (저장소가 비었거나 오래됨)
+                store.replace_all(self._list_uploads(uploads_id))
+                print(f"📺 채널 영상 {len(store.videos)}개 전체 조회 완료")
+            else:
+                # 증분 동기화: 이미 저장된 영상을 만나면 중단
+                added = store.merge_new(self._list_uploads(uploads_id, stop_ids=store.known_ids()))
+                print(f"📺 채널 새 영상 {added}개 조회 (저장된 영상 {len(store.videos)}개)")
+            return store.videos
+
+        except Exception as e:
+            print(f"⚠️ 채널 영상 목록 조회 실패: {e}")
+            return None
 
-            if not channel_resp.get('items'):
-                print("⚠️ 채널 정보를 가져올 수 없습니다")
-                return []
+    def _uploads_playlist_id(self, refresh=False):
+        """채널의 uploads playlist ID (같은 인증 파일로 확인한 저장값이 있으면 API 호출 생략)"""
+        store = self.channel_store
+        if not refresh and store.playlist_id and store.owner == self.credentials_file:
+            return store.playlist_id
 
-            uploads_id = channel_resp['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        channel_resp = self.youtube.channels().list(
+            part='contentDetails',
+            mine=True
+        ).execute()
 
-            # 전체 영상 목록 가져오기 (모든 페이지)
-            videos = []
-            request = self.youtube.playlistItems().list(
-                part='snippet',
-                playlistId=uploads_id,
-                maxResults=50  # API 최대값 50
-            )
+        if not channel_resp.get('items'):
+            print("⚠️ 채널 정보를 가져올 수 없습니다")
+            return None
 
-            while request:
-                response = request.execute()
-                for item in response.get('items', []):
-                    snippet = item['snippet']
-                    videos.append({
-                        'title': snippet.get('title', ''),
-                        'published_at': snippet.get('publishedAt', ''),
-                    })
-                # max_results 지정 시 초과하면 중단
-                if max_results and len(videos) >= max_results:
-                    break
-                request = self.youtube.playlistItems().list_next(request, response)
+        uploads_id = channel_resp['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        store.bind(uploads_id, owner=self.credentials_file)
+        return uploads_id
 
-            print(f"📺 채널 영상 {len(videos)}개 전체 조회 완료 (중복 방지용)")
-            return videos
+    def get_recent_videos(self, max_results=None):
+        """채널의 전체 업로드 영상 제목 목록 조회 (중복 방지용, get_channel_inventory 공유)
 
-        except Exception as e:
-            print(f"⚠️ 채널 영상 목록 조회 실패: {e}")
+        Args:
+            max_results: 최대 반환 수 (None이면 전체)
+        """
+        videos = self.get_channel_inventory()
+        if videos is None:
             return []
+        print(f"📺 채널 영상 {len(videos)}개 제목 사용 (중복 방지용)")
+        return videos[:max_results] if max_results else list(videos)
+
+    def _list_uploads(self, uploads_id, stop_ids=None):
+        """업로드 재생목록을 최신순으로 조회 (stop_ids의 영상을 만나면 그 앞까지만 반환)
+
+        Returns:
+            list of dict: [{'id': str, 'title': str, 'published_at': str}, ...]
+        """
+        videos = []
+        request = self.youtube.playlistItems().list(
+            part='snippet',
+            playlistId=uploads_id,
+            maxResults=50  # API 최대값 50
+        )
+
+        while request:
+            response = request.execute()
+            for item in response.get('items', []):
+                snippet = item['snippet']
+                video_id = snippet.get('resourceId', {}).get('videoId', '')
+                if stop_ids and video_id in stop_ids:
+                    return videos
+                videos.append({
+                    'id': video_id,
+                    'title': snippet.get('title', ''),
+                    'published_at': snippet.get('publishedAt', ''),
+                })
+            request = self.youtube.playlistItems().list_next(request, response)
+        return videos
 
     def get_popular_videos(self, top_n=15):
         """채널 영상의 조회수/좋아요 통계를 가져와 인기 순으로 정렬하여 반환
 
+        통계는 로컬 저장소(channel_store)에 영상별로 보관하고, 갱신 주기가 된 영상만 다시 조회합니다.
+        (최근 영상은 매 실행, 오래된 영상일수록 드물게: channel_store.stats_tiers)
+
         Args:
             top_n: 상위 N개 반환 (기본 15)
 
         Returns:
             list of dict: [{'title': str, 'views': int, 'likes': int, 'id': str}, ...]
         """
-        if not self.youtube:
-            if not self.authenticate():
-                return []
+        videos = self.get_channel_inventory()
+        if not videos:
+            return []
 
+        store = self.channel_store
         try:
-            # 채널의 uploads playlist ID 가져오기
-            channel_resp = self.youtube.channels().list(
-                part='contentDetails',
-                mine=True
-            ).execute()
-
-            if not channel_resp.get('items'):
-                print("⚠️ 채널 정보를 가져올 수 없습니다")
-                return []
-
-            uploads_id = channel_resp['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-
-            # 모든 비디오 ID 수집
-            video_ids = []
-            request = self.youtube.playlistItems().list(
-                part='snippet',
-                playlistId=uploads_id,
-                maxResults=50
-            )
-            while request:
-                response = request.execute()
-                for item in response.get('items', []):
-                    video_ids.append(item['snippet']['resourceId']['videoId'])
-                request = self.youtube.playlistItems().list_next(request, response)
-
-            if not video_ids:
-                return []
-
-            # 50개씩 배치로 통계 조회
-            all_stats = []
-            for i in range(0, len(video_ids), 50):
-                batch = video_ids[i:i+50]
+            # 갱신 주기가 된 영상만 50개씩 배치로 통계 조회 (제목은 목록에 있으므로 statistics만 요청)
+            due = store.stats_due(self.stats_tiers)
+            for i in range(0, len(due), 50):
+                batch = due[i:i+50]
                 stats_resp = self.youtube.videos().list(
-                    part='snippet,statistics',
+                    part='statistics',
                     id=','.join(batch)
                 ).execute()
+                fetched = {}
                 for item in stats_resp.get('items', []):
                     stats = item.get('statistics', {})
-                    snippet = item.get('snippet', {})
-                    all_stats.append({
-                        'id': item['id'],
-                        'title': snippet.get('title', ''),
+                    fetched[item['id']] = {
                         'views': int(stats.get('viewCount', 0)),
                         'likes': int(stats.get('likeCount', 0)),
-                    })
+                    }
+                store.update_stats(fetched, requested=batch)
+            print(f"📊 영상 통계 {len(due)}개 갱신 (저장된 통계 {len(videos) - len(due)}개 재사용)")
+        except Exception as e:
+            # 조회 실패 시 저장된 통계로 순위 계산
+            print(f"⚠️ 인기 영상 통계 조회 실패 (저장된 통계 사용): {e}")
 
-            # 조회수 + 좋아요 가중 점수로 정렬 (좋아요 1개 = 조회수 10)
-            all_stats.sort(key=lambda x: x['views'] + x['likes'] * 10, reverse=True)
-            top = all_stats[:top_n]
+        # 조회수 + 좋아요 가중 점수로 정렬 (좋아요 1개 = 조회수 10)
+        stats = store.stats()
+        all_stats = [
+            {'id': v['id'], 'title': v.get('title', ''),
+             'views': stats[v['id']]['views'], 'likes': stats[v['id']]['likes']}
+            for v in videos if v['id'] in stats
+        ]
+        all_stats.sort(key=lambda x: x['views'] + x['likes'] * 10, reverse=True)
+        top = all_stats[:top_n]
 
-            print(f"📊 인기 영상 TOP {len(top)} 조회 완료 (총 {len(all_stats)}개 중)")
-            for v in top[:5]:
-                print(f"   {v['views']:>6} views | {v['likes']:>3} likes | {v['title'][:40]}")
+        print(f"📊 인기 영상 TOP {len(top)} 조회 완료 (총 {len(all_stats)}개 중)")
+        for v in top[:5]:
+            print(f"   {v['views']:>6} views | {v['likes']:>3} likes | {v['title'][:40]}")
 
-            return top
-
-        except Exception as e:
-            print(f"⚠️ 인기 영상 통계 조회 실패: {e}")
-            return []
+        return top
 
     def upload_video(self, video_path, script_data, thumbnail_path=None,
                      channel_id=None, metadata=None, add_pinned_comment=True,
-                     publish_at='', longform_url=''):
+                     publish_at='', longform_url='', session_path=None):
         """비디오를 YouTube에 업로드
 
         Args:
@@ -302,6 +353,7 @@ class YouTubeUploader:
                       None이면 script_data에서 직접 추출
             publish_at: 예약 공개 시간 (ISO 8601, 비어있으면 즉시 공개)
             longform_url: 롱폼 영상 URL (쇼츠 설명란/고정댓글에 삽입)
+            session_path: 업로드 세션 URI 저장 파일 (재실행 시 끊긴 위치부터 이어서 전송)
         """
 
         # 채널 ID 지정된 경우 새로운 업로더 인스턴스 생성
@@ -311,7 +363,8 @@ class YouTubeUploader:
                                          metadata=metadata,
                                          add_pinned_comment=add_pinned_comment,
                                          publish_at=publish_at,
-                                         longform_url=longform_url)
+                                         longform_url=longform_url,
+                                         session_path=session_path)
 
         if not self.youtube:
             if not self.authenticate():
@@ -451,26 +504,10 @@ class YouTubeUploader:
             if scheduled_publish_at:
                 print(f"⏰ 예약 공개 예정: {scheduled_publish_at} (댓글 추가 후 전환)")
 
-            # 미디어 파일 업로드
-            media = MediaFileUpload(
-                video_path,
-                chunksize=-1,
-                resumable=True
-            )
-
             print(f"📤 YouTube 업로드 중: {title}")
 
-            request = self.youtube.videos().insert(
-                part=','.join(body.keys()),
-                body=body,
-                media_body=media
-            )
-
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    print(f"   업로드 진행: {int(status.progress() * 100)}%")
+            # 미디어 파일 업로드 (청크 단위, 끊기면 이어서 전송)
+            response = self._insert_video(video_path, body, session_path)
 
             video_id = response['id']
             video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -503,6 +540,30 @@ class YouTubeUploader:
             traceback.print_exc()
             return None
     
+    def _insert_video(self, video_path, body, session_path=None):
+        """videos.insert 재개 가능 업로드 (upload.chunk_size_mb 청크, 실패 청크는 백오프 재시도)
+
+        Returns: 생성된 영상 리소스 dict (실패 시 예외)
+        """
+        upload = ResumableUpload(
+            AuthorizedSession(self.credentials),
+            video_path,
+            body,
+            part=','.join(body.keys()),
+            state_path=session_path,
+            chunk_size=self.upload_chunk_size,
+            max_retries=self.upload_max_retries,
+        )
+        reported = [-1]
+
+        def on_progress(fraction):
+            percent = int(fraction * 100)
+            if percent != reported[0]:
+                reported[0] = percent
+                print(f"   업로드 진행: {percent}%")
+
+        return upload.run(on_progress)
+
     def upload_thumbnail(self, video_id, thumbnail_path):
         """썸네일 업로드 (권한 없으면 YouTube 자동 생성 썸네일 사용)"""
         try:
@@ -607,13 +668,14 @@ class YouTubeUploader:
             return None
     
     def upload_longform_video(self, video_path, script_data, thumbnail_path=None,
-                              add_pinned_comment=True, metadata=None, publish_at=''):
+                              add_pinned_comment=True, metadata=None, publish_at='', session_path=None):
         """롱폼 비디오 업로드 (메타데이터 자동 최적화)
         
         Args:
             metadata: generate_metadata()로 생성된 메타데이터 dict
                       (title, description, tags, hashtags, pinned_comment)
             publish_at: 예약 공개 시간 (ISO 8601, 비어있으면 즉시 공개)
+            session_path: 업로드 세션 URI 저장 파일 (재실행 시 끊긴 위치부터 이어서 전송)
         """
         
         if not self.youtube:
@@ -675,29 +737,13 @@ class YouTubeUploader:
             if scheduled_publish_at:
                 print(f"⏰ 예약 공개 예정: {scheduled_publish_at} (댓글 추가 후 전환)")
             
-            # 미디어 파일 업로드
-            media = MediaFileUpload(
-                video_path,
-                chunksize=-1,
-                resumable=True
-            )
-            
             print(f"📤 롱폼 비디오 YouTube 업로드 중...")
             print(f"   제목: {title}")
             print(f"   설명: {len(description)}자")
             print(f"   태그: {', '.join(tags[:5])}")
             
-            request = self.youtube.videos().insert(
-                part=','.join(body.keys()),
-                body=body,
-                media_body=media
-            )
-            
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    print(f"   업로드 진행: {int(status.progress() * 100)}%")
+            # 미디어 파일 업로드 (청크 단위, 끊기면 이어서 전송)
+            response = self._insert_video(video_path, body, session_path)
             
             video_id = response['id']
             video_url = f"https://www.youtube.com/watch?v={video_id}"